@@ -0,0 +1,83 @@
+"""
+Benchmark the categorical_feature statistics against the number of target classes.
+
+The previous implementation scanned the DataFrame once per target class (boolean mask plus
+`value_counts`), so its runtime grew linearly with the class count. The crosstab engine factorizes
+the feature and the target once and derives every column from one count matrix.
+
+Usage:
+    python -m benchmarks.bench_categorical_feature --rows 2000000 --classes 2 8 32 64
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from suraj_datalab.analyze import _category_distribution
+
+
+def per_class_scan(df, feature, target):
+    # Reference: the per-class masking implementation the crosstab engine replaced
+    category_distribution = pd.DataFrame(
+        {
+            "Total Count": df[feature].value_counts(),
+            "Total Percentage": df[feature].value_counts(normalize=True) * 100,
+        }
+    )
+    for class_value in df[target].unique():
+        category_distribution[f"{class_value} of Total (%)"] = (
+            df[df[target] == class_value][feature].value_counts(normalize=True) * 100
+        )
+    for class_value in df[target].unique():
+        category_distribution[f"{class_value} within {feature} (%)"] = (
+            df[df[target] == class_value][feature].value_counts()
+            / df[feature].value_counts()
+            * 100
+        )
+    return category_distribution
+
+
+def make_data(n_rows, n_classes, n_categories, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "feature": rng.integers(0, n_categories, n_rows).astype(str),
+            "target": rng.integers(0, n_classes, n_rows),
+        }
+    )
+
+
+def best_of(func, repeat, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--categories", type=int, default=50)
+    parser.add_argument("--classes", type=int, nargs="+", default=[2, 4, 8, 16, 32, 64])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"rows={args.rows:,} categories={args.categories}")
+    print(f"{'classes':>8} {'per-class scan (s)':>20} {'crosstab (s)':>14} {'speedup':>8}")
+    for n_classes in args.classes:
+        df = make_data(args.rows, n_classes, args.categories)
+        pd.testing.assert_frame_equal(
+            per_class_scan(df, "feature", "target"),
+            _category_distribution(df, "feature", "target"),
+        )
+        scan = best_of(per_class_scan, args.repeat, df, "feature", "target")
+        crosstab = best_of(_category_distribution, args.repeat, df, "feature", "target")
+        print(f"{n_classes:>8} {scan:>20.3f} {crosstab:>14.3f} {scan / crosstab:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
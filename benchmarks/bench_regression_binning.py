@@ -0,0 +1,68 @@
+"""
+Benchmark the 1-D optimal (Ckmeans) binning of create_regression_kfolds against sklearn's KMeans.
+
+binning_method="kmeans" used to run sklearn's n-dimensional KMeans on the target column. It now runs
+an exact 1-D dynamic program on the sorted target. For each size, the script reports the runtime
+and the within-bin sum of squares (SSE) of both. The SSE of Ckmeans is the global optimum, so it is
+never larger than the KMeans SSE.
+
+Usage:
+    python -m benchmarks.bench_regression_binning --rows 100000 1000000 10000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from suraj_datalab.fold_creator import _ckmeans_bins
+
+
+def sklearn_kmeans_bins(y, n_bins, random_state=42):
+    # Reference: the KMeans path previously used by binning_method="kmeans"
+    from sklearn.cluster import KMeans
+
+    kmeans = KMeans(n_clusters=n_bins, random_state=random_state)
+    return kmeans.fit_predict(y.reshape(-1, 1))
+
+
+def within_bin_sse(y, bins):
+    counts = np.bincount(bins)
+    sums = np.bincount(bins, weights=y)
+    squares = np.bincount(bins, weights=y * y)
+    nonempty = counts > 0
+    return float((squares[nonempty] - sums[nonempty] ** 2 / counts[nonempty]).sum())
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--skip-kmeans-above", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'rows':>12} {'bins':>5} {'KMeans (s)':>11} {'Ckmeans (s)':>12} {'KMeans SSE':>14} {'Ckmeans SSE':>14}")
+    for n_rows in args.rows:
+        y = rng.lognormal(size=n_rows)
+        n_bins = int(np.floor(1 + np.log2(n_rows)))
+        ckmeans_time, ckmeans = timed(_ckmeans_bins, y, n_bins)
+        if n_rows <= args.skip_kmeans_above:
+            kmeans_time, kmeans = timed(sklearn_kmeans_bins, y, n_bins)
+            kmeans_sse = f"{within_bin_sse(y, kmeans):>14.2f}"
+            kmeans_time = f"{kmeans_time:>11.2f}"
+        else:
+            kmeans_sse, kmeans_time = f"{'-':>14}", f"{'-':>11}"
+        print(
+            f"{n_rows:>12,} {n_bins:>5} {kmeans_time} {ckmeans_time:>12.2f} "
+            f"{kmeans_sse} {within_bin_sse(y, ckmeans):>14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
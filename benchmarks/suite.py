@@ -0,0 +1,268 @@
+"""
+Benchmark suite for the hot paths of analyze, clean and fold_creator on synthetic data.
+
+For every dataset size, the suite builds a synthetic DataFrame (a categorical feature with adjustable
+cardinality, a target with adjustable class count, a skewed numerical feature and a group column, with an
+adjustable null rate) and measures, for each benchmark, the best wall time over `--repeat` runs and the
+peak traced memory (Python and NumPy allocations, via tracemalloc) of one extra run. Plotting benchmarks
+render with the Agg backend into a temporary directory and are skipped above `--max-plot-rows`.
+
+Results are written as JSON with the commit, library versions and settings, so that runs of two commits can
+be compared:
+
+Usage:
+    python -m benchmarks.suite run --sizes 1e4 1e5 1e6 --output head.json
+    python -m benchmarks.suite run --sizes 1e7 1e8 --only create_kfolds numerical_feature --plot off
+    python -m benchmarks.suite compare base.json head.json --threshold 1.2
+"""
+
+import argparse
+import datetime
+import fnmatch
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+
+
+def make_dataset(n_rows, cardinality=100, n_classes=2, null_rate=0.01, seed=0):
+    """
+    Synthetic dataset: Zipf-distributed categories, a target correlated with them, a lognormal
+    numerical feature, 0/1 labels for multilabel folds and groups of about 10 rows.
+    """
+    rng = np.random.default_rng(seed)
+    categories = np.array([f"category_{i}" for i in range(cardinality)], dtype=object)
+    codes = np.minimum(rng.zipf(1.3, n_rows) - 1, cardinality - 1)
+    target = (codes + rng.integers(0, n_classes, n_rows)) % n_classes
+    value = rng.lognormal(size=n_rows)
+
+    df = pd.DataFrame(
+        {
+            "category": categories[codes],
+            "target": np.array([f"class_{i}" for i in range(n_classes)], dtype=object)[target],
+            "value": value,
+            "group": rng.integers(0, max(n_rows // 10, 1), n_rows),
+        }
+    )
+    for j in range(3):
+        df[f"label_{j}"] = (rng.random(n_rows) < 0.05 * (j + 1)).astype(np.int8)
+
+    if null_rate:
+        df.loc[rng.random(n_rows) < null_rate, "category"] = None
+        df.loc[rng.random(n_rows) < null_rate, "value"] = np.nan
+    return df
+
+
+def _benchmarks(df, workdir):
+    """
+    The benchmarked calls, as (name, plot, function) with the dataset already bound.
+    """
+    from suraj_datalab import analyze, fold_creator
+    from suraj_datalab.clean import RareCategoryReplacer
+
+    # The fold creators stratify on targets without missing values
+    folds_df = df.drop(columns="category").assign(value=df["value"].fillna(0.0))
+    fitted = RareCategoryReplacer(columns=["category"]).fit(df)
+    parquet_path = os.path.join(workdir, "dataset.parquet")
+
+    def streaming_kfolds():
+        if not os.path.exists(parquet_path):
+            folds_df.to_parquet(parquet_path)
+        index_path = os.path.join(workdir, "folds.idx")
+        fold_creator.create_streaming_kfolds(parquet_path, target_column="target", index_path=index_path)
+
+    benchmarks = []
+    for plot in (False, True):
+        benchmarks += [
+            ("categorical_feature", plot, lambda plot=plot: analyze.categorical_feature(df, "category", "target", plot=plot)),
+            ("numerical_feature", plot, lambda plot=plot: analyze.numerical_feature(df, "value", "target", plot=plot)),
+        ]
+    benchmarks += [
+        ("missing_values", False, lambda: analyze.missing_values(df)),
+        ("profile_categorical", False, lambda: analyze.profile_categorical(df, ["category", "group"], "target", n_jobs=1)),
+        ("RareCategoryReplacer.fit", False, lambda: RareCategoryReplacer(columns=["category"]).fit(df)),
+        ("RareCategoryReplacer.transform", False, lambda: fitted.transform(df)),
+        ("create_kfolds", False, lambda: fold_creator.create_kfolds(folds_df, return_folds=True)),
+        ("create_classification_kfolds", False, lambda: fold_creator.create_classification_kfolds(folds_df, "target", return_folds=True)),
+    ]
+    for binning_method in ("sturges", "quantile", "kmeans"):
+        benchmarks.append(
+            (
+                f"create_regression_kfolds[{binning_method}]",
+                False,
+                lambda binning_method=binning_method: fold_creator.create_regression_kfolds(
+                    folds_df, "value", binning_method=binning_method, return_folds=True
+                ),
+            )
+        )
+    benchmarks += [
+        ("create_repeated_kfolds", False, lambda: fold_creator.create_repeated_kfolds(folds_df, "target", n_repeats=3)),
+        ("create_multilabel_kfolds", False, lambda: fold_creator.create_multilabel_kfolds(folds_df, ["label_0", "label_1", "label_2"], return_folds=True)),
+        ("create_stratified_group_kfolds", False, lambda: fold_creator.create_stratified_group_kfolds(folds_df, "target", "group", return_folds=True)),
+        ("create_streaming_kfolds", False, streaming_kfolds),
+    ]
+    return benchmarks
+
+
+def measure(function, repeat):
+    """
+    Best wall time over `repeat` runs, and the peak traced memory (MB) of one more run.
+    """
+    import matplotlib.pyplot as plt
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+        plt.close("all")
+
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    plt.close("all")
+    return min(timings), peak / 1e6
+
+
+def _metadata(args):
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    import sklearn
+
+    return {
+        "commit": commit,
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "scikit-learn": sklearn.__version__,
+        "settings": {
+            key: value for key, value in vars(args).items() if key not in ("command", "func")
+        },
+    }
+
+
+def run(args):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    # Sparse regression bins and rare classes warn on every call; the timings are what matter here
+    warnings.simplefilter("ignore", UserWarning)
+    results = []
+    start_dir = os.getcwd()
+
+    for n_rows in (int(float(size)) for size in args.sizes):
+        df = make_dataset(n_rows, args.cardinality, args.classes, args.null_rate, args.seed)
+        with tempfile.TemporaryDirectory() as workdir:
+            # Plots are written to ./plots outside notebooks
+            os.chdir(workdir)
+            try:
+                for name, plot, function in _benchmarks(df, workdir):
+                    if args.only and not any(fnmatch.fnmatch(name, pattern) for pattern in args.only):
+                        continue
+                    if plot and (args.plot == "off" or n_rows > args.max_plot_rows):
+                        continue
+                    if not plot and args.plot == "on":
+                        continue
+                    seconds, peak_mb = measure(function, args.repeat)
+                    results.append(
+                        {
+                            "benchmark": name,
+                            "rows": n_rows,
+                            "plot": plot,
+                            "seconds": seconds,
+                            "peak_mb": peak_mb,
+                        }
+                    )
+                    print(
+                        f"{name:<40} {n_rows:>12,} {'plot' if plot else '':>5} "
+                        f"{seconds:>10.4f} s {peak_mb:>10.1f} MB",
+                        flush=True,
+                    )
+            finally:
+                os.chdir(start_dir)
+        del df
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"metadata": _metadata(args), "results": results}, file, indent=2)
+        print(f"Results written to {args.output}")
+
+
+def compare(args):
+    with open(args.base) as file:
+        base = json.load(file)
+    with open(args.head) as file:
+        head = json.load(file)
+
+    def key(result):
+        return result["benchmark"], result["rows"], result["plot"]
+
+    base_results = {key(result): result for result in base["results"]}
+    regressions = 0
+    print(f"base: {base['metadata'].get('commit')}  head: {head['metadata'].get('commit')}")
+    print(f"{'benchmark':<40} {'rows':>12} {'plot':>5} {'time ratio':>11} {'memory ratio':>13}")
+    for result in head["results"]:
+        reference = base_results.get(key(result))
+        if reference is None:
+            continue
+        time_ratio = result["seconds"] / reference["seconds"]
+        memory_ratio = result["peak_mb"] / max(reference["peak_mb"], 1e-6)
+        flag = ""
+        # Timings below `--min-seconds` are dominated by noise and only their memory is compared
+        slower = time_ratio > args.threshold and result["seconds"] >= args.min_seconds
+        if slower or memory_ratio > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(
+            f"{result['benchmark']:<40} {result['rows']:>12,} {'plot' if result['plot'] else '':>5} "
+            f"{time_ratio:>10.2f}x {memory_ratio:>12.2f}x{flag}"
+        )
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("--sizes", nargs="+", default=["1e4", "1e5", "1e6"], help="Row counts, 1e4 to 1e8")
+    run_parser.add_argument("--cardinality", type=int, default=100)
+    run_parser.add_argument("--classes", type=int, default=2)
+    run_parser.add_argument("--null-rate", type=float, default=0.01)
+    run_parser.add_argument("--plot", choices=["on", "off", "both"], default="both")
+    run_parser.add_argument("--max-plot-rows", type=int, default=1_000_000)
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--only", nargs="+", help="Glob patterns of benchmark names to run")
+    run_parser.add_argument("--output", help="Path of the JSON results file")
+    run_parser.set_defaults(func=run)
+
+    compare_parser = subparsers.add_parser("compare", help="Compare two results files")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("head")
+    compare_parser.add_argument("--threshold", type=float, default=1.2, help="Ratio flagged as a regression")
+    compare_parser.add_argument("--min-seconds", type=float, default=0.01, help="Shortest timing compared")
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args) or 0)
+
+
+if __name__ == "__main__":
+    main()
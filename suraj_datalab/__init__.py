@@ -1 +1,43 @@
-from .analyze import categorical_feature, numerical_feature
\ No newline at end of file
+import importlib
+
+# Public functions are resolved on first access, so that `import suraj_datalab` stays cheap in
+# worker processes that only need `clean` or `fold_creator`.
+_LAZY_ATTRIBUTES = {
+    "categorical_feature": "analyze",
+    "numerical_feature": "analyze",
+    "profile_categorical": "analyze",
+    "profile_numerical": "analyze",
+    "sampled_categorical_feature": "sampling",
+    "sampled_numerical_feature": "sampling",
+}
+
+# Submodules are imported on first access too, so `suraj_datalab.analyze.missing_values(...)` keeps working
+_SUBMODULES = [
+    "analyze",
+    "arrow",
+    "cache",
+    "clean",
+    "fold_creator",
+    "fold_index",
+    "instrument",
+    "plotting",
+    "report",
+    "sampling",
+    "sketches",
+    "streaming",
+]
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__)
+        return getattr(module, name)
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted([*globals(), *__all__, *_SUBMODULES])
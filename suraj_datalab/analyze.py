@@ -1,9 +1,9 @@
-import seaborn as sns
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-from IPython import get_ipython
 import os
+import sys
+
+from .instrument import span
 
 
 def is_jupyter_notebook():
@@ -13,6 +13,12 @@ def is_jupyter_notebook():
     Returns:
         bool: True if running in a Jupyter notebook or JupyterLab, False otherwise.
     """
+    # A notebook kernel has always imported IPython; avoid paying for the import otherwise
+    if "IPython" not in sys.modules:
+        return False
+
+    from IPython import get_ipython
+
     try:
         shell = get_ipython().__class__.__name__
         if "ZMQInteractiveShell" in shell:
@@ -25,13 +31,244 @@ def is_jupyter_notebook():
         return False  # Probably standard Python interpreter
 
 
-def categorical_feature(df, feature, target):
+def _is_arrow(data):
+    """
+    Check whether an object is a pyarrow Table, RecordBatch, Array or ChunkedArray, without importing pyarrow.
+    """
+    return type(data).__module__.split(".")[0] == "pyarrow"
+
+
+def _is_categorical(values):
+    """
+    Check whether a column is categorical: a pandas categorical or an Arrow dictionary-encoded column.
+    """
+    if _is_arrow(values):
+        import pyarrow as pa
+
+        return pa.types.is_dictionary(values.type)
+    return isinstance(values.dtype, pd.CategoricalDtype)
+
+
+def _column_names(df):
+    return df.column_names if _is_arrow(df) else df.columns
+
+
+def _factorize(values, dropna=True, keep_categories=False):
+    """
+    Encode a Series as integer codes in a single hashing pass.
+
+    Parameters:
+        values (Series, pa.Array or pa.ChunkedArray): The values to encode. Arrow columns are encoded from
+                                                       their dictionary indices (see `arrow._arrow_factorize`).
+        dropna (bool): If True, missing values get the code -1; otherwise they are encoded as a class.
+        keep_categories (bool): If True and the Series is categorical, reuse its codes and keep every
+                                declared category (including unused ones), as `value_counts` does.
+    Returns:
+        tuple: An int64 array of codes and an Index of the unique values, in order of appearance.
+    """
+    if _is_arrow(values):
+        from .arrow import _arrow_factorize
+
+        return _arrow_factorize(values, dropna, keep_categories)
+    if keep_categories and isinstance(values.dtype, pd.CategoricalDtype):
+        uniques = pd.CategoricalIndex(values.cat.categories, dtype=values.dtype)
+        return values.cat.codes.to_numpy().astype(np.int64), uniques
+    codes, uniques = pd.factorize(values, use_na_sentinel=dropna)
+    return codes.astype(np.int64, copy=False), uniques
+
+
+def _crosstab(feature_codes, n_categories, target_codes, n_classes):
+    """
+    Count the rows of every (feature category, target class) pair with one bincount over combined codes.
+
+    Parameters:
+        feature_codes (ndarray): int64 feature codes, -1 for missing values.
+        n_categories (int): The number of feature categories.
+        target_codes (ndarray): int64 target codes in [0, n_classes).
+        n_classes (int): The number of target classes.
+    Returns:
+        ndarray: An (n_categories, n_classes) int64 count matrix. Rows with a missing feature are dropped.
+    """
+    # Shift by one so that missing features land in a leading row that is discarded
+    combined = feature_codes + 1
+    combined *= n_classes
+    combined += target_codes
+    counts = np.bincount(combined, minlength=(n_categories + 1) * n_classes)
+    return counts.reshape(n_categories + 1, n_classes)[1:]
+
+
+def _category_distribution(df, feature, target, return_counts=False):
+    """
+    Build the distribution table returned by `categorical_feature` from a single count matrix.
+
+    The feature and the target are each factorized once; every column of the table is then derived from
+    the (category x class) count matrix instead of re-scanning the DataFrame for each target class.
+
+    Parameters:
+        df (DataFrame or pa.Table): The input DataFrame.
+        feature (str): The name of the categorical feature.
+        target (str): The name of the target variable.
+        return_counts (bool): If True, also return the count matrix in the row order of the table and the
+                              target classes, with their original values. Default is False.
+    Returns:
+        DataFrame: The same table as `categorical_feature`, or a tuple (table, counts, classes).
+    """
+    feature_codes, categories = _factorize(df[feature], keep_categories=True)
+    target_codes, classes = _factorize(df[target], dropna=False)
+    counts = _crosstab(feature_codes, len(categories), target_codes, len(classes))
+
+    return _distribution_from_counts(
+        counts,
+        categories,
+        classes,
+        feature,
+        keep_empty=_is_categorical(df[feature]),
+        return_counts=return_counts,
+    )
+
+
+def _distribution_arrays(counts, classes, keep_empty=False, class_totals=None):
+    """
+    Derive the per-class percentages of the distribution table from a (category x class) count matrix.
+
+    Parameters:
+        counts (ndarray): An (n_categories, n_classes) count matrix.
+        classes (Index): The target classes, one per column of `counts`. Missing classes never match.
+        keep_empty (bool): If True, zero counts are kept as 0 (categorical features); otherwise they
+                           become NaN, matching per-class `value_counts` alignment.
+        class_totals (ndarray): Optional number of rows of each class, used as the denominators when
+                                `counts` only holds part of the categories (heavy-hitter summaries).
+                                Default is the column sums of `counts`.
+    Returns:
+        tuple: The row order (stable descending total count), and the reordered total counts, class counts,
+               "of Total" percentages and "within" percentages.
+    """
+    total = counts.sum(axis=1)
+    # Stable descending order, the same ordering `value_counts` uses
+    order = np.argsort(-total, kind="stable")
+    total = total[order]
+    counts = counts[order]
+
+    # `df[target] == nan` never matches, so a missing class contributes no rows
+    counts[:, np.asarray(pd.isna(classes))] = 0
+    if class_totals is None:
+        class_totals = counts.sum(axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        of_total = counts / class_totals * 100
+        within = counts / total[:, None] * 100
+    if not keep_empty:
+        of_total[counts == 0] = np.nan
+        within[counts == 0] = np.nan
+
+    return order, total, counts, of_total, within
+
+
+def _distribution_from_counts(
+    counts, categories, classes, feature, keep_empty=False, class_totals=None, return_counts=False
+):
+    """
+    Turn a (category x class) count matrix into the `categorical_feature` table.
+
+    Parameters:
+        counts (ndarray): An (n_categories, n_classes) count matrix.
+        categories (Index): The feature categories, one per row of `counts`.
+        classes (Index): The target classes, one per column of `counts`.
+        feature (str): The name of the categorical feature.
+        keep_empty (bool): Passed to `_distribution_arrays`.
+        class_totals (ndarray): Passed to `_distribution_arrays`; their sum is the total row count.
+        return_counts (bool): If True, also return the reordered count matrix and the classes. Default is False.
+    Returns:
+        DataFrame: The distribution table, sorted by total count, or a tuple (table, counts, classes).
+    """
+    order, total, ordered_counts, of_total, within = _distribution_arrays(
+        counts, classes, keep_empty, class_totals
+    )
+    n_rows = total.sum() if class_totals is None else np.sum(class_totals)
+
+    category_distribution = pd.DataFrame(
+        {
+            "Total Count": total,
+            "Total Percentage": total / n_rows * 100,
+        },
+        index=categories[order].rename(feature),
+    )
+
+    # Add percentages for each target class relative to the total
+    for j, class_value in enumerate(classes):
+        category_distribution[f"{class_value} of Total (%)"] = of_total[:, j]
+
+    # Add percentages of each target class within the feature category
+    for j, class_value in enumerate(classes):
+        category_distribution[f"{class_value} within {feature} (%)"] = within[:, j]
+
+    if return_counts:
+        return category_distribution, ordered_counts, classes
+    return category_distribution
+
+
+def _long_distribution(values, feature, target_codes, classes):
+    """
+    Profile one categorical column against pre-factorized target codes in long format.
+
+    Parameters:
+        values (Series or pa.ChunkedArray): The categorical feature column.
+        feature (str): The name of the feature.
+        target_codes (ndarray): int64 target codes shared by every feature.
+        classes (Index): The target classes, one per target code.
+    Returns:
+        DataFrame: One row per (category, class) pair.
+    """
+    feature_codes, categories = _factorize(values, keep_categories=True)
+    counts = _crosstab(feature_codes, len(categories), target_codes, len(classes))
+    order, total, counts, of_total, within = _distribution_arrays(
+        counts, classes, keep_empty=_is_categorical(values)
+    )
+    n_categories, n_classes = counts.shape
+
+    return pd.DataFrame(
+        {
+            "Feature": feature,
+            "Category": np.repeat(np.asarray(categories[order], dtype=object), n_classes),
+            "Class": np.tile(np.asarray(classes, dtype=object), n_categories),
+            "Count": counts.ravel(),
+            "Total Count": np.repeat(total, n_classes),
+            "Total Percentage": np.repeat(total / total.sum() * 100, n_classes),
+            "Class of Total (%)": of_total.ravel(),
+            "Class within Feature (%)": within.ravel(),
+        }
+    )
+
+
+def _output_table(table, output):
+    """
+    Return a result table as pandas (the default) or as a pyarrow Table.
+    """
+    if output == "arrow":
+        from .arrow import to_arrow
+
+        return to_arrow(table)
+    if output != "pandas":
+        raise ValueError(f"Invalid output: {output}. Choose 'pandas' or 'arrow'.")
+    return table
+
+
+def categorical_feature(df, feature, target, plot=True, output="pandas", cache=None, max_categories=30):
     """
     Calculate the distribution of a categorical feature in a DataFrame with respect to a target variable.
     Parameters:
-        df (DataFrame): The input DataFrame.
+        df (DataFrame or pa.Table): The input DataFrame, or a pyarrow Table. Dictionary-encoded Arrow columns
+                                    are counted from their indices, without converting strings to Python objects.
         feature (str): The name of the categorical feature.
         target (str): The name of the target variable.
+        plot (bool): If True, plot the distribution. If False, only the statistics are computed and matplotlib
+                     and seaborn are never imported; use `plotting.plot_categorical_feature` to render later.
+                     Default is True.
+        output (str): "pandas" or "arrow" (a pyarrow Table with the categories as a column). Default is "pandas".
+        cache (ResultCache): Optional `cache.ResultCache`. The table and the plot are then reused while the
+                             feature and target columns are unchanged. Default is None.
+        max_categories (int): Number of most frequent categories drawn in the plot; the table keeps every
+                              category. Default is 30.
     Returns:
         DataFrame: A DataFrame containing the distribution of the feature, including the total count, total percentage,
                    percentages for each target class relative to the total, and percentages of each target class within
@@ -39,48 +276,361 @@ def categorical_feature(df, feature, target):
     Raises:
         None
     """
-    # Calculate the distribution of the feature
-    category_distribution = pd.DataFrame(
-        {
-            "Total Count": df[feature].value_counts(),
-            "Total Percentage": df[feature].value_counts(normalize=True) * 100,
-        }
+    if cache is not None:
+        from .cache import cached_call, column_fingerprint
+
+        return cached_call(
+            cache,
+            "categorical_feature",
+            [column_fingerprint(df[feature]), column_fingerprint(df[target])],
+            dict(feature=feature, target=target, plot=plot, output=output, max_categories=max_categories),
+            lambda png_file: _categorical_feature(df, feature, target, plot, output, png_file, max_categories),
+            plot_name=f"{feature}-{target}-distribution.png" if plot else None,
+        )
+
+    return _categorical_feature(df, feature, target, plot, output, max_categories=max_categories)
+
+
+def _categorical_feature(df, feature, target, plot, output, png_file=None, max_categories=30, output_dir=None):
+    with span("statistics"):
+        category_distribution, counts, classes = _category_distribution(df, feature, target, return_counts=True)
+
+    if plot:
+        from .plotting import plot_categorical_feature
+
+        # The bars are drawn from the exact counts and classes, not from the percentages of the table
+        with span("plot"):
+            plot_categorical_feature(
+                feature, target, category_distribution, png_file, max_categories, output_dir,
+                counts=counts, classes=classes,
+            )
+
+    return _output_table(category_distribution, output)
+
+
+def profile_categorical(df, features, target, n_jobs=-1, prefer="processes", output="pandas"):
+    """
+    Profile many categorical features against the same target in parallel.
+
+    The target is factorized once and its codes are shared by every feature; each feature column is then
+    profiled with the same single-pass crosstab engine as `categorical_feature` on a worker pool.
+
+    Parameters:
+        df (DataFrame or pa.Table): The input DataFrame, or a pyarrow Table (see `categorical_feature`).
+        features (list): The names of the categorical features to profile.
+        target (str): The name of the target variable.
+        n_jobs (int): The number of workers, following the joblib convention (-1 uses all cores). Default is -1.
+        prefer (str): "processes" or "threads". Process workers sidestep the GIL held while hashing object
+                      columns; threads avoid pickling each column. Default is "processes".
+        output (str): "pandas" or "arrow". Default is "pandas".
+    Returns:
+        DataFrame: A long-format table with one row per (feature, category, class), containing the class count,
+                   the total count and percentage of the category, the percentage of the class falling in the
+                   category and the percentage of the category belonging to the class.
+    Raises:
+        ValueError: If no feature is given, or if the target or a feature is not a column of the DataFrame.
+    """
+    if not features:
+        raise ValueError("At least one feature must be provided.")
+
+    missing = [column for column in [target, *features] if column not in _column_names(df)]
+    if missing:
+        raise ValueError(f"Columns {missing} not found in the dataframe.")
+
+    from joblib import Parallel, delayed
+
+    target_codes, classes = _factorize(df[target], dropna=False)
+
+    profiles = Parallel(n_jobs=n_jobs, prefer=prefer)(
+        delayed(_long_distribution)(df[feature], feature, target_codes, classes)
+        for feature in features
     )
 
-    # Add percentages for each target class relative to the total
-    for class_value in df[target].unique():
-        category_distribution[f"{class_value} of Total (%)"] = (
-            df[df[target] == class_value][feature].value_counts(normalize=True) * 100
-        )
+    return _output_table(pd.concat(profiles, ignore_index=True), output)
 
-    # Add percentages of each target class within the feature category
-    for class_value in df[target].unique():
-        category_distribution[f"{class_value} within {feature} (%)"] = (
-            df[df[target] == class_value][feature].value_counts()
-            / df[feature].value_counts()
-            * 100
-        )
 
-    # Sort the categories by total count
-    order = df[feature].value_counts().index
+_DESCRIBE_COLUMNS = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
 
-    # Plot the distribution of the feature with respect to the target variable
-    plt.figure(figsize=(12, 6))
-    sns.countplot(data=df, x=feature, hue=target, order=order)
-    plt.title(f"Distribution of {feature} by {target}")
 
-    if is_jupyter_notebook():
-        plt.show()  # Show plot if running in a Jupyter notebook
+def _sorted_quantile(sorted_values, q):
+    """
+    Linearly interpolated quantile of an already sorted array, matching `np.quantile(..., method="linear")`.
+    """
+    n = len(sorted_values)
+    if n == 0:
+        return np.nan
+    position = (n - 1) * q
+    lower = int(np.floor(position))
+    upper = min(lower + 1, n - 1)
+    a, b, t = sorted_values[lower], sorted_values[upper], position - lower
+    # Same two-sided interpolation as NumPy, for bit-identical results
+    return b - (b - a) * (1 - t) if t >= 0.5 else a + (b - a) * t
+
+
+def _describe_sorted(sorted_values, block_size=1 << 20):
+    """
+    The statistics of `Series.describe()` for a sorted float array without missing values.
+
+    Parameters:
+        sorted_values (ndarray): The sorted values. Views are never copied.
+        block_size (int): The variance is accumulated over blocks of this size to bound temporary memory.
+    Returns:
+        ndarray: count, mean, std, min, 25%, 50%, 75% and max.
+    """
+    n = len(sorted_values)
+    if n == 0:
+        return np.array([0.0] + [np.nan] * 7)
+
+    mean = sorted_values.sum() / n
+    sum_of_squares = 0.0
+    for start in range(0, n, block_size):
+        deviation = sorted_values[start : start + block_size] - mean
+        sum_of_squares += np.dot(deviation, deviation)
+    std = np.sqrt(sum_of_squares / (n - 1)) if n > 1 else np.nan
+
+    return np.array(
+        [
+            n,
+            mean,
+            std,
+            sorted_values[0],
+            _sorted_quantile(sorted_values, 0.25),
+            _sorted_quantile(sorted_values, 0.5),
+            _sorted_quantile(sorted_values, 0.75),
+            sorted_values[-1],
+        ],
+        dtype=np.float64,
+    )
+
+
+def _resolve_bins(bins, n_rows, std, minimum, maximum, q1, q3):
+    """
+    Turn a histogram binning rule into a number of bins from precomputed statistics.
+
+    Parameters:
+        bins (int, str): A number of bins, or one of 'sturges', 'rice', 'scott' and 'fd'.
+        n_rows (int): The number of rows of the column, missing values included.
+        std, minimum, maximum, q1, q3 (float): Statistics of the non-missing values.
+    Returns:
+        int: The number of bins.
+    Raises:
+        ValueError: If the binning method is unknown.
+    """
+    if not isinstance(bins, str):
+        return bins
+    if bins == "sturges":
+        return int(np.ceil(np.log2(n_rows) + 1))
+    elif bins == "rice":
+        return int(np.ceil(2 * n_rows ** (1 / 3)))
+    elif bins == "scott":
+        bin_width = 3.5 * std * n_rows ** (-1 / 3)
+    elif bins == "fd":  # Freedman-Diaconis
+        bin_width = 2 * (q3 - q1) * n_rows ** (-1 / 3)
     else:
-        # Save the plot if running outside of a Jupyter notebook
-        if not os.path.exists("./plots"):
-            os.makedirs("./plots")
-        plt.savefig(f"./plots/{feature}-{target}-distribution.png")
+        raise ValueError(f"Unknown binning method: '{bins}'")
+    return int(np.ceil((maximum - minimum) / bin_width))
+
+
+def _sorted_histogram(sorted_values, n_bins):
+    """
+    Histogram counts of a sorted array, equal to `np.histogram(values, n_bins)`, from n_bins + 1 binary searches.
+    """
+    if len(sorted_values) == 0:
+        return np.zeros(n_bins, dtype=np.int64), np.linspace(0.0, 1.0, n_bins + 1)
+    edges = np.linspace(sorted_values[0], sorted_values[-1], n_bins + 1)
+    if sorted_values[0] == sorted_values[-1]:
+        edges = np.linspace(sorted_values[0] - 0.5, sorted_values[0] + 0.5, n_bins + 1)
+    # Bins are half-open except the last one, which includes the maximum
+    positions = np.searchsorted(sorted_values, edges, side="left")
+    positions[-1] = len(sorted_values)
+    return np.diff(positions), edges
+
+
+def _binned_kde(sorted_values, std, gridsize=512):
+    """
+    Gaussian kernel density estimate of a sorted array, evaluated on a grid from binned counts.
+
+    The values are counted into `gridsize` bins between their minimum and maximum and the counts are
+    convolved with a Gaussian kernel sampled on the grid, with Scott's bandwidth (the default of
+    `sns.kdeplot`). The cost depends on the grid size only, not on the number of values.
+
+    Parameters:
+        sorted_values (ndarray): The sorted values, without missing values.
+        std (float): Their standard deviation.
+        gridsize (int): Number of grid points. Default is 512.
+    Returns:
+        tuple: The grid and the density at each grid point, or two empty arrays if the density is undefined.
+    """
+    n = len(sorted_values)
+    if n < 2 or not std > 0:
+        return np.empty(0), np.empty(0)
+
+    counts, edges = _sorted_histogram(sorted_values, gridsize)
+    grid = (edges[:-1] + edges[1:]) / 2
+    step = edges[1] - edges[0]
+    bandwidth = std * n ** (-1 / 5)
+
+    half_width = min(int(np.ceil(4 * bandwidth / step)), gridsize - 1)
+    offsets = np.arange(-half_width, half_width + 1) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+    density = np.convolve(counts, kernel)[half_width : half_width + gridsize] / n
+    return grid, density
 
-    return category_distribution
+
+def _box_stats(sorted_values, label, max_fliers=1000):
+    """
+    The statistics `Axes.bxp` draws for a sorted array, as `sns.boxplot` computes them (whiskers at 1.5 IQR).
+
+    Parameters:
+        sorted_values (ndarray): The sorted values, without missing values.
+        label (str): The label of the box.
+        max_fliers (int): At most this many outliers are drawn, evenly spaced in rank and always including
+                          the extremes, so that the plot does not grow with the number of rows.
+    Returns:
+        dict: The keys med, q1, q3, whislo, whishi, fliers and label.
+    """
+    n = len(sorted_values)
+    if n == 0:
+        return {"med": np.nan, "q1": np.nan, "q3": np.nan, "whislo": np.nan, "whishi": np.nan,
+                "fliers": np.empty(0), "label": label}
+
+    q1 = _sorted_quantile(sorted_values, 0.25)
+    q3 = _sorted_quantile(sorted_values, 0.75)
+    low = int(np.searchsorted(sorted_values, q1 - 1.5 * (q3 - q1), side="left"))
+    high = int(np.searchsorted(sorted_values, q3 + 1.5 * (q3 - q1), side="right"))
+
+    fliers = np.concatenate([sorted_values[:low], sorted_values[high:]])
+    if len(fliers) > max_fliers:
+        fliers = fliers[np.unique(np.linspace(0, len(fliers) - 1, max_fliers).astype(np.int64))]
+
+    return {
+        "med": _sorted_quantile(sorted_values, 0.5),
+        "q1": q1,
+        "q3": q3,
+        "whislo": sorted_values[min(low, n - 1)],
+        "whishi": sorted_values[max(high - 1, 0)],
+        "fliers": fliers,
+        "label": label,
+    }
+
+
+def _grouped_box_stats(values, target_values, max_fliers=1000):
+    """
+    Box statistics of a numerical column for each class of a target, grouping the rows by class with a
+    stable integer sort and sorting each class in place.
+
+    Rows with a missing value or a missing class are ignored, as in `sns.boxplot`. Classes are in order of
+    appearance.
+    """
+    target_codes, classes = _factorize(target_values)
+    values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    valid = (target_codes >= 0) & ~np.isnan(values)
+    values, target_codes = values[valid], target_codes[valid]
+
+    sorted_values = values[np.argsort(target_codes, kind="stable")]
+    boundaries = np.concatenate([[0], np.cumsum(np.bincount(target_codes, minlength=len(classes)))])
+    for j in range(len(classes)):
+        sorted_values[boundaries[j] : boundaries[j + 1]].sort()
+    return [
+        _box_stats(sorted_values[boundaries[j] : boundaries[j + 1]], str(class_value), max_fliers)
+        for j, class_value in enumerate(classes)
+    ]
+
+
+def _numeric_summary(values, bins="sturges", plot_data=False, target_values=None):
+    """
+    Compute every statistic of `numerical_feature` from a single sort of the column.
+
+    The column is copied once into a float64 buffer and sorted in place. The overall statistics, the IQR
+    bounds, the statistics of each outlier tail (contiguous views at both ends of the sorted buffer) and the
+    number of histogram bins are all read from that buffer, so no rows of the DataFrame are copied.
+
+    Parameters:
+        values (Series): The numerical column.
+        bins (int, str): The number of histogram bins or the rule used to compute it.
+        plot_data (bool): If True, also compute what `plotting.plot_numerical_feature` draws: the number of
+                          bins, the histogram counts, a binned KDE and the box statistics (per class of
+                          `target_values` if given).
+        target_values (Series): Optional target column the boxes are grouped by.
+    Returns:
+        dict: The overall, lower-tail and upper-tail `describe` statistics, the outlier counts and bounds,
+              the number of rows and the number of bins, and the plot data under "plot_data" if requested.
+    """
+    sorted_values = values.to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+    sorted_values.sort()
+    # NaNs sort last; keep a view of the valid values
+    sorted_values = sorted_values[: np.searchsorted(sorted_values, np.inf, side="right")]
+
+    overall = _describe_sorted(sorted_values)
+    q1, q3 = overall[4], overall[6]
+    iqr = q3 - q1
+    lower_bound = q1 - 1.5 * iqr
+    upper_bound = q3 + 1.5 * iqr
+
+    n_lower = int(np.searchsorted(sorted_values, lower_bound, side="left"))
+    n_upper = len(sorted_values) - int(
+        np.searchsorted(sorted_values, upper_bound, side="right")
+    )
+
+    summary = {
+        "n_rows": len(values),
+        "overall": overall,
+        "lower": _describe_sorted(sorted_values[:n_lower]),
+        "upper": _describe_sorted(sorted_values[len(sorted_values) - n_upper :]),
+        "n_lower": n_lower,
+        "n_upper": n_upper,
+        "lower_bound": lower_bound,
+        "upper_bound": upper_bound,
+        "bins": _resolve_bins(
+            bins, len(values), overall[2], overall[3], overall[7], q1, q3
+        ),
+    }
+
+    if plot_data:
+        summary["plot_data"] = {
+            "bins": summary["bins"],
+            "histogram": _sorted_histogram(sorted_values, summary["bins"]),
+            "kde": _binned_kde(sorted_values, overall[2]),
+            "boxes": (
+                [_box_stats(sorted_values, "")]
+                if target_values is None
+                else _grouped_box_stats(values, target_values)
+            ),
+        }
+    return summary
 
 
-def numerical_feature(df, feature, target=None, figsize=(15, 6), bins="sturges"):
+def _numerical_frames(summary, feature):
+    """
+    Build the `outliers_df` and `summary_df` frames of `numerical_feature` from a numeric summary.
+    """
+    summary_df = pd.DataFrame(
+        [summary["overall"], summary["lower"], summary["upper"]],
+        index=[
+            f"{feature}_Overall",
+            f"{feature}_Lower_Outliers",
+            f"{feature}_Upper_Outliers",
+        ],
+        columns=_DESCRIBE_COLUMNS,
+    )
+
+    n_rows = summary["n_rows"]
+    outliers_df = pd.DataFrame(
+        {
+            "Outlier Percentage": [
+                (summary["n_lower"] + summary["n_upper"]) / n_rows * 100
+            ],
+            "Lower Outliers Percentage": [summary["n_lower"] / n_rows * 100],
+            "Upper Outliers Percentage": [summary["n_upper"] / n_rows * 100],
+        }
+    )
+
+    return outliers_df, summary_df
+
+
+def numerical_feature(
+    df, feature, target=None, figsize=(15, 6), bins="sturges", plot=True, cache=None, return_plot_data=False
+):
     """
     Analyzes a numerical feature in a dataframe.
     Parameters:
@@ -89,9 +639,17 @@ def numerical_feature(df, feature, target=None, figsize=(15, 6), bins="sturges")
     - target (str, optional): The name of the target column for grouping the analysis. Default is None.
     - figsize (tuple, optional): The size of the figure. Default is (15, 6).
     - bins (int, str, optional): The number of bins for the histogram or the method to calculate it. Default is 'sturges'.
+    - plot (bool, optional): If True, plot the histogram and box plot. If False, only the statistics are computed
+      and matplotlib and seaborn are never imported; use `plotting.plot_numerical_feature` to render later. Default is True.
+    - cache (ResultCache, optional): Optional `cache.ResultCache`. The tables and the plot are then reused while the
+      feature and target columns are unchanged. Default is None.
+    - return_plot_data (bool, optional): If True, also return what the figure is drawn from, so that it can be
+      rendered later with `plotting.plot_numerical_feature(None, feature, target, plot_data=plot_data)`. Default is False.
     Returns:
     - outliers_df (pandas.DataFrame): A dataframe containing the percentage of outliers in the data.
     - summary_df (pandas.DataFrame): A dataframe containing the overall statistics, lower outliers statistics, and upper outliers statistics.
+    - plot_data (dict): Only if `return_plot_data` is True. The resolved number of histogram bins ("bins"), the
+      histogram counts and edges ("histogram"), the binned KDE ("kde") and the box statistics of each class ("boxes").
     """
 
     if feature not in df.columns:
@@ -100,119 +658,355 @@ def numerical_feature(df, feature, target=None, figsize=(15, 6), bins="sturges")
     if target and target not in df.columns:
         raise ValueError(f"Column '{target}' not found in the dataframe.")
 
-    # Calculate the number of bins if a method is provided
-    if isinstance(bins, str):
-        if bins == "sturges":
-            bins = int(np.ceil(np.log2(len(df[feature])) + 1))
-        elif bins == "rice":
-            bins = int(np.ceil(2 * len(df[feature]) ** (1 / 3)))
-        elif bins == "scott":
-            bin_width = 3.5 * df[feature].std() * len(df[feature]) ** (-1 / 3)
-            bins = int(np.ceil((df[feature].max() - df[feature].min()) / bin_width))
-        elif bins == "fd":  # Freedman-Diaconis
-            bin_width = (
-                2
-                * (df[feature].quantile(0.75) - df[feature].quantile(0.25))
-                * len(df[feature]) ** (-1 / 3)
+    with span("numerical_feature", feature=feature, n_rows=len(df)):
+        if cache is not None:
+            from .cache import cached_call, column_fingerprint
+
+            columns = [feature, target] if target else [feature]
+            return cached_call(
+                cache,
+                "numerical_feature",
+                [column_fingerprint(df[column]) for column in columns],
+                dict(
+                    feature=feature, target=target, figsize=tuple(figsize), bins=bins, plot=plot,
+                    return_plot_data=return_plot_data,
+                ),
+                lambda png_file: _numerical_feature(
+                    df, feature, target, figsize, bins, plot, png_file, return_plot_data=return_plot_data
+                ),
+                plot_name=f"{feature}-{target}-boxplot.png" if plot else None,
             )
-            bins = int(np.ceil((df[feature].max() - df[feature].min()) / bin_width))
-        else:
-            raise ValueError(f"Unknown binning method: '{bins}'")
-
-    # Create the figure and subplots
-    fig, ax = plt.subplots(2, 1, figsize=figsize, sharex=True)
-
-    # First plot: Histogram with KDE
-    sns.histplot(df, x=feature, kde=True, ax=ax[0], bins=bins)
-    ax[0].set_title(f"Distribution of {feature} with KDE")
-    ax[0].set_ylabel("Frequency")
-    ax[0].grid(True, which="both", linestyle="--", linewidth=0.5)
-
-    # Second plot: Boxplot of the feature by the target (if provided)
-    if target:
-        # Check seaborn version to decide whether to include the 'gap' parameter
-        if sns.__version__ >= "0.13":
-            sns.boxplot(df, x=feature, ax=ax[1], hue=target, gap=0.05)
-        else:
-            sns.boxplot(df, x=feature, ax=ax[1], hue=target)
-        ax[1].set_title(f"Box Plot of {feature} by {target} Status")
-    else:
-        sns.boxplot(df, x=feature, ax=ax[1])
-        ax[1].set_title(f"Box Plot of {feature}")
 
-    ax[1].set_ylabel("")
-    ax[1].grid(True, which="both", linestyle="--", linewidth=0.5)
+        return _numerical_feature(df, feature, target, figsize, bins, plot, return_plot_data=return_plot_data)
 
-    # Adjust layout for better spacing
-    plt.tight_layout()
 
-    # Display the plots
-    if is_jupyter_notebook():
-        plt.show()  # Show plot if in Jupyter notebook
-    else:
-        plt.savefig(f"./plots/{feature}-{target}-boxplot.png")
+def _numerical_feature(
+    df, feature, target, figsize, bins, plot, png_file=None, output_dir=None, return_plot_data=False
+):
+    # Every statistic and the number of bins come from one sorted copy of the column
+    with_plot_data = plot or return_plot_data
+    with span("statistics"):
+        summary = _numeric_summary(
+            df[feature],
+            bins=bins,
+            plot_data=with_plot_data,
+            target_values=df[target] if with_plot_data and target else None,
+        )
 
-    # Calculate overall statistics
-    overall_summary = df[feature].describe().to_frame().T
-    overall_summary.index = [f"{feature}_Overall"]
+    if plot:
+        from .plotting import plot_numerical_feature
+
+        # The figure is drawn from the summary, so its cost does not depend on the number of rows
+        with span("plot"):
+            plot_numerical_feature(
+                None,
+                feature,
+                target=target,
+                figsize=figsize,
+                png_file=png_file,
+                plot_data=summary["plot_data"],
+                output_dir=output_dir,
+            )
 
-    # Calculate the lower and upper bounds for outliers
-    Q1 = df[feature].quantile(0.25)
-    Q3 = df[feature].quantile(0.75)
-    IQR = Q3 - Q1
+    if return_plot_data:
+        return (*_numerical_frames(summary, feature), summary["plot_data"])
+    return _numerical_frames(summary, feature)
+
+
+def _block_quantile(sorted_block, counts, q):
+    """
+    Linearly interpolated quantile of every column of a column-sorted block whose missing values sort last.
 
-    lower_bound = Q1 - 1.5 * IQR
-    upper_bound = Q3 + 1.5 * IQR
+    Column j holds counts[j] valid values; the result matches `_sorted_quantile` on each column.
+    """
+    columns = np.arange(sorted_block.shape[1])
+    position = (counts - 1) * q
+    lower = np.floor(np.maximum(position, 0)).astype(np.int64)
+    upper = np.minimum(lower + 1, np.maximum(counts - 1, 0))
+    a, b, t = sorted_block[lower, columns], sorted_block[upper, columns], position - lower
+    with np.errstate(invalid="ignore"):
+        quantile = np.where(t >= 0.5, b - (b - a) * (1 - t), a + (b - a) * t)
+    return np.where(counts > 0, quantile, np.nan)
 
-    # Identify lower and upper bound outliers
-    lower_outliers = df[df[feature] < lower_bound]
-    upper_outliers = df[df[feature] > upper_bound]
 
-    # Get descriptive statistics for lower and upper outliers
-    lower_outliers_summary = lower_outliers[feature].describe().to_frame().T
-    lower_outliers_summary.index = [f"{feature}_Lower_Outliers"]
+def _block_moments(sorted_block, starts, stops, block_size=1 << 16):
+    """
+    Mean and sample standard deviation of sorted_block[starts[j]:stops[j], j] for every column j.
 
-    upper_outliers_summary = upper_outliers[feature].describe().to_frame().T
-    upper_outliers_summary.index = [f"{feature}_Upper_Outliers"]
+    Only the rows between the smallest start and the largest stop are visited, in blocks of rows; rows
+    shared by every range are summed directly and the others through `where=` masks, so no subset of rows
+    is copied. For outlier tails, which are short runs at the ends of the sorted columns, this is cheap.
+    """
+    n_columns = sorted_block.shape[1]
+    sizes = stops - starts
+    first, last = (int(starts.min()), int(stops.max())) if n_columns else (0, 0)
+    shared_first, shared_last = (int(starts.max()), int(stops.min())) if n_columns else (0, 0)
+
+    def masked_sums(values_of):
+        total = np.zeros(n_columns)
+        for start in range(first, last, block_size):
+            stop = min(start + block_size, last)
+            values = values_of(sorted_block[start:stop])
+            if shared_first <= start and stop <= shared_last:
+                total += values.sum(axis=0)
+            else:
+                rows = np.arange(start, stop)[:, None]
+                total += values.sum(axis=0, where=(rows >= starts) & (rows < stops))
+        return total
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = masked_sums(lambda rows: rows) / sizes
+        sum_of_squares = masked_sums(lambda rows: (rows - mean) ** 2)
+        std = np.where(sizes > 1, np.sqrt(sum_of_squares / (sizes - 1)), np.nan)
+    return np.where(sizes > 0, mean, np.nan), std
+
+
+def _block_profile(sorted_block):
+    """
+    Every statistic of `profile_numerical` for each column of a block sorted along its rows.
 
-    # Combine overall statistics with lower and upper outlier statistics
-    summary_df = pd.concat(
-        [overall_summary, lower_outliers_summary, upper_outliers_summary]
+    Parameters:
+        sorted_block (ndarray): An (n_rows, n_features) float64 block, each column sorted with NaNs last.
+    Returns:
+        dict: One array per statistic, with one value per column.
+    """
+    n_rows, n_columns = sorted_block.shape
+    columns = np.arange(n_columns)
+    # Binary searches on the sorted columns: NaNs sort last, and so does the position of NaN
+    counts = np.array([np.searchsorted(sorted_block[:, j], np.nan) for j in columns], dtype=np.int64)
+    last = np.maximum(counts - 1, 0)
+    empty = counts == 0
+    zeros = np.zeros(n_columns, dtype=np.int64)
+
+    q1 = _block_quantile(sorted_block, counts, 0.25)
+    q3 = _block_quantile(sorted_block, counts, 0.75)
+    lower_bound = q1 - 1.5 * (q3 - q1)
+    upper_bound = q3 + 1.5 * (q3 - q1)
+    # The outliers of each column are contiguous runs at both ends of its sorted values
+    n_lower = np.array(
+        [np.searchsorted(sorted_block[: counts[j], j], lower_bound[j], side="left") for j in columns],
+        dtype=np.int64,
+    )
+    n_upper = counts - np.array(
+        [np.searchsorted(sorted_block[: counts[j], j], upper_bound[j], side="right") for j in columns],
+        dtype=np.int64,
     )
 
-    # Print the percentage of outliers in the data
-    outlier_percentage = ((len(lower_outliers) + len(upper_outliers)) / len(df)) * 100
-    lower_outliers_percentage = (len(lower_outliers) / len(df)) * 100
-    upper_outliers_percentage = (len(upper_outliers) / len(df)) * 100
-    outliers_df = pd.DataFrame(
-        {
-            "Outlier Percentage": [outlier_percentage],
-            "Lower Outliers Percentage": [lower_outliers_percentage],
-            "Upper Outliers Percentage": [upper_outliers_percentage],
+    mean, std = _block_moments(sorted_block, zeros, counts)
+    lower_mean, lower_std = _block_moments(sorted_block, zeros, n_lower)
+    upper_mean, upper_std = _block_moments(sorted_block, counts - n_upper, counts)
+
+    def tail_value(rows, size):
+        return np.where(size > 0, sorted_block[np.clip(rows, 0, max(n_rows - 1, 0)), columns], np.nan)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "count": counts.astype(np.float64),
+            "mean": mean,
+            "std": std,
+            "min": np.where(empty, np.nan, sorted_block[0, columns]),
+            "25%": q1,
+            "50%": _block_quantile(sorted_block, counts, 0.5),
+            "75%": q3,
+            "max": np.where(empty, np.nan, sorted_block[last, columns]),
+            "IQR": q3 - q1,
+            "Lower Bound": lower_bound,
+            "Upper Bound": upper_bound,
+            "Outlier Percentage": (n_lower + n_upper) / n_rows * 100,
+            "Lower Outliers Percentage": n_lower / n_rows * 100,
+            "Upper Outliers Percentage": n_upper / n_rows * 100,
+            "Lower Outliers Count": n_lower,
+            "Lower Outliers Mean": lower_mean,
+            "Lower Outliers Std": lower_std,
+            "Lower Outliers Min": tail_value(zeros, n_lower),
+            "Lower Outliers Max": tail_value(n_lower - 1, n_lower),
+            "Upper Outliers Count": n_upper,
+            "Upper Outliers Mean": upper_mean,
+            "Upper Outliers Std": upper_std,
+            "Upper Outliers Min": tail_value(counts - n_upper, n_upper),
+            "Upper Outliers Max": tail_value(last, n_upper),
         }
-    )
 
-    return outliers_df, summary_df
 
+def _stack_columns(df, features, rows=None):
+    """
+    Stack numerical columns into one Fortran-ordered float64 block, optionally gathering `rows` in that order.
+    """
+    block = np.empty((len(df) if rows is None else len(rows), len(features)), dtype=np.float64, order="F")
+    for j, feature in enumerate(features):
+        values = df[feature].to_numpy(dtype=np.float64, na_value=np.nan)
+        block[:, j] = values if rows is None else values[rows]
+    return block
 
-def missing_values(dataframe):
+
+def profile_numerical(df, features=None, target=None, block_columns=32):
+    """
+    Profile many numerical features at once: quartiles, IQR bounds, outlier rates and outlier tail summaries,
+    overall and for each class of a target.
+
+    The features are stacked into a 2-D float64 block (`block_columns` features at a time, to bound memory)
+    that is sorted along its rows in place. Quantiles are read along the row axis for every column at once,
+    skipping the missing values that sort last, and the outlier tails are the contiguous runs at both ends of
+    each sorted column: their statistics are computed with masked reductions, without copying any rows into
+    outlier subsets. The per-class statistics come from one grouped pass: the rows are gathered grouped by
+    class with a single stable sort of the target codes, and each class is a contiguous slice of the block.
+
+    Parameters:
+        df (DataFrame): The input DataFrame.
+        features (list): The numerical features to profile. Default is None (every numerical column except
+                         the target; booleans are skipped).
+        target (str): Optional target column. Rows with a missing target only count in the overall statistics.
+        block_columns (int): Number of features stacked and sorted at a time. Default is 32.
+    Returns:
+        DataFrame: A tidy table with one row per feature (and per feature and class if a target is given, after
+                   the overall row, whose Class is NaN). Its columns are the `describe` statistics, the IQR and
+                   its bounds, the outlier percentages as in `numerical_feature`, and the count, mean, std, min
+                   and max of each outlier tail.
+    Raises:
+        ValueError: If the target or a feature is not a column of the DataFrame.
+    """
+    if features is None:
+        features = [
+            column
+            for column in df.columns
+            if column != target
+            and pd.api.types.is_numeric_dtype(df[column].dtype)
+            and not pd.api.types.is_bool_dtype(df[column].dtype)
+        ]
+    requested = [*([target] if target is not None else []), *features]
+    missing = [column for column in requested if column not in df.columns]
+    if missing:
+        raise ValueError(f"Columns {missing} not found in the dataframe.")
+
+    groups = [(np.nan, None)]
+    if target is not None:
+        target_codes, classes = _factorize(df[target])
+        # One stable sort of the codes groups the rows of each class together
+        order = np.argsort(target_codes, kind="stable")
+        bounds = np.searchsorted(target_codes[order], np.arange(len(classes) + 1))
+        rows = order[bounds[0] :]
+        groups += [
+            (class_value, (bounds[j] - bounds[0], bounds[j + 1] - bounds[0]))
+            for j, class_value in enumerate(classes)
+        ]
+
+    tables = []
+    for start in range(0, len(features), block_columns):
+        block_features = features[start : start + block_columns]
+        profiles = []
+
+        with span("statistics", n_features=len(block_features)):
+            block = _stack_columns(df, block_features)
+            block.sort(axis=0)
+            profiles.append(_block_profile(block))
+            del block
+
+            if target is not None:
+                block = _stack_columns(df, block_features, rows)
+                for _, (first, last) in groups[1:]:
+                    group_block = block[first:last]
+                    group_block.sort(axis=0)
+                    profiles.append(_block_profile(group_block))
+                del block
+
+        for (class_value, _), profile in zip(groups, profiles):
+            table = pd.DataFrame(profile)
+            table.insert(0, "Feature", block_features)
+            if target is not None:
+                table.insert(1, "Class", class_value)
+            tables.append(table)
+
+    if not tables:
+        columns = ["Feature", *(["Class"] if target is not None else [])]
+        return pd.DataFrame(columns=columns)
+
+    profile = pd.concat(tables, ignore_index=True)
+    # Feature-major order: the overall row of a feature first, then its classes
+    feature_order = {feature: i for i, feature in enumerate(features)}
+    return profile.sort_values(
+        "Feature", key=lambda column: column.map(feature_order), kind="stable"
+    ).reset_index(drop=True)
+
+
+def _null_counts(dataframe, block_size=1 << 20):
+    """
+    Count the missing values of every column without building a boolean copy of the DataFrame.
+
+    Columns are visited one at a time and NumPy-backed columns in blocks of `block_size` rows, so the
+    temporary mask never exceeds one block.
+
+    Parameters:
+        dataframe (DataFrame): The input DataFrame.
+        block_size (int): Number of rows checked at a time.
+    Returns:
+        Series: The number of missing values of each column.
+    """
+    counts = []
+    for i in range(dataframe.shape[1]):
+        values = dataframe.iloc[:, i].array
+        if isinstance(values, pd.arrays.NumpyExtensionArray) and values.dtype.kind in "fcOmM":
+            values = values.to_numpy()
+            counts.append(
+                sum(
+                    int(pd.isna(values[start : start + block_size]).sum())
+                    for start in range(0, len(values), block_size)
+                )
+            )
+        elif isinstance(values, pd.arrays.NumpyExtensionArray):
+            counts.append(0)  # integer and boolean arrays cannot hold missing values
+        else:
+            counts.append(int(values.isna().sum()))
+    return pd.Series(counts, index=dataframe.columns, dtype=np.int64)
+
+
+def missing_values(dataframe, chunksize=1_000_000, cache=None):
     """
     Generates a summary of missing values in the dataframe.
 
     Parameters:
-    dataframe (pd.DataFrame): The input dataframe to analyze.
+    dataframe (pd.DataFrame or str): The input dataframe to analyze, or the path to a Parquet, Feather or CSV file.
+        Parquet null counts are read from the column statistics without decoding any data, Feather null counts
+        from the record batch metadata, and CSV files are streamed in chunks with running totals per column.
+    chunksize (int): Number of rows read per chunk for CSV files. Default is 1,000,000.
+    cache (ResultCache): Optional `cache.ResultCache`, keyed by the content of every column (or by the size,
+        modification time and sampled content of a file). Default is None.
 
     Returns:
     pd.DataFrame: A dataframe containing the count and percentage of missing values,
                   along with the data type of each column that has missing values.
     """
+    if cache is not None:
+        from .cache import cached_call, column_fingerprint, file_fingerprint
+
+        if isinstance(dataframe, (str, os.PathLike)):
+            fingerprints, columns = [file_fingerprint(dataframe)], None
+        else:
+            fingerprints = [column_fingerprint(dataframe.iloc[:, i]) for i in range(dataframe.shape[1])]
+            columns = list(dataframe.columns)
+        return cached_call(
+            cache,
+            "missing_values",
+            fingerprints,
+            dict(columns=columns),
+            lambda png_file: missing_values(dataframe, chunksize),
+        )
+
+    if isinstance(dataframe, (str, os.PathLike)):
+        from .streaming import _missing_counts_from_file
+
+        null_counts, n_rows, dtypes = _missing_counts_from_file(dataframe, chunksize)
+    else:
+        null_counts, n_rows, dtypes = (
+            _null_counts(dataframe),
+            len(dataframe),
+            dataframe.dtypes,
+        )
+
     missing_values_summary = pd.DataFrame(
         {
-            "Missing Count": dataframe.isnull().sum(),
-            "Missing Percentage": (
-                dataframe.isnull().sum() / len(dataframe) * 100
-            ).round(2),
-            "Data Type": dataframe.dtypes,
+            "Missing Count": null_counts,
+            "Missing Percentage": (null_counts / n_rows * 100).round(2),
+            "Data Type": dtypes,
         }
     )
 
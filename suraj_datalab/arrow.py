@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+
+from .streaming import _import_pyarrow
+
+
+def _index_type(n_categories):
+    pa = _import_pyarrow()
+    for index_type, dtype in ((pa.int8(), np.int8), (pa.int16(), np.int16)):
+        if n_categories <= np.iinfo(dtype).max:
+            return index_type, dtype
+    return pa.int32(), np.int32
+
+
+def _dictionary_column(values):
+    """
+    Return a column as a dictionary-encoded ChunkedArray whose chunks all share one dictionary.
+
+    Dictionary columns (the usual encoding of strings in Parquet) are only unified; other columns are
+    dictionary-encoded once. The strings of the dictionary are never converted to Python objects.
+    """
+    pa = _import_pyarrow()
+    import pyarrow.compute as pc
+
+    if isinstance(values, pa.Array):
+        values = pa.chunked_array([values])
+    if not pa.types.is_dictionary(values.type):
+        values = pc.dictionary_encode(values)
+    return values.unify_dictionaries()
+
+
+def _dictionary(values):
+    pa = _import_pyarrow()
+
+    if values.num_chunks:
+        return values.chunk(0).dictionary
+    return pa.array([], type=values.type.value_type)
+
+
+def _chunk_indices(chunk):
+    """
+    The dictionary indices of a DictionaryArray in their own integer type, -1 for missing values.
+    """
+    import pyarrow.compute as pc
+
+    return pc.fill_null(chunk.indices, -1).to_numpy()
+
+
+def _indices(values):
+    chunks = [_chunk_indices(chunk) for chunk in values.chunks]
+    return np.concatenate(chunks).astype(np.int64) if chunks else np.empty(0, dtype=np.int64)
+
+
+def _arrow_factorize(values, dropna=True, keep_categories=False):
+    """
+    Encode an Arrow column as integer codes from its dictionary indices, like `analyze._factorize`.
+
+    Parameters:
+        values (pa.Array or pa.ChunkedArray): The values to encode.
+        dropna (bool): If True, missing values get the code -1; otherwise they are encoded as a class.
+        keep_categories (bool): If True and the column is dictionary-encoded, keep its dictionary order and
+                                every dictionary entry (including unused ones), as `to_pandas()` would with
+                                a categorical column.
+    Returns:
+        tuple: An int64 array of codes and an Index of the unique values.
+    """
+    pa = _import_pyarrow()
+
+    categorical = pa.types.is_dictionary(values.type)
+    values = _dictionary_column(values)
+    codes = _indices(values)
+    dictionary = _dictionary(values).to_pandas()
+
+    if keep_categories and categorical:
+        uniques = pd.CategoricalIndex(
+            dictionary, categories=dictionary, ordered=values.type.ordered
+        )
+        return codes, uniques
+
+    # Observed values only, in order of appearance; factorizing the small integer codes is cheap
+    new_codes, used = pd.factorize(codes)
+    if dropna and (used < 0).any():
+        # Missing values (index -1) were factorized like any other value
+        missing = np.flatnonzero(used < 0)[0]
+        new_codes = np.where(new_codes == missing, -1, new_codes - (new_codes > missing))
+        used = used[used >= 0]
+    uniques = pd.Index(
+        [dictionary[code] if code >= 0 else np.nan for code in used]
+        if (used < 0).any()
+        else dictionary.take(used)
+    )
+    return new_codes.astype(np.int64, copy=False), uniques
+
+
+def category_counts(values):
+    """
+    Count the categories of an Arrow column from its dictionary indices.
+
+    Parameters:
+        values (pa.Array or pa.ChunkedArray): The column. Missing values are not counted.
+    Returns:
+        pd.Series: The count of every dictionary entry (including unused ones), in dictionary order.
+    """
+    values = _dictionary_column(values)
+    dictionary = _dictionary(values)
+    counts = np.zeros(len(dictionary), dtype=np.int64)
+    for chunk in values.chunks:
+        indices = chunk.indices.drop_null().to_numpy()
+        counts += np.bincount(indices, minlength=len(dictionary))
+    return pd.Series(counts, index=pd.Index(dictionary.to_pandas()), name="count")
+
+
+def replace_categories(values, categories):
+    """
+    Replace every value of an Arrow column outside `categories[:-1]` with `categories[-1]`.
+
+    Only the dictionary is looked up (O(cardinality)) and the indices are remapped with one take per chunk;
+    the strings of the original dictionary are neither copied nor converted. The result is a
+    dictionary-encoded column whose dictionary is `categories`.
+
+    Parameters:
+        values (pa.Array or pa.ChunkedArray): The column.
+        categories (pd.Index): The compiled categories of `RareCategoryReplacer`, replacement value last.
+    Returns:
+        pa.ChunkedArray: The replaced column.
+    """
+    pa = _import_pyarrow()
+
+    values = _dictionary_column(values)
+    other = len(categories) - 1
+    mapping = categories.get_indexer(_dictionary(values).to_pandas())
+    index_type, index_dtype = _index_type(len(categories))
+    # The extra last entry maps missing values (index -1) to the replacement value
+    mapping = np.append(np.where(mapping == -1, other, mapping), other).astype(index_dtype)
+
+    dictionary = pa.array(list(categories))
+    chunks = [
+        pa.DictionaryArray.from_arrays(
+            pa.array(mapping[_chunk_indices(chunk)], type=index_type),
+            dictionary,
+        )
+        for chunk in values.chunks
+    ]
+    return pa.chunked_array(chunks, type=pa.dictionary(index_type, dictionary.type))
+
+
+def to_arrow(frame):
+    """
+    Convert a result table to a pyarrow Table, keeping a named index (such as the categories) as a column.
+    """
+    pa = _import_pyarrow()
+
+    return pa.Table.from_pandas(frame, preserve_index=frame.index.name is not None)
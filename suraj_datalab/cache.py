@@ -0,0 +1,236 @@
+import hashlib
+import io
+import os
+import pickle
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .analyze import _is_arrow, is_jupyter_notebook
+
+
+def _hash_arrow_array(digest, array):
+    """
+    Hash the rows of an Arrow array, whatever slice of its buffers they occupy.
+    """
+    import pyarrow as pa
+
+    if array.offset:
+        # Buffers are shared with the parent of a slice; copy only the rows of the slice, at offset 0
+        array = pa.concat_arrays([array])
+    buffers = array.buffers()
+    digest.update(repr((len(array), [None if buffer is None else buffer.size for buffer in buffers])).encode())
+    for buffer in buffers:
+        if buffer is not None:
+            digest.update(buffer)
+    if pa.types.is_dictionary(array.type):
+        # The dictionary is not one of the buffers of the indices
+        _hash_arrow_array(digest, array.dictionary)
+
+
+def column_fingerprint(values):
+    """
+    Hash the full content of a column, so that any change to the data gives a different fingerprint.
+
+    NumPy-backed numeric, boolean and datetime columns are hashed straight from their buffer, categorical
+    columns from their codes and categories, Arrow columns from the buffers of their rows and their
+    dictionaries, and other columns (strings,
+    objects, extension arrays) from `pd.util.hash_pandas_object`. The index is ignored.
+
+    Parameters:
+        values (Series, np.ndarray or pa.ChunkedArray): The column.
+    Returns:
+        str: A hexadecimal digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+
+    if _is_arrow(values):
+        digest.update(str(values.type).encode())
+        for chunk in getattr(values, "chunks", [values]):
+            _hash_arrow_array(digest, chunk)
+        return digest.hexdigest()
+
+    values = pd.Series(values, copy=False)
+    digest.update(repr((str(values.dtype), len(values))).encode())
+    array = values.array
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        digest.update(np.ascontiguousarray(values.cat.codes.to_numpy()).data)
+        categories = pd.util.hash_pandas_object(values.cat.categories.to_series(), index=False)
+        digest.update(categories.to_numpy().data)
+    elif isinstance(array, pd.arrays.NumpyExtensionArray) and values.dtype.kind in "biufcmM":
+        digest.update(np.ascontiguousarray(array.to_numpy()).view(np.uint8).data)
+    else:
+        digest.update(pd.util.hash_pandas_object(values, index=False).to_numpy().data)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path):
+    """
+    Fingerprint a file from its size, modification time and sampled content (see `fold_index.fingerprint`).
+    """
+    from .fold_index import fingerprint
+
+    return fingerprint(path)
+
+
+def _copy_result(result):
+    # Callers may modify the returned tables; the cached ones must stay intact
+    if isinstance(result, tuple):
+        return tuple(_copy_result(item) for item in result)
+    if isinstance(result, (pd.DataFrame, pd.Series)):
+        return result.copy()
+    return result
+
+
+class ResultCache:
+    """
+    A content-addressed cache for the results and plots of the analyze functions.
+
+    Entries are keyed by the name of the function, the fingerprint of every column it reads and its
+    parameters, so an unchanged column is served from the cache and any change to the data misses it.
+    Results and the rendered PNGs are kept in an in-memory LRU of at most `max_entries` entries and, if a
+    directory is given, also written to disk so that later processes (scheduled reports) can reuse them.
+
+    Pass the cache to `categorical_feature`, `numerical_feature` or `missing_values` with `cache=...`.
+
+    Parameters:
+    ----------
+    max_entries : int, optional (default=128)
+        Maximum number of entries kept in memory; the least recently used entry is evicted first.
+    directory : str, optional (default=None)
+        Directory of the on-disk store. If None, the cache lives in memory only.
+
+    Attributes:
+    ----------
+    hits : int
+        Number of lookups served from memory or disk.
+    misses : int
+        Number of lookups that had to be computed.
+    """
+
+    def __init__(self, max_entries=128, directory=None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def key(self, function, fingerprints, **params):
+        """
+        Build the key of a call from the function name, the fingerprints of its data and its parameters.
+        """
+        description = repr((function, list(fingerprints), sorted(params.items())))
+        return hashlib.blake2b(description.encode(), digest_size=16).hexdigest()
+
+    def _path(self, key, suffix):
+        return os.path.join(self.directory, f"{key}{suffix}")
+
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key):
+        """
+        Look up an entry in memory, then on disk.
+
+        Returns:
+        -------
+        tuple or None
+            A copy of the cached result and the dict of cached PNGs (file name -> bytes), or None on a miss.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        elif self.directory and os.path.exists(self._path(key, ".pkl")):
+            with open(self._path(key, ".pkl"), "rb") as file:
+                result, plot_names = pickle.load(file)
+            plots = {}
+            for name in plot_names:
+                with open(self._path(key, f"-{name}"), "rb") as file:
+                    plots[name] = file.read()
+            entry = (result, plots)
+            self._remember(key, entry)
+
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        result, plots = entry
+        return _copy_result(result), plots
+
+    def put(self, key, result, plots=None):
+        """
+        Store a result and its rendered plots (file name -> PNG bytes).
+        """
+        plots = dict(plots or {})
+        self._remember(key, (_copy_result(result), plots))
+
+        if self.directory:
+            # PNGs first and the pickle last, renamed into place, so a reader never sees a partial entry
+            for name, png in plots.items():
+                with open(self._path(key, f"-{name}"), "wb") as file:
+                    file.write(png)
+            temporary = self._path(key, ".pkl.tmp")
+            with open(temporary, "wb") as file:
+                pickle.dump((result, list(plots)), file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, self._path(key, ".pkl"))
+
+    def clear(self):
+        """
+        Empty the in-memory LRU. The on-disk store is left untouched.
+        """
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def show_cached_plots(plots):
+    """
+    Display cached PNGs in a notebook, or write them under ./plots as the plotting functions do otherwise.
+    """
+    if is_jupyter_notebook():
+        from IPython.display import Image, display
+
+        for png in plots.values():
+            display(Image(data=png))
+        return
+
+    os.makedirs("./plots", exist_ok=True)
+    for name, png in plots.items():
+        with open(os.path.join("./plots", name), "wb") as file:
+            file.write(png)
+
+
+def cached_call(cache, function, fingerprints, params, compute, plot_name=None):
+    """
+    Serve a call of an analyze function from the cache, or compute it and store the result.
+
+    Parameters:
+        cache (ResultCache): The cache.
+        function (str): The name of the function, part of the key.
+        fingerprints (list): The fingerprints of the data read by the call, part of the key.
+        params (dict): The parameters of the call, part of the key.
+        compute (callable): Called on a miss with a PNG buffer (or None if nothing is plotted); it computes
+                            the result, renders the plot into the buffer and returns the result.
+        plot_name (str): File name of the plot, or None if the call does not plot.
+    Returns:
+        The result of the call.
+    """
+    key = cache.key(function, fingerprints, **params)
+    cached = cache.get(key)
+    if cached is not None:
+        result, plots = cached
+        if plots:
+            show_cached_plots(plots)
+        return result
+
+    png_file = io.BytesIO() if plot_name else None
+    result = compute(png_file)
+    cache.put(key, result, {plot_name: png_file.getvalue()} if plot_name else None)
+    return result
@@ -2,11 +2,16 @@ from sklearn.base import BaseEstimator, TransformerMixin
 import numpy as np
 import pandas as pd
 
+from .analyze import _is_arrow
+
 
 class RareCategoryReplacer(BaseEstimator, TransformerMixin):
     """
     A transformer class for replacing rare categories in specified columns of a DataFrame.
 
+    pyarrow Tables are handled natively: categories are counted from the dictionary indices and `transform`
+    remaps the dictionary and indices of each column, without converting strings to Python objects.
+
     Parameters:
     ----------
     columns : list
@@ -15,68 +20,442 @@ class RareCategoryReplacer(BaseEstimator, TransformerMixin):
         Threshold below which a category is considered rare.
     replacement_value : str, optional (default="Others")
         Value to replace rare categories with.
+    copy : bool, optional (default=True)
+        If False, `transform` replaces the columns of the input DataFrame in place and returns it, instead of
+        working on a copy.
 
     Attributes:
     ----------
+    category_counts_ : dict
+        The raw count of every category seen so far, for each specified column. These counts are mergeable
+        across chunks and processes; everything else is derived from them.
+    n_samples_seen_ : int
+        Number of rows seen by `fit` or `partial_fit`.
     rare_categories_ : dict
         Dictionary containing the rare categories for each specified column.
     important_categories_ : dict
         Dictionary containing the important categories for each specified column.
+    category_maps_ : dict
+        The compiled mapping of each specified column: an Index of the important categories followed by the
+        replacement value. A value is replaced by the entry at its position in the Index, or by the last
+        entry if it is not in the Index.
 
     Methods:
     -------
     fit(X, y=None)
         Fit the transformer to the data by calculating the rare categories and important categories for each specified column.
+    partial_fit(X, y=None)
+        Add the category counts of a chunk of data to the counts seen so far.
+    merge(other)
+        Add the category counts of another replacer, for example one fitted in another process.
     transform(X)
         Transform the data by replacing rare categories with the replacement value.
+    transform_chunks(chunks)
+        Transform an iterable of DataFrame chunks, yielding each transformed chunk.
     fit_transform(X, y=None)
         Fit the transformer to the data and transform it in a single step.
     """
-    def __init__(self, columns, proportion_threshold=0.02, replacement_value="Others"):
+    def __init__(self, columns, proportion_threshold=0.02, replacement_value="Others", copy=True):
         self.columns = columns
         self.proportion_threshold = proportion_threshold
         self.replacement_value = replacement_value
-        self.rare_categories_ = {}
-        self.important_categories_ = {}
+        self.copy = copy
+
+    def _reset(self):
+        self.category_counts_ = {}
+        self.n_samples_seen_ = 0
+        self._compiled = None
 
     def fit(self, X, y=None):
-        # Calculate the percentage of each category for each specified column
+        # Start from empty counts, then count the whole data set as a single chunk
+        self._reset()
+        return self.partial_fit(X)
+
+    def _add_counts(self, column, counts):
+        if column in self.category_counts_:
+            # Summing by category keeps the order of first appearance, as value_counts does on all the data
+            counts = pd.concat([self.category_counts_[column], counts]).groupby(level=0, sort=False).sum()
+        self.category_counts_[column] = counts
+
+    def partial_fit(self, X, y=None):
+        """
+        Add the category counts of a chunk to the counts seen so far. Memory grows with the number of
+        distinct categories, not with the number of rows.
+        """
+        if not hasattr(self, "category_counts_"):
+            self._reset()
+
         for column in self.columns:
-            category_percentages = X[column].value_counts(normalize=True)
-            self.rare_categories_[column] = category_percentages[
-                category_percentages < self.proportion_threshold
-            ].index.tolist()
-            self.important_categories_[column] = category_percentages[
-                category_percentages >= self.proportion_threshold
-            ].index.tolist()
+            if _is_arrow(X):
+                from .arrow import category_counts
+
+                # Counted from the dictionary indices; the strings are never converted
+                self._add_counts(column, category_counts(X[column]))
+            else:
+                self._add_counts(column, X[column].value_counts(sort=False))
+        self.n_samples_seen_ += len(X)
+        # The rare and important categories are derived again from the counts on first use
+        self._compiled = None
 
         return self
 
-    def transform(self, X):
-        X = X.copy()  # Create a copy of the DataFrame to avoid modifying the original data
+    def merge(self, other):
+        """
+        Add the counts of another replacer, fitted on other data (for example in another process), in place.
+        """
+        if not hasattr(self, "category_counts_"):
+            self._reset()
+
+        for column, counts in other.category_counts_.items():
+            self._add_counts(column, counts)
+        self.n_samples_seen_ += other.n_samples_seen_
+        self._compiled = None
+
+        return self
+
+    def _compile(self):
+        if getattr(self, "_compiled", None) is None:
+            if not hasattr(self, "category_counts_"):
+                raise AttributeError(
+                    "This RareCategoryReplacer is not fitted yet. Call 'fit' or 'partial_fit' first."
+                )
+            rare_categories, important_categories, category_maps = {}, {}, {}
+            # Calculate the percentage of each category for each specified column
+            for column, counts in self.category_counts_.items():
+                category_percentages = (counts / counts.sum()).sort_values(
+                    ascending=False, kind="stable"
+                )
+                rare_categories[column] = category_percentages[
+                    category_percentages < self.proportion_threshold
+                ].index.tolist()
+                important_categories[column] = category_percentages[
+                    category_percentages >= self.proportion_threshold
+                ].index.tolist()
+                # Compile the lookup once, so that transform does not rebuild it on every call
+                category_maps[column] = pd.Index(
+                    list(dict.fromkeys(important_categories[column] + [self.replacement_value]))
+                )
+            self._compiled = (rare_categories, important_categories, category_maps)
+
+        return self._compiled
+
+    def __setstate__(self, state):
+        # Replacers pickled before the counts were kept store the category lists themselves
+        legacy_rare = state.pop("rare_categories_", None)
+        legacy_important = state.pop("important_categories_", None)
+        state.setdefault("copy", True)
+        super().__setstate__(state)
+        if "category_counts_" not in state and (legacy_rare or legacy_important):
+            # Without counts the mapping cannot be refined by `partial_fit`, but `transform` works as before
+            category_maps = {
+                column: pd.Index(list(dict.fromkeys(categories + [self.replacement_value])))
+                for column, categories in legacy_important.items()
+            }
+            self._compiled = (legacy_rare, legacy_important, category_maps)
+
+    @property
+    def rare_categories_(self):
+        return self._compile()[0]
+
+    @property
+    def important_categories_(self):
+        return self._compile()[1]
+
+    @property
+    def category_maps_(self):
+        return self._compile()[2]
+
+    def _replace(self, values, categories):
+        """
+        Replace every value outside the important categories of a column with one vectorized lookup.
+
+        The column is reduced to integer codes and its distinct values, which are mapped to the compiled
+        categories in O(cardinality); the codes are then remapped with a single take. Categorical columns
+        already hold both, so only their category dictionary is looked up and the result stays categorical.
+        """
+        other = len(categories) - 1
+
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+        else:
+            codes, uniques = pd.factorize(values)
+
+        mapping = categories.get_indexer(uniques)
+        # The extra last entry maps missing values (code -1) to the replacement value
+        mapping = np.append(np.where(mapping == -1, other, mapping), other)
+        codes = mapping[codes]
+
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            dtype = pd.CategoricalDtype(categories, ordered=values.cat.ordered)
+            replaced = pd.Categorical.from_codes(codes, dtype=dtype, validate=False)
+        else:
+            replaced = categories.take(codes)
+        return pd.Series(replaced, index=values.index, name=values.name)
 
+    def _transform_arrow(self, X, category_maps):
+        """
+        Transform a pyarrow Table or RecordBatch by remapping the dictionary and indices of each column.
+        """
+        import pyarrow as pa
+
+        from .arrow import replace_categories
+
+        if isinstance(X, pa.RecordBatch):
+            X = pa.Table.from_batches([X])
         for column in self.columns:
-            # Replace rare categories with the replacement value
-            X[column] = np.where(
-                X[column].isin(self.rare_categories_[column]), 
-                self.replacement_value, 
-                X[column]
+            X = X.set_column(
+                X.schema.get_field_index(column),
+                column,
+                replace_categories(X[column], category_maps[column]),
             )
+        return X
 
-            # Replace any new categories not in the important categories with the replacement value
-            allowed_categories = self.important_categories_[column] + [self.replacement_value]
-            X[column] = np.where(
-                ~X[column].isin(allowed_categories), 
-                self.replacement_value, 
-                X[column]
-            )
+    def transform(self, X):
+        category_maps = self.category_maps_
+        if _is_arrow(X):
+            # Arrow data is immutable: the result is a new Table sharing the untouched columns
+            return self._transform_arrow(X, category_maps)
+        if self.copy:
+            # Only the replaced columns are rebuilt; the others are shared with the input
+            X = X.copy(deep=False)
+
+        for column in self.columns:
+            # Values outside the important categories (rare, unseen or missing) become the replacement value
+            X[column] = self._replace(X[column], category_maps[column])
 
         return X
 
+    def transform_chunks(self, chunks):
+        """
+        Transform an iterable of DataFrame chunks (for example `pd.read_csv(..., chunksize=...)`) lazily.
+
+        The mapping is compiled once; only one chunk is transformed at a time.
+        """
+        self._compile()
+        for chunk in chunks:
+            yield self.transform(chunk)
+
     def fit_transform(self, X, y=None):
         return self.fit(X).transform(X)
 
 
+_SIGNED_DTYPES = (np.int8, np.int16, np.int32, np.int64)
+_UNSIGNED_DTYPES = (np.uint8, np.uint16, np.uint32, np.uint64)
+
+
+def _holds(dtype, minimum, maximum):
+    """
+    Whether an integer dtype holds every value in [minimum, maximum].
+    """
+    info = np.iinfo(dtype)
+    return info.min <= minimum and maximum <= info.max
+
+
+def _smallest_integer_dtype(minimum, maximum, unsigned=False):
+    """
+    The smallest integer dtype holding every value in [minimum, maximum], or None if no dtype does.
+
+    Unsigned dtypes are used if `unsigned` is True and `minimum` is not negative, signed dtypes otherwise.
+    """
+    # Python ints compare exactly; uint64 values above the int64 maximum must not wrap
+    minimum, maximum = int(minimum), int(maximum)
+    for dtype in _UNSIGNED_DTYPES if unsigned and minimum >= 0 else _SIGNED_DTYPES:
+        if _holds(dtype, minimum, maximum):
+            return np.dtype(dtype)
+    return None
+
+
+class DtypeOptimizer(BaseEstimator, TransformerMixin):
+    """
+    A transformer that converts the columns of a DataFrame to the smallest safe dtypes.
+
+    `fit` chooses a dtype for each column: integer columns get the smallest integer dtype of the same
+    signedness that holds their range (never a wider one), low-cardinality string and object columns become
+    categoricals, and float64 columns become float32 if `downcast_floats` is True. The cardinality of string
+    columns is estimated on a random sample of at most `sample_rows` rows, so high-cardinality columns are
+    never hashed in full; the categories of the selected columns are then read from every row. `transform`
+    widens an integer dtype again if a column holds values outside the fitted range, so no value is ever
+    truncated.
+
+    Parameters:
+    ----------
+    columns : list, optional (default=None)
+        List of column names to optimize. If None, every column is considered.
+    sample_rows : int, optional (default=100_000)
+        Number of rows sampled to estimate the cardinality of string columns.
+    max_category_ratio : float, optional (default=0.5)
+        A string column becomes categorical if its number of distinct values is at most this fraction of its
+        non-missing sampled values.
+    downcast_floats : bool, optional (default=False)
+        Whether to convert float64 columns to float32, which keeps about 7 significant digits.
+    copy : bool, optional (default=True)
+        If False, `transform` converts the columns of the input DataFrame in place and returns it.
+    random_state : int, optional (default=42)
+        Seed of the row sample.
+
+    Attributes:
+    ----------
+    dtypes_ : dict
+        The target dtype of each converted column: a NumPy dtype, or a `pd.CategoricalDtype` holding every
+        distinct value of the fitted column. Values not seen by `fit` are appended after these categories.
+    source_dtypes_ : dict
+        The fitted dtype of each categorical column. Columns read with another dtype, such as an all-missing
+        chunk read as float64, are cast to it before being categorized, so every chunk has the same categories
+        dtype.
+
+    Methods:
+    -------
+    fit(X, y=None)
+        Choose the dtype of each column from the integer ranges and a sample of the string columns.
+    transform(X)
+        Convert the columns to their chosen dtypes.
+    fit_transform(X, y=None)
+        Fit the transformer to the data and transform it in a single step.
+    """
+    def __init__(
+        self, columns=None, sample_rows=100_000, max_category_ratio=0.5, downcast_floats=False, copy=True,
+        random_state=42,
+    ):
+        self.columns = columns
+        self.sample_rows = sample_rows
+        self.max_category_ratio = max_category_ratio
+        self.downcast_floats = downcast_floats
+        self.copy = copy
+        self.random_state = random_state
+
+    def fit(self, X, y=None):
+        columns = X.columns if self.columns is None else self.columns
+        if len(X) > self.sample_rows:
+            rows = np.random.default_rng(self.random_state).choice(len(X), self.sample_rows, replace=False)
+            sample = X.iloc[np.sort(rows)]
+        else:
+            sample = X
+
+        self.dtypes_ = {}
+        self.source_dtypes_ = {}
+        for column in columns:
+            values = X[column]
+            numpy_backed = isinstance(values.array, pd.arrays.NumpyExtensionArray)
+            if numpy_backed and values.dtype.kind in "iu" and len(values):
+                # Integer ranges are read from every row: min and max are cheap and a sample could miss the extremes
+                dtype = _smallest_integer_dtype(values.min(), values.max(), unsigned=values.dtype.kind == "u")
+                if dtype.itemsize < values.dtype.itemsize:
+                    self.dtypes_[column] = dtype
+            elif numpy_backed and values.dtype == np.float64 and self.downcast_floats:
+                self.dtypes_[column] = np.dtype(np.float32)
+            elif pd.api.types.is_object_dtype(values.dtype) or pd.api.types.is_string_dtype(values.dtype):
+                sampled = sample[column]
+                n_valid = sampled.notna().sum()
+                if n_valid and sampled.nunique() <= self.max_category_ratio * n_valid:
+                    # The categories are fixed here, so every transformed chunk shares the same codes
+                    categories = pd.Categorical(values.dropna().unique()).categories
+                    self.dtypes_[column] = pd.CategoricalDtype(categories)
+                    self.source_dtypes_[column] = values.dtype
+
+        return self
+
+    def _convert(self, values, column, dtype):
+        if isinstance(dtype, pd.CategoricalDtype):
+            source_dtype = self.source_dtypes_.get(column)
+            if source_dtype is not None and values.dtype != source_dtype:
+                values = values.astype(source_dtype)
+            codes = dtype.categories.get_indexer(values)
+            unseen = (codes == -1) & values.notna().to_numpy()
+            if unseen.any():
+                # Unseen values are appended after the fitted categories, which keep their codes
+                dtype = pd.CategoricalDtype(dtype.categories.append(pd.Index(values[unseen].unique())))
+                codes = dtype.categories.get_indexer(values)
+            return pd.Series(pd.Categorical.from_codes(codes, dtype=dtype), index=values.index, name=values.name)
+        if dtype.kind in "iu":
+            if values.dtype.kind not in "iu":
+                # A chunk with missing values was read as floats; it is left as it is
+                return values
+            if len(values):
+                minimum, maximum = values.min(), values.max()
+                if not _holds(dtype, minimum, maximum):
+                    # Widen the fitted dtype if this data holds values outside the fitted range
+                    wider = _smallest_integer_dtype(minimum, maximum, unsigned=dtype.kind == "u") or values.dtype
+                    dtype = np.promote_types(dtype, wider)
+                    if dtype.kind not in "iu" or not _holds(dtype, minimum, maximum):
+                        # No integer dtype holds both ranges (uint64 and negative values)
+                        return values
+        elif values.dtype != np.float64:
+            return values
+        return values.astype(dtype)
+
+    def transform(self, X):
+        if not hasattr(self, "dtypes_"):
+            raise AttributeError("This DtypeOptimizer is not fitted yet. Call 'fit' first.")
+        if self.copy:
+            # Only the converted columns are rebuilt; the others are shared with the input
+            X = X.copy(deep=False)
+
+        for column, dtype in self.dtypes_.items():
+            if column in X.columns:
+                X[column] = self._convert(X[column], column, dtype)
+
+        return X
+
+
+def _concat_chunks(chunks):
+    """
+    Concatenate DataFrame chunks, uniting the categories of categorical columns instead of falling back to object.
+    """
+    from pandas.api.types import union_categoricals
+
+    if len(chunks) == 1:
+        return chunks[0]
+    categorical = [
+        column for column in chunks[0].columns
+        if all(isinstance(chunk[column].dtype, pd.CategoricalDtype) for chunk in chunks)
+    ]
+    frame = pd.concat([chunk.drop(columns=categorical) for chunk in chunks], ignore_index=True)
+    for column in categorical:
+        frame[column] = union_categoricals([chunk[column] for chunk in chunks])
+    return frame[chunks[0].columns]
+
+
+def load_optimized(
+    file_path, columns=None, sample_rows=100_000, max_category_ratio=0.5, downcast_floats=False,
+    chunksize=1_000_000,
+):
+    """
+    Load a CSV, Parquet or Feather file with the smallest safe dtypes and only the requested columns.
+
+    The file is read chunk by chunk (see `streaming.read_chunks`). A `DtypeOptimizer` is fitted on the first
+    chunk and every chunk is converted before the next one is read, so the wide int64 and object columns of a
+    plain read only ever exist for one chunk. Integer dtypes are widened for chunks holding larger values,
+    and the categories of the chunks are united.
+
+    Parameters:
+    file_path (str): Path to a CSV, Parquet or Feather file.
+    columns (list): Optional list of the columns to read. Default is None (all columns).
+    sample_rows (int): Number of rows sampled to estimate the cardinality of string columns. Default is 100,000.
+    max_category_ratio (float): See `DtypeOptimizer`. Default is 0.5.
+    downcast_floats (bool): Whether to convert float64 columns to float32. Default is False.
+    chunksize (int): Number of rows read per chunk. Default is 1,000,000.
+
+    Returns:
+    pd.DataFrame: The dataset, with its columns in the requested order.
+    """
+    from .streaming import read_chunks
+
+    optimizer = DtypeOptimizer(
+        sample_rows=sample_rows, max_category_ratio=max_category_ratio, downcast_floats=downcast_floats,
+        copy=False,
+    )
+    chunks = []
+    for chunk in read_chunks(file_path, columns=columns, chunksize=chunksize):
+        if not chunks:
+            optimizer.fit(chunk)
+        chunks.append(optimizer.transform(chunk))
+
+    if not chunks:
+        return pd.DataFrame(columns=columns)
+    frame = _concat_chunks(chunks)
+    return frame if columns is None else frame[list(columns)]
+
+
 # Example usage:
 # columns_to_replace = ['cap-shape', 'cap-color', 'gill-color']
 # replacer = RareCategoryReplacer(columns=columns_to_replace, proportion_threshold=0.02)
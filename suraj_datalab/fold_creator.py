@@ -1,64 +1,366 @@
+import hashlib
+import os
+
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import KFold, StratifiedKFold
-from sklearn.cluster import KMeans
+
+from .fold_index import save_fold_index
+from .instrument import span
+
+
+def _load_dataset(file_path, columns=None):
+    """
+    Return the dataset as given, or read it if a path was passed.
+
+    Parameters:
+    file_path (str, pd.DataFrame or np.ndarray): Path to a CSV file, or the dataset itself.
+    columns (list): Optional columns to read from a file. Only these columns are read, with the smallest safe
+        dtypes (see `clean.load_optimized`). Default is None (every column, read with `pd.read_csv`).
+
+    Returns:
+    pd.DataFrame or np.ndarray: The dataset. DataFrames and arrays are returned without copying.
+    """
+    if isinstance(file_path, (pd.DataFrame, np.ndarray)):
+        return file_path
+    if columns is not None:
+        from .clean import load_optimized
+
+        with span("read_csv", path=str(file_path), columns=list(columns)):
+            return load_optimized(file_path, columns=columns)
+    with span("read_csv", path=str(file_path)):
+        return pd.read_csv(file_path)
+
+
+def _needed_columns(return_folds, save_path, *columns):
+    """
+    The columns a fold creator reads when only the folds are returned, or None if the whole dataset is needed.
+    """
+    if not return_folds or save_path:
+        return None
+    columns = [column for group in columns for column in (group if isinstance(group, list) else [group])]
+    if not all(isinstance(column, str) for column in columns):
+        return None
+    return list(dict.fromkeys(columns))
+
+
+def _column_values(data, column):
+    """
+    Return one column of a DataFrame (by name) or of a 2-D NumPy array (by position) as an array.
+    """
+    if isinstance(data, np.ndarray):
+        return data[:, column]
+    return data[column].to_numpy()
+
+
+def _split_placeholder(n_rows):
+    # The splitters only use the number of samples of X; a zero-stride view avoids allocating one
+    return np.broadcast_to(np.int8(0), (n_rows, 1))
+
+
+def _fold_dtype(n_splits):
+    return np.int8 if n_splits <= np.iinfo(np.int8).max else np.int16
+
+
+def _assign_folds(splits, n_rows, n_splits):
+    """
+    Build the fold label of every row from a splitter's (train, validation) index pairs.
+
+    Parameters:
+    splits (iterable): The (train_idx, val_idx) pairs yielded by a scikit-learn splitter.
+    n_rows (int): Number of rows of the dataset.
+    n_splits (int): Number of folds.
+
+    Returns:
+    np.ndarray: The fold of each row, as int8 (int16 above 127 folds), filled with one vectorized scatter.
+    """
+    val_indices = [val_idx for _, val_idx in splits]
+    folds = np.full(n_rows, -1, dtype=_fold_dtype(n_splits))
+    folds[np.concatenate(val_indices)] = np.repeat(
+        np.arange(len(val_indices), dtype=folds.dtype),
+        [len(val_idx) for val_idx in val_indices],
+    )
+    return folds
 
 
-def create_kfolds(file_path, n_splits=5, shuffle=True, random_state=42, save_path=None):
+def _fold_output(
+    data, folds, return_folds, save_path, index_path=None, source=None, **metadata
+):
+    """
+    Return the fold vector, or the dataset with a 'kfold' column, and save them if requested.
+
+    The input DataFrame is never modified: the 'kfold' column is added to a shallow copy that shares
+    the existing columns. With `index_path`, the folds are written to a fold index sidecar (see
+    `fold_index.save_fold_index`) fingerprinted against `source`, together with `metadata`.
     """
-    Creates K-Fold indices for a dataset loaded from a CSV file.
+    if index_path:
+        with span("write_index", path=str(index_path)):
+            save_fold_index(index_path, folds, source=source, **metadata)
+
+    if return_folds and not save_path:
+        return folds
+
+    if isinstance(data, np.ndarray):
+        data = pd.DataFrame(data)
+    else:
+        data = data.copy(deep=False)
+    data["kfold"] = folds.astype(np.int64)
+
+    if save_path:
+        with span("write_csv", path=str(save_path)):
+            data.to_csv(save_path, index=False)
+
+    return folds if return_folds else data
+
+
+def create_kfolds(
+    file_path,
+    n_splits=5,
+    shuffle=True,
+    random_state=42,
+    save_path=None,
+    return_folds=False,
+    index_path=None,
+):
+    """
+    Creates K-Fold indices for a dataset loaded from a CSV file or already in memory.
 
     Parameters:
-    file_path (str): Path to the input CSV file containing the dataset.
+    file_path (str, pd.DataFrame or np.ndarray): Path to the input CSV file containing the dataset, or the dataset itself.
     n_splits (int): Number of folds. Default is 5.
     shuffle (bool): Whether to shuffle the data. Default is True.
     random_state (int): Seed for the random number generator. Default is 42.
     save_path (str): Optional path to save the CSV file. If None, the file is not saved. Default is None.
+    return_folds (bool): If True, return only the compact fold vector instead of the dataset. Default is False.
+    index_path (str): Optional path of a fold index sidecar to write (see `fold_index.save_fold_index`), a compact
+        memory-mappable alternative to save_path. Default is None.
 
     Returns:
-    pd.DataFrame: DataFrame with an additional 'kfold' column.
+    pd.DataFrame: DataFrame with an additional 'kfold' column, or
+    np.ndarray: The int8 fold of each row if return_folds is True.
     """
-    data = pd.read_csv(file_path)
-    data["kfold"] = -1
-    kf = KFold(n_splits=n_splits, shuffle=shuffle, random_state=random_state)
-
-    for fold, (train_idx, val_idx) in enumerate(kf.split(data)):
-        data.loc[val_idx, "kfold"] = fold
-
-    if save_path:
-        data.to_csv(save_path, index=False)
+    data = _load_dataset(file_path)
+    with span("split", n_rows=len(data)):
+        kf = KFold(n_splits=n_splits, shuffle=shuffle, random_state=random_state)
+        folds = _assign_folds(kf.split(_split_placeholder(len(data))), len(data), n_splits)
 
-    return data
+    return _fold_output(
+        data,
+        folds,
+        return_folds,
+        save_path,
+        index_path,
+        source=file_path,
+        splitter="KFold",
+        n_splits=n_splits,
+        shuffle=shuffle,
+        random_state=random_state,
+    )
 
 
 def create_classification_kfolds(
-    file_path, target_column, n_splits=5, random_state=42, save_path=None
+    file_path,
+    target_column,
+    n_splits=5,
+    random_state=42,
+    save_path=None,
+    return_folds=False,
+    index_path=None,
 ):
     """
-    Creates stratified K-Fold indices for classification tasks from a CSV file.
+    Creates stratified K-Fold indices for classification tasks from a CSV file or an in-memory dataset.
 
     Parameters:
-    file_path (str): Path to the input CSV file containing the dataset.
-    target_column (str): The name of the target column.
+    file_path (str, pd.DataFrame or np.ndarray): Path to the input CSV file containing the dataset, or the dataset itself.
+    target_column (str or int): The name of the target column, or its position for a NumPy array.
     n_splits (int): Number of folds. Default is 5.
     random_state (int): Seed for the random number generator. Default is 42.
     save_path (str): Optional path to save the CSV file. If None, the file is not saved. Default is None.
+    return_folds (bool): If True, return only the compact fold vector instead of the dataset. Default is False.
+    index_path (str): Optional path of a fold index sidecar to write (see `fold_index.save_fold_index`), a compact
+        memory-mappable alternative to save_path. Default is None.
 
     Returns:
-    pd.DataFrame: DataFrame with an additional 'kfold' column.
+    pd.DataFrame: DataFrame with an additional 'kfold' column, or
+    np.ndarray: The int8 fold of each row if return_folds is True.
     """
-    data = pd.read_csv(file_path)
-    data["kfold"] = -1
-    y = data[target_column].values
-    skf = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    data = _load_dataset(file_path, _needed_columns(return_folds, save_path, target_column))
+    y = _column_values(data, target_column)
+    with span("split", n_rows=len(y)):
+        skf = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+        folds = _assign_folds(skf.split(_split_placeholder(len(y)), y), len(y), n_splits)
 
-    for fold, (train_idx, val_idx) in enumerate(skf.split(data, y)):
-        data.loc[val_idx, "kfold"] = fold
+    return _fold_output(
+        data,
+        folds,
+        return_folds,
+        save_path,
+        index_path,
+        source=file_path,
+        splitter="StratifiedKFold",
+        n_splits=n_splits,
+        random_state=random_state,
+        target_column=target_column,
+    )
 
-    if save_path:
-        data.to_csv(save_path, index=False)
 
-    return data
+def _cluster_costs(prefix, starts, ends):
+    """
+    Within-cluster sum of squares of clusters of sorted points [starts, ends] (inclusive), from prefix sums.
+    """
+    weights = prefix[0][ends + 1] - prefix[0][starts]
+    sums = prefix[1][ends + 1] - prefix[1][starts]
+    squares = prefix[2][ends + 1] - prefix[2][starts]
+    return np.maximum(squares - sums**2 / weights, 0.0)
+
+
+def _ckmeans_layer(previous, prefix, first, n_points):
+    """
+    One layer of the Ckmeans dynamic program, solved with the divide-and-conquer optimization.
+
+    For every last point j >= first, finds the start i in [first, j] of the last cluster that minimizes
+    previous[i - 1] + cost(i, j). The optimal start is monotone in j, so the columns are solved
+    level by level (middle column of every open segment at once), each level costing O(n_points).
+
+    Returns:
+    tuple: The optimal costs and the optimal start of the last cluster, for every j.
+    """
+    costs = np.full(n_points, np.inf)
+    starts = np.zeros(n_points, dtype=np.int64)
+
+    # Open segments: columns [j_lo, j_hi] whose optimal start lies in [i_lo, i_hi]
+    j_lo = np.array([first])
+    j_hi = np.array([n_points - 1])
+    i_lo = np.array([first])
+    i_hi = np.array([n_points - 1])
+    while len(j_lo):
+        mid = (j_lo + j_hi) // 2
+        upper = np.minimum(mid, i_hi)
+        lengths = upper - i_lo + 1
+        segment = np.repeat(np.arange(len(mid)), lengths)
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        candidates = i_lo[segment] + offsets
+        values = previous[candidates - 1] + _cluster_costs(prefix, candidates, mid[segment])
+
+        # First minimum of every segment
+        boundaries = np.cumsum(lengths) - lengths
+        minimum = np.minimum.reduceat(values, boundaries)
+        hits = np.flatnonzero(values == minimum[segment])
+        first_hit = hits[np.unique(segment[hits], return_index=True)[1]]
+        best = candidates[first_hit]
+        costs[mid] = minimum
+        starts[mid] = best
+
+        # Left halves search [i_lo, best], right halves [best, i_hi]
+        j_lo, j_hi, i_lo, i_hi = (
+            np.concatenate([j_lo, mid + 1]),
+            np.concatenate([mid - 1, j_hi]),
+            np.concatenate([i_lo, best]),
+            np.concatenate([best, i_hi]),
+        )
+        keep = j_lo <= j_hi
+        j_lo, j_hi, i_lo, i_hi = j_lo[keep], j_hi[keep], i_lo[keep], i_hi[keep]
+
+    return costs, starts
+
+
+def _ckmeans_bins(y, n_bins, max_points=100_000):
+    """
+    Optimal 1-D k-means (Ckmeans.1d.dp) binning of a target, deterministic and without sklearn.
+
+    The target is sorted once and reduced to its unique values with their counts; the dynamic program then
+    finds the n_bins contiguous groups with the smallest total within-bin sum of squares, which is the global
+    optimum of the k-means objective in one dimension. When there are more than `max_points` unique values,
+    they are first merged into `max_points` runs of consecutive values with equal weight; each run keeps its
+    exact count, sum and sum of squares, so the result is the optimum among breaks between runs.
+
+    Parameters:
+    y (np.ndarray): The target values. Missing values get the bin -1.
+    n_bins (int): Number of bins.
+    max_points (int): Maximum number of points of the dynamic program. Default is 100,000.
+
+    Returns:
+    np.ndarray: The bin of each row, ordered by value.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    valid = ~np.isnan(y)
+    values, counts = np.unique(y[valid], return_counts=True)
+    center = values.mean() if len(values) else 0.0
+    weights = counts.astype(np.float64)
+    sums = weights * (values - center)
+    squares = sums * (values - center)
+    upper_values = values
+
+    if len(values) > max_points:
+        # Merge consecutive unique values into runs of (about) equal weight
+        cumulative = np.cumsum(counts)
+        runs = np.searchsorted(
+            cumulative, np.linspace(0, cumulative[-1], max_points + 1)[1:-1], side="right"
+        )
+        run_starts = np.unique(np.concatenate([[0], runs]))
+        weights = np.add.reduceat(weights, run_starts)
+        sums = np.add.reduceat(sums, run_starts)
+        squares = np.add.reduceat(squares, run_starts)
+        upper_values = values[np.append(run_starts[1:] - 1, len(values) - 1)]
+
+    n_points = len(weights)
+    n_bins = min(n_bins, n_points)
+    bins = np.full(len(y), -1, dtype=np.int64)
+    if n_points == 0:
+        return bins
+
+    prefix = [np.concatenate([[0.0], np.cumsum(stat)]) for stat in (weights, sums, squares)]
+    points = np.arange(n_points)
+    costs = _cluster_costs(prefix, np.zeros(n_points, dtype=np.int64), points)
+    starts = [np.zeros(n_points, dtype=np.int64)]
+    for k in range(1, n_bins):
+        costs, layer_starts = _ckmeans_layer(costs, prefix, k, n_points)
+        starts.append(layer_starts)
+
+    # Backtrack the largest value of every bin
+    thresholds = np.empty(n_bins - 1)
+    end = n_points - 1
+    for k in range(n_bins - 1, 0, -1):
+        start = starts[k][end]
+        thresholds[k - 1] = upper_values[start - 1]
+        end = start - 1
+
+    bins[valid] = np.searchsorted(thresholds, y[valid], side="left")
+    return bins
+
+
+def _bin_target(y, binning_method, custom_bins=None, random_state=42):
+    """
+    Bin a continuous target so that it can be stratified.
+
+    Parameters:
+    y (np.ndarray): The target values.
+    binning_method (str): 'sturges', 'quantile', 'kmeans' or 'custom'. 'kmeans' is the deterministic Ckmeans
+        dynamic program (see `_ckmeans_bins`); it is exact up to 100,000 unique target values and approximate
+        beyond, where consecutive values are first merged into 100,000 runs.
+    custom_bins (list): List of bin edges, required for 'custom'.
+    random_state (int): Unused; every binning method is deterministic. Kept for API compatibility.
+
+    Returns:
+    np.ndarray: The bin of each row.
+    """
+    if binning_method == "sturges":
+        num_bins = int(np.floor(1 + np.log2(len(y))))
+        return pd.cut(y, bins=num_bins, labels=False)
+    elif binning_method == "quantile":
+        num_bins = int(np.floor(1 + np.log2(len(y))))
+        return pd.qcut(y, q=num_bins, labels=False)
+    elif binning_method == "kmeans":
+        num_bins = int(np.floor(1 + np.log2(len(y))))
+        return _ckmeans_bins(y, num_bins)
+    elif binning_method == "custom":
+        if custom_bins is None:
+            raise ValueError("Custom bins must be provided when using custom binning.")
+        return pd.cut(y, bins=custom_bins, labels=False, include_lowest=True)
+    else:
+        raise ValueError(
+            f"Invalid binning method: {binning_method}. Choose 'sturges', 'quantile', 'kmeans', or 'custom'."
+        )
 
 
 def create_regression_kfolds(
@@ -69,58 +371,547 @@ def create_regression_kfolds(
     custom_bins=None,
     random_state=42,
     save_path=None,
+    return_folds=False,
+    index_path=None,
 ):
     """
-    Creates stratified K-Fold indices for regression tasks with various binning methods from a CSV file.
+    Creates stratified K-Fold indices for regression tasks with various binning methods from a CSV file or an in-memory dataset.
 
     Parameters:
-    file_path (str): Path to the input CSV file containing the dataset.
-    target_column (str): The name of the target column.
+    file_path (str, pd.DataFrame or np.ndarray): Path to the input CSV file containing the dataset, or the dataset itself.
+    target_column (str or int): The name of the target column, or its position for a NumPy array.
     n_splits (int): Number of folds. Default is 5.
     binning_method (str): Method for binning the target variable. Options are 'sturges', 'quantile', 'kmeans', 'custom'. Default is 'sturges'.
+        'kmeans' is optimal 1-D k-means binning, exact up to 100,000 unique target values and approximate beyond.
     custom_bins (list): List of bin edges for custom binning. Required if binning_method is 'custom'.
     random_state (int): Seed for the random number generator. Default is 42.
     save_path (str): Optional path to save the CSV file. If None, the file is not saved. Default is None.
+    return_folds (bool): If True, return only the compact fold vector instead of the dataset. Default is False.
+    index_path (str): Optional path of a fold index sidecar to write (see `fold_index.save_fold_index`), a compact
+        memory-mappable alternative to save_path. Default is None.
 
     Returns:
-    pd.DataFrame: DataFrame with an additional 'kfold' column.
+    pd.DataFrame: DataFrame with an additional 'kfold' column, or
+    np.ndarray: The int8 fold of each row if return_folds is True.
     """
-    data = pd.read_csv(file_path)
-    data["kfold"] = -1
+    with span("create_regression_kfolds", binning_method=binning_method, n_splits=n_splits):
+        data = _load_dataset(file_path, _needed_columns(return_folds, save_path, target_column))
+        with span("bin_target", binning_method=binning_method):
+            y = _bin_target(
+                _column_values(data, target_column), binning_method, custom_bins, random_state
+            )
+        with span("split", n_rows=len(y)):
+            skf = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+            folds = _assign_folds(skf.split(_split_placeholder(len(y)), y), len(y), n_splits)
 
-    if binning_method == "sturges":
-        num_bins = int(np.floor(1 + np.log2(len(data))))
-        data["bins"] = pd.cut(data[target_column], bins=num_bins, labels=False)
-    elif binning_method == "quantile":
-        num_bins = int(np.floor(1 + np.log2(len(data))))
-        data["bins"] = pd.qcut(data[target_column], q=num_bins, labels=False)
-    elif binning_method == "kmeans":
-        num_bins = int(np.floor(1 + np.log2(len(data))))
-        kmeans = KMeans(n_clusters=num_bins, random_state=random_state)
-        data["bins"] = kmeans.fit_predict(data[[target_column]])
-    elif binning_method == "custom":
-        if custom_bins is None:
-            raise ValueError("Custom bins must be provided when using custom binning.")
-        data["bins"] = pd.cut(
-            data[target_column], bins=custom_bins, labels=False, include_lowest=True
+        return _fold_output(
+            data,
+            folds,
+            return_folds,
+            save_path,
+            index_path,
+            source=file_path,
+            splitter="StratifiedKFold",
+            n_splits=n_splits,
+            random_state=random_state,
+            target_column=target_column,
+            binning_method=binning_method,
         )
+
+
+def _seed_folds(y, n_rows, n_splits, seed):
+    """
+    Fold labels of one seed: shuffled KFold without a target, StratifiedKFold on the (binned) target otherwise.
+    """
+    if y is None:
+        splitter = KFold(n_splits=n_splits, shuffle=True, random_state=seed)
     else:
+        splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=seed)
+    return _assign_folds(splitter.split(_split_placeholder(n_rows), y), n_rows, n_splits)
+
+
+def create_repeated_kfolds(
+    file_path,
+    target_column=None,
+    n_splits=5,
+    seeds=None,
+    n_repeats=5,
+    random_state=42,
+    binning_method=None,
+    custom_bins=None,
+    n_jobs=1,
+):
+    """
+    Creates K-Fold labels for several seeds at once, for repeated cross-validation.
+
+    The dataset is loaded once and the target is encoded (and binned) once; only the shuffling is repeated
+    per seed, optionally on a joblib worker pool. Column r of the result is identical to the folds returned
+    by `create_kfolds`, `create_classification_kfolds` or `create_regression_kfolds` with
+    random_state=seeds[r] and return_folds=True.
+
+    Parameters:
+    file_path (str, pd.DataFrame or np.ndarray): Path to the input CSV file containing the dataset, or the dataset itself.
+    target_column (str or int): Optional target column for stratified folds. Default is None (plain shuffled KFold).
+    n_splits (int): Number of folds. Default is 5.
+    seeds (list): Seeds of the repeats. Default is None (random_state, random_state + 1, ...).
+    n_repeats (int): Number of repeats when seeds is None. Default is 5.
+    random_state (int): First seed when seeds is None. Default is 42.
+    binning_method (str): If given, the target is continuous and binned as in `create_regression_kfolds`
+        ('sturges', 'quantile', 'kmeans' or 'custom'). Default is None (classification target).
+    custom_bins (list): List of bin edges, required if binning_method is 'custom'.
+    n_jobs (int): Number of workers across seeds; -1 uses all cores. Default is 1.
+
+    Returns:
+    np.ndarray: The (n_rows, n_repeats) fold matrix, int8 (int16 above 127 folds), one column per seed.
+    """
+    from joblib import Parallel, delayed
+
+    if seeds is None:
+        seeds = [random_state + i for i in range(n_repeats)]
+
+    # Only the folds are returned, so only the target needs to be read
+    data = _load_dataset(file_path, None if target_column is None else _needed_columns(True, None, target_column))
+    n_rows = len(data)
+    y = None
+    if target_column is not None:
+        y = _column_values(data, target_column)
+        if binning_method is not None:
+            y = _bin_target(y, binning_method, custom_bins)
+        # Compact integer codes make the per-seed class encoding cheap and cheap to send to workers
+        y = pd.factorize(y)[0].astype(np.int32)
+        if (y == -1).any():
+            raise ValueError(f"Target column {target_column!r} contains missing values.")
+
+    folds = np.empty((n_rows, len(seeds)), dtype=_fold_dtype(n_splits), order="F")
+    columns = Parallel(n_jobs=n_jobs, return_as="generator")(
+        delayed(_seed_folds)(y, n_rows, n_splits, seed) for seed in seeds
+    )
+    for r, column in enumerate(columns):
+        folds[:, r] = column
+    return folds
+
+
+def _hash_keys(values, random_state):
+    """
+    Seeded 64-bit hash of row keys, stable across runs and platforms.
+
+    `pd.util.hash_array` ignores its hash key for numeric arrays, so the seed is mixed into the hashed
+    values with the splitmix64 finalizer instead.
+    """
+    seed = np.uint64(int(hashlib.md5(str(random_state).encode()).hexdigest()[:16], 16))
+    x = pd.util.hash_array(np.asarray(values), categorize=False) ^ seed
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _water_fill(counts, n_new):
+    """
+    Split n_new rows over folds so that the per-fold counts end up as even as possible.
+
+    Parameters:
+    counts (np.ndarray): Current number of rows of each fold.
+    n_new (int): Number of rows to add.
+
+    Returns:
+    np.ndarray: Number of new rows given to each fold.
+    """
+    n_splits = len(counts)
+    order = np.argsort(counts, kind="stable")
+    sorted_counts = counts[order]
+    # Raise the emptiest folds together until the new rows are used up
+    for filled in range(1, n_splits + 1):
+        ceiling = sorted_counts[filled] if filled < n_splits else np.inf
+        if ceiling * filled - sorted_counts[:filled].sum() >= n_new:
+            break
+    level, extra = divmod(n_new + int(sorted_counts[:filled].sum()), filled)
+
+    quotas = np.zeros(n_splits, dtype=np.int64)
+    quotas[order[:filled]] = level - sorted_counts[:filled]
+    quotas[order[:extra]] += 1
+    return quotas
+
+
+def _balanced_folds(hashes, counts):
+    """
+    Assign rows of one class to folds: each row keeps its hash-preferred fold while that fold has quota,
+    and the remaining rows fill the folds that are still short, in hash order.
+    """
+    n_splits = len(counts)
+    preferred = (hashes % np.uint64(n_splits)).astype(np.int64)
+    quotas = _water_fill(counts, len(hashes))
+
+    # Rank of every row within its preferred fold, in hash order
+    order = np.lexsort((hashes, preferred))
+    group_starts = np.searchsorted(preferred[order], np.arange(n_splits))
+    ranks = np.empty(len(hashes), dtype=np.int64)
+    ranks[order] = np.arange(len(hashes)) - group_starts[preferred[order]]
+
+    folds = np.where(ranks < quotas[preferred], preferred, -1)
+    overflow = np.flatnonzero(folds == -1)
+    if len(overflow):
+        free = quotas - np.bincount(folds[folds >= 0], minlength=n_splits)
+        overflow = overflow[np.argsort(hashes[overflow], kind="stable")]
+        folds[overflow] = np.repeat(np.arange(n_splits), free)
+    return folds
+
+
+def create_streaming_kfolds(
+    file_path,
+    n_splits=5,
+    target_column=None,
+    key_column=None,
+    random_state=42,
+    chunksize=1_000_000,
+    save_path=None,
+    index_path=None,
+):
+    """
+    Assigns K-Fold labels to a dataset larger than memory, reading and writing it chunk by chunk.
+
+    Each row gets its fold from a seeded hash of a row key (the value of `key_column`, or the row number).
+    Without a target, the fold is the hash modulo n_splits, which does not depend on the chunk size. With a
+    target, folds are stratified online: running per-class, per-fold counters give each chunk's rows of a
+    class a quota per fold that keeps the class balanced to within one row across folds, and rows keep their
+    hash-preferred fold whenever its quota allows. Reruns with the same seed (and, when stratified, the same
+    chunksize) give the same assignment.
+
+    Parameters:
+    file_path (str): Path to the input CSV, Parquet or Feather file.
+    n_splits (int): Number of folds. Default is 5.
+    target_column (str): Optional target column for stratified folds. Default is None.
+    key_column (str): Optional column identifying each row; its values are hashed. Default is None (row number).
+    random_state (int): Seed of the hash. Default is 42.
+    chunksize (int): Number of rows read per chunk. Default is 1,000,000.
+    save_path (str): Optional path of a CSV file written chunk by chunk with an additional 'kfold' column.
+    index_path (str): Optional path of a fold index sidecar (see `fold_index.save_fold_index`).
+
+    Returns:
+    pd.DataFrame: The number of rows of each fold, per class when stratified.
+    """
+    from .streaming import read_chunks
+
+    if not (save_path or index_path):
+        raise ValueError("Provide save_path, index_path or both to store the folds.")
+
+    columns = None
+    if not save_path:
+        columns = [c for c in dict.fromkeys([target_column, key_column]) if c is not None] or None
+
+    fold_dtype = _fold_dtype(n_splits)
+    labels_path = f"{index_path}.labels" if index_path else None
+    labels_file = open(labels_path, "wb") if labels_path else None
+    class_counts = {}
+    start = 0
+    try:
+        for i, chunk in enumerate(read_chunks(file_path, columns=columns, chunksize=chunksize)):
+            keys = chunk[key_column] if key_column else np.arange(start, start + len(chunk))
+            hashes = _hash_keys(keys, random_state)
+
+            if target_column is None:
+                folds = (hashes % np.uint64(n_splits)).astype(fold_dtype)
+                class_counts[None] = class_counts.get(
+                    None, np.zeros(n_splits, dtype=np.int64)
+                ) + np.bincount(folds, minlength=n_splits)
+            else:
+                folds = np.empty(len(chunk), dtype=fold_dtype)
+                codes, classes = pd.factorize(chunk[target_column], use_na_sentinel=False)
+                for code, class_value in enumerate(classes):
+                    rows = np.flatnonzero(codes == code)
+                    # Every chunk has its own NaN object and NaN != NaN; missing targets share the np.nan key
+                    if pd.isna(class_value):
+                        class_value = np.nan
+                    counts = class_counts.setdefault(class_value, np.zeros(n_splits, dtype=np.int64))
+                    class_folds = _balanced_folds(hashes[rows], counts)
+                    folds[rows] = class_folds
+                    counts += np.bincount(class_folds, minlength=n_splits)
+
+            if labels_file:
+                folds.tofile(labels_file)
+            if save_path:
+                chunk = chunk.assign(kfold=folds.astype(np.int64))
+                chunk.to_csv(save_path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+            start += len(chunk)
+    finally:
+        if labels_file:
+            labels_file.close()
+
+    if index_path:
+        labels = np.memmap(labels_path, dtype=fold_dtype, mode="r") if start else np.empty(0, fold_dtype)
+        save_fold_index(
+            index_path,
+            [labels[i : i + chunksize] for i in range(0, start, chunksize)],
+            source=file_path,
+            splitter="StreamingHashKFold",
+            n_splits=n_splits,
+            random_state=random_state,
+            target_column=target_column,
+            key_column=key_column,
+            chunksize=chunksize,
+        )
+        del labels
+        os.remove(labels_path)
+
+    fold_sizes = pd.DataFrame(class_counts, index=pd.RangeIndex(n_splits, name="kfold"))
+    if target_column is None:
+        return fold_sizes.rename(columns={None: "count"})
+    return fold_sizes
+
+
+def _label_matrix(data, label_columns, n_labels=None):
+    """
+    Build a sparse (n_rows, n_labels) CSC matrix of the positive labels of every row.
+
+    Parameters:
+    data (pd.DataFrame or np.ndarray): The dataset, used when label_columns lists columns.
+    label_columns (list, np.ndarray or scipy sparse matrix): Names (or positions) of 0/1 label columns of `data`,
+        a dense 0/1 label matrix, a sparse label matrix, or a bit-packed matrix from np.packbits(labels, axis=1).
+    n_labels (int): Number of labels of a bit-packed matrix; required for, and only used with, packed labels.
+
+    Returns:
+    scipy.sparse.csc_matrix: A 1 for every positive label. Columns are built one at a time, so a dense
+        (n_rows, n_labels) boolean matrix is never allocated.
+    """
+    from scipy import sparse
+
+    if sparse.issparse(label_columns):
+        matrix = sparse.csc_matrix(label_columns)
+        matrix.data = (matrix.data == 1).astype(np.float64)
+        matrix.eliminate_zeros()
+        return matrix
+
+    if n_labels is not None:
+        packed = np.asarray(label_columns, dtype=np.uint8)
+        n_rows = len(packed)
+
+        def columns():
+            # np.packbits is big-endian: label j is bit 7 - j % 8 of byte j // 8
+            for byte in range(-(-n_labels // 8)):
+                values = np.ascontiguousarray(packed[:, byte])
+                for bit in range(min(8, n_labels - 8 * byte)):
+                    yield np.flatnonzero(values & np.uint8(0x80 >> bit))
+
+    elif isinstance(label_columns, np.ndarray):
+        n_rows = len(label_columns)
+
+        def columns():
+            for j in range(label_columns.shape[1]):
+                yield np.flatnonzero(label_columns[:, j] == 1)
+
+    else:
+        n_rows = len(data)
+
+        def columns():
+            for column in label_columns:
+                yield np.flatnonzero(_column_values(data, column) == 1)
+
+    positives = list(columns())
+    indptr = np.concatenate([[0], np.cumsum([len(rows) for rows in positives])])
+    indices = np.concatenate(positives) if positives else np.empty(0, dtype=np.int64)
+    return sparse.csc_matrix(
+        (np.ones(len(indices)), indices, indptr), shape=(n_rows, len(positives))
+    )
+
+
+def _weighted_fill(counts, weights, tiebreak):
+    """
+    Assign weighted items, in order, to folds so that the per-fold counts end up as even as possible.
+
+    The folds with the smallest counts (ties broken by `tiebreak`) are raised to a common level; the items are
+    laid end to end and each goes to the fold whose share of that total its midpoint falls into.
+    """
+    n_splits = len(counts)
+    order = np.lexsort((tiebreak, counts))
+    sorted_counts = counts[order]
+    total = weights.sum()
+    for filled in range(1, n_splits + 1):
+        ceiling = sorted_counts[filled] if filled < n_splits else np.inf
+        if ceiling * filled - sorted_counts[:filled].sum() >= total:
+            break
+    level = (total + sorted_counts[:filled].sum()) / filled
+    bounds = np.cumsum(level - sorted_counts[:filled])
+    midpoints = np.cumsum(weights) - weights / 2
+    return order[np.minimum(np.searchsorted(bounds, midpoints, side="right"), filled - 1)]
+
+
+def _iterative_stratification(item_labels, item_sizes, n_splits, random_state):
+    """
+    Iterative stratification (Sechidis et al., 2011) of weighted items, vectorized per label.
+
+    Labels are processed from the rarest to the most frequent. For each label, the items that carry it and
+    have no fold yet are shuffled and spread over the folds so that the label's per-fold counts (including
+    items already placed through rarer labels) are balanced, preferring the smallest folds on ties. Items
+    without any label are finally spread to balance the fold sizes. The cost is linear in the number of
+    positive labels, plus a sort of each label's new items.
+
+    Parameters:
+    item_labels (scipy.sparse.csc_matrix): (n_items, n_labels) positive label counts of every item.
+    item_sizes (np.ndarray): Number of rows of every item.
+    n_splits (int): Number of folds.
+    random_state (int): Seed of the shuffling.
+
+    Returns:
+    np.ndarray: The fold of each item.
+    """
+    n_items = item_labels.shape[0]
+    priority = np.random.default_rng(random_state).permutation(n_items)
+    folds = np.full(n_items, -1, dtype=np.int64)
+    sizes = np.zeros(n_splits)
+    indptr, indices, weights = item_labels.indptr, item_labels.indices, item_labels.data
+
+    label_totals = np.asarray(item_labels.sum(axis=0)).ravel()
+    for label in np.argsort(label_totals, kind="stable"):
+        items = indices[indptr[label] : indptr[label + 1]]
+        label_weights = weights[indptr[label] : indptr[label + 1]]
+        assigned = folds[items]
+        placed = assigned >= 0
+        if placed.all():
+            continue
+        counts = np.bincount(assigned[placed], weights=label_weights[placed], minlength=n_splits)
+        items, label_weights = items[~placed], label_weights[~placed]
+        order = np.argsort(priority[items])
+        items = items[order]
+        folds[items] = _weighted_fill(counts, label_weights[order], sizes)
+        sizes += np.bincount(folds[items], weights=item_sizes[items], minlength=n_splits)
+
+    rest = np.flatnonzero(folds == -1)
+    if len(rest):
+        rest = rest[np.argsort(priority[rest])]
+        folds[rest] = _weighted_fill(sizes, item_sizes[rest].astype(np.float64), np.zeros(n_splits))
+    return folds
+
+
+def create_multilabel_kfolds(
+    file_path,
+    label_columns,
+    n_splits=5,
+    n_labels=None,
+    random_state=42,
+    save_path=None,
+    return_folds=False,
+    index_path=None,
+):
+    """
+    Creates multilabel stratified K-Fold indices with iterative stratification, from a CSV file or an in-memory dataset.
+
+    Every label keeps (close to) the same proportion of positives in each fold, rarest labels first. The labels
+    are handled as a sparse matrix, so the cost grows with the number of positive labels rather than with
+    n_rows x n_labels; millions of rows with hundreds of labels take seconds.
+
+    Parameters:
+    file_path (str, pd.DataFrame or np.ndarray): Path to the input CSV file containing the dataset, or the dataset itself.
+    label_columns (list, np.ndarray or scipy sparse matrix): Names (or positions) of the 0/1 label columns, or a
+        separate (n_rows, n_labels) label matrix: dense, scipy sparse, or bit-packed with np.packbits(labels, axis=1).
+    n_splits (int): Number of folds. Default is 5.
+    n_labels (int): Number of labels of a bit-packed label matrix. Required for, and only used with, packed labels.
+    random_state (int): Seed for the random number generator. Default is 42.
+    save_path (str): Optional path to save the CSV file. If None, the file is not saved. Default is None.
+    return_folds (bool): If True, return only the compact fold vector instead of the dataset. Default is False.
+    index_path (str): Optional path of a fold index sidecar to write (see `fold_index.save_fold_index`). Default is None.
+
+    Returns:
+    pd.DataFrame: DataFrame with an additional 'kfold' column, or
+    np.ndarray: The int8 fold of each row if return_folds is True.
+    """
+    data = _load_dataset(file_path, _needed_columns(return_folds, save_path, label_columns))
+    labels = _label_matrix(data, label_columns, n_labels)
+    if labels.shape[0] != len(data):
         raise ValueError(
-            f"Invalid binning method: {binning_method}. Choose 'sturges', 'quantile', 'kmeans', or 'custom'."
+            f"The label matrix has {labels.shape[0]} rows but the dataset has {len(data)}."
         )
+    folds = _iterative_stratification(
+        labels, np.ones(len(data)), n_splits, random_state
+    ).astype(_fold_dtype(n_splits))
+
+    return _fold_output(
+        data,
+        folds,
+        return_folds,
+        save_path,
+        index_path,
+        source=file_path,
+        splitter="MultilabelStratifiedKFold",
+        n_splits=n_splits,
+        random_state=random_state,
+        label_columns=label_columns if isinstance(label_columns, list) else None,
+    )
+
+
+def create_stratified_group_kfolds(
+    file_path,
+    target_column,
+    group_column,
+    n_splits=5,
+    n_labels=None,
+    random_state=42,
+    save_path=None,
+    return_folds=False,
+    index_path=None,
+):
+    """
+    Creates stratified group K-Fold indices: all rows of a group share a fold, and classes stay balanced across folds.
 
-    y = data["bins"].values
-    skf = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    Groups are weighted by their class (or label) counts and split with the same iterative stratification as
+    `create_multilabel_kfolds`, so the cost is linear in the number of rows rather than quadratic in the
+    number of groups.
 
-    for fold, (train_idx, val_idx) in enumerate(skf.split(data, y)):
-        data.loc[val_idx, "kfold"] = fold
+    Parameters:
+    file_path (str, pd.DataFrame or np.ndarray): Path to the input CSV file containing the dataset, or the dataset itself.
+    target_column (str, int or list): The class column to stratify on, or multilabel labels in any form accepted
+        by `create_multilabel_kfolds`.
+    group_column (str or int): The column identifying the groups, or its position for a NumPy array.
+    n_splits (int): Number of folds. Default is 5.
+    n_labels (int): Number of labels of a bit-packed label matrix. Only used with packed labels.
+    random_state (int): Seed for the random number generator. Default is 42.
+    save_path (str): Optional path to save the CSV file. If None, the file is not saved. Default is None.
+    return_folds (bool): If True, return only the compact fold vector instead of the dataset. Default is False.
+    index_path (str): Optional path of a fold index sidecar to write (see `fold_index.save_fold_index`). Default is None.
 
-    data = data.drop("bins", axis=1)
+    Returns:
+    pd.DataFrame: DataFrame with an additional 'kfold' column, or
+    np.ndarray: The int8 fold of each row if return_folds is True.
+    """
+    from scipy import sparse
 
-    if save_path:
-        data.to_csv(save_path, index=False)
+    data = _load_dataset(file_path, _needed_columns(return_folds, save_path, target_column, group_column))
+    n_rows = len(data)
+    if isinstance(target_column, (str, int, np.integer)):
+        # One label per class
+        codes, classes = pd.factorize(_column_values(data, target_column), use_na_sentinel=False)
+        labels = sparse.csc_matrix(
+            (np.ones(n_rows), (np.arange(n_rows), codes)), shape=(n_rows, len(classes))
+        )
+    else:
+        labels = _label_matrix(data, target_column, n_labels)
+
+    groups, _ = pd.factorize(_column_values(data, group_column), use_na_sentinel=False)
+    n_groups = int(groups.max()) + 1 if n_rows else 0
+    rows_labels = labels.tocoo()
+    group_labels = sparse.csc_matrix(
+        (rows_labels.data, (groups[rows_labels.row], rows_labels.col)),
+        shape=(n_groups, labels.shape[1]),
+    )
+    group_labels.sum_duplicates()
+
+    group_folds = _iterative_stratification(
+        group_labels, np.bincount(groups, minlength=n_groups), n_splits, random_state
+    )
+    folds = group_folds[groups].astype(_fold_dtype(n_splits))
 
-    return data
+    return _fold_output(
+        data,
+        folds,
+        return_folds,
+        save_path,
+        index_path,
+        source=file_path,
+        splitter="StratifiedGroupKFold",
+        n_splits=n_splits,
+        random_state=random_state,
+        target_column=target_column if isinstance(target_column, (str, int, list)) else None,
+        group_column=group_column,
+    )
 
 
 """
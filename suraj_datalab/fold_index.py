@@ -0,0 +1,260 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+_MAGIC = b"SDLFOLDS"
+_FORMAT_VERSION = 1
+_ALIGNMENT = 64
+_SAMPLE_BLOCK_SIZE = 1 << 16
+_SAMPLE_BLOCKS = 16
+_FULL_BLOCK_SIZE = 1 << 20
+
+
+def _align(offset):
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def fingerprint(source, full=False):
+    """
+    Compute a fingerprint of a dataset, used to detect a stale fold index.
+
+    For a file, the fingerprint hashes its size, its modification time, its first and last 64 KiB and 16
+    evenly spaced 64 KiB blocks, so its cost does not depend on the file size and any rewrite of the file is
+    detected. With `full=True`, the whole content is hashed instead of the modification time and the blocks,
+    so a copy of an unchanged file still matches. For a DataFrame or an array, it hashes the shape, the
+    column names and dtypes and every row, which is cheap next to loading the data.
+
+    Parameters:
+    source (str, pd.DataFrame or np.ndarray): Path to the dataset, or the dataset itself.
+    full (bool): Whether to hash the whole content of a file. Default is False.
+
+    Returns:
+    str: A hexadecimal digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+
+    if isinstance(source, (pd.DataFrame, np.ndarray)):
+        frame = pd.DataFrame(source) if isinstance(source, np.ndarray) else source
+        digest.update(repr((frame.shape, list(frame.columns), list(map(str, frame.dtypes)))).encode())
+        digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    status = os.stat(source)
+    digest.update(str(status.st_size).encode())
+    with open(source, "rb") as file:
+        if full:
+            for block in iter(lambda: file.read(_FULL_BLOCK_SIZE), b""):
+                digest.update(block)
+            return digest.hexdigest()
+
+        digest.update(str(status.st_mtime_ns).encode())
+        starts = np.linspace(0, max(status.st_size - _SAMPLE_BLOCK_SIZE, 0), _SAMPLE_BLOCKS + 2)
+        for start in np.unique(starts.astype(np.int64)):
+            file.seek(start)
+            digest.update(file.read(_SAMPLE_BLOCK_SIZE))
+    return digest.hexdigest()
+
+
+def _write_fold_index(path, fold_chunks, folds_dtype, source, full_fingerprint, metadata):
+    """
+    Write a fold index from a re-iterable sequence of fold label chunks, with memory bounded by one chunk.
+
+    The labels are copied chunk by chunk, then the row indices grouped by fold are scattered chunk by chunk
+    into a memory map of the file, at a running cursor per fold.
+    """
+    fold_chunks = list(fold_chunks)
+    n_rows = sum(len(chunk) for chunk in fold_chunks)
+    n_splits = max((int(chunk.max()) + 1 for chunk in fold_chunks if len(chunk)), default=0)
+    fold_sizes = sum(
+        (np.bincount(chunk, minlength=n_splits) for chunk in fold_chunks),
+        np.zeros(n_splits, dtype=np.int64),
+    )
+    offsets = np.concatenate([[0], np.cumsum(fold_sizes)]).astype(np.int64)
+    folds_dtype = np.dtype(folds_dtype)
+    index_dtype = np.dtype(np.int32 if n_rows < np.iinfo(np.int32).max else np.int64)
+
+    folds_offset = 0
+    order_offset = _align(n_rows * folds_dtype.itemsize)
+    header = {
+        "format_version": _FORMAT_VERSION,
+        "n_rows": n_rows,
+        "n_splits": n_splits,
+        "folds_dtype": folds_dtype.str,
+        "index_dtype": index_dtype.str,
+        "folds_offset": folds_offset,
+        "order_offset": order_offset,
+        "fold_offsets": offsets.tolist(),
+        "fingerprint": None if source is None else fingerprint(source, full=full_fingerprint),
+        "full_fingerprint": full_fingerprint,
+        "metadata": metadata,
+    }
+    header_bytes = json.dumps(header, default=str).encode("utf-8")
+    data_start = _align(len(_MAGIC) + 8 + len(header_bytes))
+
+    with open(path, "wb") as file:
+        file.write(_MAGIC)
+        file.write(np.uint64(len(header_bytes)).tobytes())
+        file.write(header_bytes)
+        file.write(b"\0" * (data_start - file.tell()))
+        for chunk in fold_chunks:
+            np.asarray(chunk, dtype=folds_dtype).tofile(file)
+        file.truncate(data_start + order_offset + 2 * n_rows * index_dtype.itemsize)
+
+    if n_rows == 0:
+        return path
+
+    # Row indices grouped by fold, ascending within each fold, stored twice in a row
+    order = np.memmap(
+        path,
+        dtype=index_dtype,
+        mode="r+",
+        offset=data_start + order_offset,
+        shape=(2 * n_rows,),
+    )
+    cursors = offsets[:-1].copy()
+    start = 0
+    for chunk in fold_chunks:
+        for fold in range(n_splits):
+            rows = np.flatnonzero(chunk == fold) + start
+            order[cursors[fold] : cursors[fold] + len(rows)] = rows
+            order[n_rows + cursors[fold] : n_rows + cursors[fold] + len(rows)] = rows
+            cursors[fold] += len(rows)
+        start += len(chunk)
+    order.flush()
+    del order
+
+    return path
+
+
+def save_fold_index(path, folds, source=None, full_fingerprint=False, **metadata):
+    """
+    Write fold labels to a compact binary sidecar file instead of rewriting the dataset.
+
+    Layout: an 8-byte magic string, the length of a JSON header (uint64), the JSON header, then, each
+    aligned to 64 bytes, the fold label of every row and the row indices sorted by fold, stored twice in a
+    row. With that doubled layout, both the validation and the training indices of any fold are contiguous
+    slices of the memory-mapped file.
+
+    Parameters:
+    path (str): Where to write the sidecar file.
+    folds (np.ndarray or list): The fold of every row, as returned by the fold creators with return_folds=True,
+        or a list of consecutive chunks of it (for example memory-mapped slices).
+    source (str, pd.DataFrame or np.ndarray): Optional dataset the folds belong to; its fingerprint is stored
+        so that a stale index can be detected. Default is None.
+    full_fingerprint (bool): Whether to fingerprint a source file from its whole content rather than from its
+        size, modification time and sampled blocks (see `fingerprint`). Default is False.
+    **metadata: Extra JSON-serializable metadata to store, such as random_state or splitter.
+
+    Returns:
+    str: The path of the sidecar file.
+    """
+    if isinstance(folds, (list, tuple)) and all(isinstance(chunk, np.ndarray) for chunk in folds):
+        fold_chunks = list(folds)
+    else:
+        fold_chunks = [np.asarray(folds)]
+    folds_dtype = fold_chunks[0].dtype if fold_chunks else np.int8
+
+    return _write_fold_index(path, fold_chunks, folds_dtype, source, full_fingerprint, metadata)
+
+
+class FoldIndex:
+    """
+    A memory-mapped fold index sidecar written by `save_fold_index`.
+
+    Parameters:
+    ----------
+    path : str
+        Path to the sidecar file.
+    source : str, pd.DataFrame or np.ndarray, optional (default=None)
+        If given, the dataset is fingerprinted and a ValueError is raised if the index is stale.
+
+    Attributes:
+    ----------
+    n_rows : int
+        Number of rows of the dataset.
+    n_splits : int
+        Number of folds.
+    metadata : dict
+        The metadata stored with the index (random_state, splitter, ...).
+    folds : np.memmap
+        The fold of every row.
+
+    Methods:
+    -------
+    split(fold)
+        Return the training and validation row indices of a fold, as read-only views of the file.
+    validate(source)
+        Check that the index was built for the given dataset.
+    """
+
+    def __init__(self, path, source=None):
+        self.path = path
+        with open(path, "rb") as file:
+            if file.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f"'{path}' is not a fold index file.")
+            header_length = int(np.frombuffer(file.read(8), dtype=np.uint64)[0])
+            self._header = json.loads(file.read(header_length).decode("utf-8"))
+
+        if self._header["format_version"] != _FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported fold index format version: {self._header['format_version']}."
+            )
+
+        self.n_rows = self._header["n_rows"]
+        self.n_splits = self._header["n_splits"]
+        self.metadata = self._header["metadata"]
+        self._offsets = self._header["fold_offsets"]
+
+        data_start = _align(len(_MAGIC) + 8 + header_length)
+        self.folds = np.memmap(
+            path,
+            dtype=np.dtype(self._header["folds_dtype"]),
+            mode="r",
+            offset=data_start + self._header["folds_offset"],
+            shape=(self.n_rows,),
+        )
+        self._order = np.memmap(
+            path,
+            dtype=np.dtype(self._header["index_dtype"]),
+            mode="r",
+            offset=data_start + self._header["order_offset"],
+            shape=(2 * self.n_rows,),
+        )
+
+        if source is not None:
+            self.validate(source)
+
+    def validate(self, source):
+        """
+        Raise a ValueError if the index was not built for `source` or if `source` has changed since.
+        """
+        expected = self._header["fingerprint"]
+        if expected is None:
+            raise ValueError(f"'{self.path}' was saved without a source fingerprint.")
+        if fingerprint(source, full=self._header.get("full_fingerprint", False)) != expected:
+            raise ValueError(
+                f"Fold index '{self.path}' is stale: the dataset has changed since it was created."
+            )
+
+    def split(self, fold):
+        """
+        Return the training and validation row indices of a fold.
+
+        Both arrays are read-only slices of the memory-mapped file; nothing is copied. Validation indices are
+        ascending; training indices are ascending within each of the two runs that surround the fold.
+        """
+        if not 0 <= fold < self.n_splits:
+            raise ValueError(f"Fold must be between 0 and {self.n_splits - 1}, got {fold}.")
+        start, stop = self._offsets[fold], self._offsets[fold + 1]
+        return self._order[stop : start + self.n_rows], self._order[start:stop]
+
+    def __iter__(self):
+        # Same protocol as scikit-learn splitters: (train_idx, val_idx) for each fold
+        for fold in range(self.n_splits):
+            yield self.split(fold)
+
+    def __len__(self):
+        return self.n_splits
@@ -0,0 +1,201 @@
+import json
+import logging
+import time
+import tracemalloc
+from contextlib import nullcontext
+
+# Recorders currently collecting spans; while it is empty, `span` returns a shared no-op context
+_recorders = []
+_NULL_SPAN = nullcontext()
+
+
+def span(name, **attributes):
+    """
+    Time a stage of a function, such as reading a file, binning a target or rendering a plot.
+
+    When no `SpanRecorder` is active this returns a shared no-op context manager, so instrumented code pays
+    one list check per stage.
+
+    Parameters:
+        name (str): The name of the stage.
+        **attributes: Extra JSON-serializable details of the stage, such as a path or a number of rows.
+    Returns:
+        A context manager recording the stage in every active recorder.
+    """
+    if not _recorders:
+        return _NULL_SPAN
+    return _Span(name, attributes)
+
+
+class _Span:
+    """
+    An open span. Nested spans keep a per-span peak, since tracemalloc only tracks one peak at a time.
+    """
+
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self):
+        recorders = list(_recorders)
+        self.recorders = recorders
+        self.parents = [recorder._stack[-1] if recorder._stack else None for recorder in recorders]
+        for recorder in recorders:
+            recorder._stack.append(self)
+
+        self.tracing = tracemalloc.is_tracing()
+        if self.tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            for parent in self.parents:
+                if parent is not None and parent.tracing:
+                    parent.peak_seen = max(parent.peak_seen, peak)
+            tracemalloc.reset_peak()
+            self.memory_start = self.peak_seen = current
+
+        self.cpu_start = time.process_time()
+        self.wall_start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        wall = time.perf_counter() - self.wall_start
+        cpu = time.process_time() - self.cpu_start
+
+        peak_memory = None
+        if self.tracing and tracemalloc.is_tracing():
+            self.peak_seen = max(self.peak_seen, tracemalloc.get_traced_memory()[1])
+            peak_memory = self.peak_seen - self.memory_start
+            for parent in self.parents:
+                if parent is not None and parent.tracing:
+                    parent.peak_seen = max(parent.peak_seen, self.peak_seen)
+
+        for recorder, parent in zip(self.recorders, self.parents):
+            recorder._stack.pop()
+            recorder._finish(
+                {
+                    "name": self.name,
+                    "parent": None if parent is None else parent.name,
+                    "depth": len(recorder._stack),
+                    "start": self.wall_start - recorder.start_time,
+                    "wall_time": wall,
+                    "cpu_time": cpu,
+                    "peak_memory": peak_memory,
+                    "attributes": self.attributes,
+                    "error": None if exc_info[0] is None else exc_info[0].__name__,
+                }
+            )
+        return False
+
+
+class SpanRecorder:
+    """
+    Record the internal stages of the package (CSV parsing, binning, splitting, statistics, plot rendering and
+    file writes) while it is active.
+
+    Each stage becomes a span with its wall time, CPU time (of the whole process) and, if `memory` is True,
+    the peak memory allocated above its starting point, measured with tracemalloc. Tracing memory slows
+    allocation-heavy code down, so it is off by default. Spans are kept in `spans` in the order they finish
+    (children before their parent) and passed to every callback as they finish.
+
+    Usage:
+        with SpanRecorder(memory=True) as recorder:
+            numerical_feature(df, "Age", plot=False)
+        print(recorder.to_frame())
+        recorder.save_trace("trace.json")
+
+    Parameters:
+    ----------
+    memory : bool, optional (default=False)
+        Whether to measure the peak allocated memory of each span. tracemalloc is started if needed and
+        stopped again when the recorder exits.
+    callbacks : list of callables, optional (default=None)
+        Called with the dict of each finished span, for example `log_span` or a metrics exporter.
+
+    Attributes:
+    ----------
+    spans : list of dict
+        The finished spans, with the keys name, parent, depth, start (seconds since the recorder started),
+        wall_time, cpu_time, peak_memory (bytes, or None), attributes and error (the exception type, or None).
+    """
+
+    def __init__(self, memory=False, callbacks=None):
+        self.memory = memory
+        self.callbacks = list(callbacks or [])
+        self.spans = []
+        self._stack = []
+        self._started_tracing = False
+
+    def add_callback(self, callback):
+        """
+        Register a function called with the dict of every span finished from now on.
+        """
+        self.callbacks.append(callback)
+        return self
+
+    def __enter__(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self.start_time = time.perf_counter()
+        _recorders.append(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _recorders.remove(self)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return False
+
+    def _finish(self, record):
+        self.spans.append(record)
+        for callback in self.callbacks:
+            callback(record)
+
+    def to_frame(self):
+        """
+        Return the spans as a DataFrame, one row per span, with the attributes as a dict column.
+        """
+        import pandas as pd
+
+        columns = [
+            "name", "parent", "depth", "start", "wall_time", "cpu_time", "peak_memory", "attributes", "error",
+        ]
+        return pd.DataFrame(self.spans, columns=columns)
+
+    def save_trace(self, path):
+        """
+        Write the spans as a Chrome trace event file, viewable in Perfetto or chrome://tracing.
+        """
+        events = [
+            {
+                "name": record["name"],
+                "ph": "X",
+                "ts": record["start"] * 1e6,
+                "dur": record["wall_time"] * 1e6,
+                "pid": 0,
+                "tid": 0,
+                "args": {
+                    "cpu_time": record["cpu_time"],
+                    "peak_memory": record["peak_memory"],
+                    **record["attributes"],
+                },
+            }
+            for record in self.spans
+        ]
+        with open(path, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file, default=str)
+        return path
+
+
+def log_span(record, logger=None, level=logging.INFO):
+    """
+    Log a finished span as one JSON line; pass it to `SpanRecorder(callbacks=[log_span])`.
+
+    Parameters:
+        record (dict): The span, as recorded by `SpanRecorder`.
+        logger (logging.Logger): The logger. Default is the `suraj_datalab.instrument` logger.
+        level (int): The logging level. Default is INFO.
+    """
+    logger = logger or logging.getLogger(__name__)
+    if logger.isEnabledFor(level):
+        logger.log(level, json.dumps(record, default=str), extra={"span": record})
@@ -0,0 +1,195 @@
+import os
+
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import seaborn as sns
+
+from .analyze import is_jupyter_notebook
+from .instrument import span
+
+
+def _show_or_save(file_name, png_file=None, output_dir=None):
+    """
+    Show the current figure in a notebook, or save it under ./plots otherwise.
+
+    Parameters:
+        file_name (str): The name of the PNG file written outside of a notebook.
+        png_file (str or file object): Optional extra destination of the PNG, such as a buffer of the result
+                                       cache. Default is None.
+        output_dir (str): Optional directory the PNG is always written to, also in a notebook. The figure is
+                          then closed instead of shown. Default is None.
+    """
+    if png_file is not None:
+        with span("write_png", path="<cache>"):
+            plt.savefig(png_file, format="png")
+    if output_dir is not None:
+        path = os.path.join(output_dir, file_name)
+        with span("write_png", path=path):
+            plt.savefig(path)
+        plt.close()
+    elif is_jupyter_notebook():
+        plt.show()  # Show plot if running in a Jupyter notebook
+    else:
+        # Save the plot if running outside of a Jupyter notebook
+        if not os.path.exists("./plots"):
+            os.makedirs("./plots")
+        with span("write_png", path=f"./plots/{file_name}"):
+            plt.savefig(f"./plots/{file_name}")
+
+
+def _category_counts(category_distribution, feature):
+    """
+    Recover the (category x class) counts and the class names from the table of `categorical_feature`.
+
+    The counts are rounded from the percentages and the class names are read from the column names, so
+    `1` and `"1"` are not told apart. Classes without any row, such as a missing target, are dropped.
+    """
+    suffix = f" within {feature} (%)"
+    columns = [column for column in category_distribution.columns if column.endswith(suffix)]
+    classes = [column[: -len(suffix)] for column in columns]
+    within = category_distribution[columns].fillna(0).to_numpy(dtype=np.float64)
+    total = category_distribution["Total Count"].to_numpy(dtype=np.float64)
+    counts = np.rint(within * total[:, None] / 100).astype(np.int64)
+    keep = counts.any(axis=0)
+    return counts[:, keep], [class_value for class_value, kept in zip(classes, keep) if kept]
+
+
+def plot_categorical_feature(
+    feature, target, category_distribution, png_file=None, max_categories=30, output_dir=None, counts=None,
+    classes=None,
+):
+    """
+    Plot the distribution of a categorical feature with respect to a target variable.
+
+    The bars are drawn from the counts of `category_distribution`, so the rows of the data are never read
+    again and the cost of the plot depends on the number of categories only.
+
+    Parameters:
+        feature (str): The name of the categorical feature.
+        target (str): The name of the target variable.
+        category_distribution (DataFrame): The table returned by `categorical_feature(..., plot=False)`.
+                                           Its index gives the bar order.
+        png_file (str or file object): Optional extra destination of the PNG. Default is None.
+        max_categories (int): Only the most frequent categories are drawn. Default is 30.
+        output_dir (str): Optional directory the PNG is written to instead of being shown or saved under
+                          ./plots. Default is None.
+        counts (ndarray): Optional (category x class) count matrix in the row order of
+                          `category_distribution`. If None, the counts are recovered from its percentages.
+                          Default is None.
+        classes (list): The target classes, one per column of `counts`. Default is None.
+    """
+    if counts is None:
+        counts, classes = _category_counts(category_distribution, feature)
+    else:
+        # A missing target class is not drawn, as seaborn drops missing hues
+        keep = ~np.asarray(pd.isna(classes), dtype=bool)
+        counts, classes = counts[:, keep], [class_value for class_value, kept in zip(classes, keep) if kept]
+    n_categories = len(category_distribution)
+    counts = counts[:max_categories]
+    categories = [str(category) for category in category_distribution.index[:max_categories]]
+
+    plt.figure(figsize=(12, 6))
+    ax = plt.gca()
+    positions = np.arange(len(categories))
+    width = 0.8 / max(len(classes), 1)
+    for j, (class_value, color) in enumerate(zip(classes, sns.color_palette(n_colors=len(classes)))):
+        ax.bar(
+            positions - 0.4 + width * (j + 0.5), counts[:, j], width=width, color=color, label=str(class_value)
+        )
+    ax.set_xticks(positions, categories)
+    ax.set_xlabel(feature)
+    ax.set_ylabel("count")
+    ax.legend(title=target)
+
+    title = f"Distribution of {feature} by {target}"
+    if n_categories > max_categories:
+        title += f" (top {max_categories} of {n_categories} categories)"
+    plt.title(title)
+
+    _show_or_save(f"{feature}-{target}-distribution.png", png_file, output_dir)
+
+
+def _horizontal():
+    # `vert` is deprecated in favor of `orientation` since matplotlib 3.10
+    major, minor = (int(part) for part in matplotlib.__version__.split(".")[:2])
+    return {"orientation": "horizontal"} if (major, minor) >= (3, 10) else {"vert": False}
+
+
+def plot_numerical_feature(
+    df, feature, target=None, figsize=(15, 6), bins="sturges", png_file=None, plot_data=None, output_dir=None
+):
+    """
+    Plot a histogram with KDE and a box plot of a numerical feature.
+
+    The figure is drawn from precomputed summaries: histogram counts, a binned KDE and the box statistics
+    drawn with `Axes.bxp`. Its cost does not depend on the number of rows.
+
+    Parameters:
+    - df (pandas.DataFrame): The dataframe containing the data. Only read if `plot_data` is None, and may be None
+      otherwise.
+    - feature (str): The name of the numerical feature to plot.
+    - target (str, optional): The name of the target column for grouping the box plot. Default is None.
+    - figsize (tuple, optional): The size of the figure. Default is (15, 6).
+    - bins (int, str, optional): The number of histogram bins or the method to calculate it, used when the
+      summaries are computed from `df`. Default is 'sturges', as in `numerical_feature`.
+    - png_file (str or file object, optional): Optional extra destination of the PNG. Default is None.
+    - plot_data (dict, optional): The summaries returned by `numerical_feature(..., return_plot_data=True)`,
+      which already hold the resolved bins. Computed from `df` if None. Default is None.
+    - output_dir (str, optional): Optional directory the PNG is written to instead of being shown or saved under
+      ./plots. Default is None.
+    """
+    if plot_data is None:
+        if df is None:
+            raise ValueError("Either df or plot_data must be given.")
+        from .analyze import _numeric_summary
+
+        plot_data = _numeric_summary(
+            df[feature], bins=bins, plot_data=True, target_values=df[target] if target else None
+        )["plot_data"]
+
+    # Create the figure and subplots
+    fig, ax = plt.subplots(2, 1, figsize=figsize, sharex=True)
+    color = sns.color_palette()[0]
+
+    # First plot: Histogram with KDE, the density scaled to counts as seaborn does
+    counts, edges = plot_data["histogram"]
+    ax[0].stairs(counts, edges, fill=True, color=color, alpha=0.5)
+    ax[0].stairs(counts, edges, color=color)
+    grid, density = plot_data["kde"]
+    if len(grid):
+        ax[0].plot(grid, density * counts.sum() * (edges[1] - edges[0]), color=color)
+    ax[0].set_title(f"Distribution of {feature} with KDE")
+    ax[0].set_xlabel(feature)
+    ax[0].set_ylabel("Frequency")
+    ax[0].grid(True, which="both", linestyle="--", linewidth=0.5)
+
+    # Second plot: Boxplot of the feature by the target (if provided)
+    boxes = plot_data["boxes"]
+    artists = ax[1].bxp(
+        boxes,
+        patch_artist=True,
+        widths=0.6,
+        medianprops={"color": "black"},
+        flierprops={"marker": "d", "markersize": 4},
+        **_horizontal(),
+    )
+    for patch, box_color in zip(artists["boxes"], sns.color_palette(n_colors=len(boxes))):
+        patch.set_facecolor(box_color)
+    # First class on top, as seaborn draws categorical axes
+    ax[1].invert_yaxis()
+    if target:
+        ax[1].set_title(f"Box Plot of {feature} by {target} Status")
+    else:
+        ax[1].set_yticks([])
+        ax[1].set_title(f"Box Plot of {feature}")
+
+    ax[1].set_xlabel(feature)
+    ax[1].set_ylabel("")
+    ax[1].grid(True, which="both", linestyle="--", linewidth=0.5)
+
+    # Adjust layout for better spacing
+    plt.tight_layout()
+
+    _show_or_save(f"{feature}-{target}-boxplot.png", png_file, output_dir)
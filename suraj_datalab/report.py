@@ -0,0 +1,264 @@
+"""
+Dataset report: profile every column of a DataFrame or file and render its figures on a process pool.
+
+Usage:
+    python -m suraj_datalab.report train.csv --target Survived --output-dir report --n-jobs -1
+"""
+
+import argparse
+import html
+import json
+import os
+
+import pandas as pd
+
+from .analyze import _categorical_feature, _numerical_feature, missing_values
+from .clean import load_optimized
+from .instrument import span
+
+# Name of the single class used to profile categorical columns when the report has no target
+_NO_TARGET = "All"
+
+
+def column_kind(values):
+    """
+    Detect how a column is profiled.
+
+    Parameters:
+        values (Series): The column.
+    Returns:
+        str: "numerical" for integer and float columns, "categorical" for strings, booleans, categoricals and
+             objects, and "other" for datetimes, timedeltas and complex numbers, which are not profiled.
+    """
+    dtype = values.dtype
+    if isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(dtype):
+        return "categorical"
+    if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_float_dtype(dtype):
+        return "numerical"
+    if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+        return "categorical"
+    return "other"
+
+
+def _profile_column(frame, feature, kind, target, output_dir, max_categories, headless):
+    """
+    Profile one column and write its figure to `output_dir/plots`. Runs in a worker process, or in the
+    caller's process if the report runs on a single job.
+
+    Returns:
+        dict: The column entry of the report index: its name, kind, figure path and result tables.
+    """
+    if headless:
+        # Only worker processes switch backend; the caller's backend and open figures are left alone
+        import matplotlib
+
+        matplotlib.use("Agg")
+
+    plot_dir = os.path.join(output_dir, "plots")
+    if kind == "numerical":
+        outliers_df, summary_df = _numerical_feature(
+            frame, feature, target, figsize=(15, 6), bins="sturges", plot=True, output_dir=plot_dir
+        )
+        tables = {"outliers": outliers_df, "summary": summary_df}
+        figure = f"{feature}-{target}-boxplot.png"
+    else:
+        categorical_target = target
+        if target is None:
+            # The single class is a column of its own, named so that it never replaces the feature
+            categorical_target = _NO_TARGET
+            while categorical_target in frame.columns:
+                categorical_target = f"_{categorical_target}"
+            frame = frame.assign(**{categorical_target: _NO_TARGET})
+        distribution = _categorical_feature(
+            frame, feature, categorical_target, plot=True, output="pandas", max_categories=max_categories,
+            output_dir=plot_dir,
+        )
+        tables = {"distribution": distribution.head(max_categories)}
+        figure = f"{feature}-{categorical_target}-distribution.png"
+
+    return {
+        "name": feature,
+        "kind": kind,
+        "figure": os.path.join("plots", figure),
+        "tables": tables,
+    }
+
+
+def _table_records(table):
+    # NaN percentages become null and dtypes strings in JSON
+    table = table.reset_index()
+    return json.loads(table.to_json(orient="records", default_handler=str))
+
+
+def _write_json(path, index):
+    document = {
+        **{key: value for key, value in index.items() if key not in ("columns", "missing_values")},
+        "missing_values": _table_records(index["missing_values"]),
+        "columns": [
+            {
+                **{key: value for key, value in column.items() if key != "tables"},
+                "tables": {name: _table_records(table) for name, table in column.get("tables", {}).items()},
+            }
+            for column in index["columns"]
+        ],
+    }
+    with open(path, "w") as file:
+        json.dump(document, file, indent=2)
+
+
+def _write_html(path, index):
+    sections = []
+    for column in index["columns"]:
+        name = html.escape(str(column["name"]))
+        parts = [f'<h2 id="{name}">{name} <small>({column["kind"]})</small></h2>']
+        if column.get("figure"):
+            parts.append(f'<img src="{html.escape(column["figure"])}" alt="{name}">')
+        for table in column.get("tables", {}).values():
+            parts.append(table.to_html(float_format=lambda value: f"{value:.2f}", na_rep=""))
+        sections.append("\n".join(parts))
+
+    contents = "".join(
+        f'<li><a href="#{html.escape(str(column["name"]))}">{html.escape(str(column["name"]))}</a>'
+        f' ({column["kind"]})</li>'
+        for column in index["columns"]
+    )
+    target = html.escape(str(index["target"])) if index["target"] is not None else "none"
+    document = f"""<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>Dataset report</title></head>
+<body>
+<h1>Dataset report</h1>
+<p>{index["n_rows"]:,} rows, {index["n_columns"]} columns, target: {target}</p>
+<h2>Missing values</h2>
+{index["missing_values"].to_html(float_format=lambda value: f"{value:.2f}")}
+<h2>Columns</h2>
+<ul>{contents}</ul>
+{"".join(sections)}
+</body>
+</html>
+"""
+    with open(path, "w") as file:
+        file.write(document)
+
+
+def generate_report(
+    data, output_dir="report", target=None, columns=None, n_jobs=-1, max_categories=30, index_format="both"
+):
+    """
+    Profile every column of a dataset and write an HTML and/or JSON index linking the tables and figures.
+
+    Each column is profiled by its detected kind (see `column_kind`): `numerical_feature` for numbers and
+    `categorical_feature` for strings, booleans and categoricals, grouped by `target` if given. Columns are
+    profiled on a joblib process pool; every worker renders its figures headless with the Agg backend and
+    writes its own PNGs under `output_dir/plots`, so the report scales with the number of cores. Only the
+    column and the target are sent to a worker. With a single job the columns are profiled in this process,
+    which keeps its matplotlib backend; the PNGs are written in a notebook too and the figures are closed.
+
+    Parameters:
+        data (DataFrame or str): The dataset, or the path to a CSV, Parquet or Feather file, which is read with
+                                 `clean.load_optimized`.
+        output_dir (str): Directory of the report. Default is "report".
+        target (str): Optional target column the profiles are grouped by. Default is None.
+        columns (list): Optional list of the columns to profile. Default is None (every column but the target).
+        n_jobs (int): Number of worker processes, following the joblib convention (-1 uses all cores).
+                      Default is -1.
+        max_categories (int): Number of categories kept in the tables and figures of categorical columns.
+                              Default is 30.
+        index_format (str): "html", "json" or "both". Default is "both".
+    Returns:
+        str: The path of the HTML index, or of the JSON index if only JSON is written.
+    Raises:
+        ValueError: If the target or a requested column is not in the dataset, or if the format is unknown.
+    """
+    if index_format not in ("html", "json", "both"):
+        raise ValueError(f"Invalid index format: {index_format}. Choose 'html', 'json' or 'both'.")
+
+    with span("report"):
+        if isinstance(data, (str, os.PathLike)):
+            read_columns = None
+            if columns is not None:
+                read_columns = list(dict.fromkeys([*columns, *([target] if target is not None else [])]))
+            with span("read_table", path=str(data)):
+                # Only the profiled columns are read, with compact dtypes
+                data = load_optimized(data, columns=read_columns)
+
+        requested = [column for column in [target, *(columns or [])] if column is not None]
+        missing = [column for column in requested if column not in data.columns]
+        if missing:
+            raise ValueError(f"Columns {missing} not found in the dataframe.")
+        if columns is None:
+            columns = [column for column in data.columns if column != target]
+
+        output_dir = os.path.abspath(output_dir)
+        os.makedirs(os.path.join(output_dir, "plots"), exist_ok=True)
+
+        kinds = {column: column_kind(data[column]) for column in columns}
+        profiled = [column for column in columns if kinds[column] != "other"]
+
+        from joblib import Parallel, delayed, effective_n_jobs
+
+        # A single job runs in this process, where the matplotlib backend is the caller's
+        headless = effective_n_jobs(n_jobs) > 1
+        with span("profile_columns", n_columns=len(profiled), n_jobs=n_jobs):
+            results = Parallel(n_jobs=n_jobs, prefer="processes")(
+                delayed(_profile_column)(
+                    data[[column, target]] if target is not None else data[[column]],
+                    column,
+                    kinds[column],
+                    target,
+                    output_dir,
+                    max_categories,
+                    headless,
+                )
+                for column in profiled
+            )
+        results = dict(zip(profiled, results))
+
+        index = {
+            "n_rows": len(data),
+            "n_columns": data.shape[1],
+            "target": target,
+            "missing_values": missing_values(data),
+            "columns": [
+                results.get(column, {"name": column, "kind": kinds[column], "figure": None})
+                for column in columns
+            ],
+        }
+
+        with span("write_index"):
+            paths = []
+            if index_format in ("html", "both"):
+                paths.append(os.path.join(output_dir, "index.html"))
+                _write_html(paths[-1], index)
+            if index_format in ("json", "both"):
+                paths.append(os.path.join(output_dir, "index.json"))
+                _write_json(paths[-1], index)
+
+    return paths[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile every column of a dataset into an HTML/JSON report.")
+    parser.add_argument("data", help="Path to a CSV, Parquet or Feather file")
+    parser.add_argument("--target", help="Target column the profiles are grouped by")
+    parser.add_argument("--columns", nargs="+", help="Columns to profile (default: all)")
+    parser.add_argument("--output-dir", default="report")
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--max-categories", type=int, default=30)
+    parser.add_argument("--format", choices=["html", "json", "both"], default="both")
+    args = parser.parse_args(argv)
+
+    path = generate_report(
+        args.data,
+        output_dir=args.output_dir,
+        target=args.target,
+        columns=args.columns,
+        n_jobs=args.n_jobs,
+        max_categories=args.max_categories,
+        index_format=args.format,
+    )
+    print(f"Report written to {path}")
+
+
+if __name__ == "__main__":
+    main()
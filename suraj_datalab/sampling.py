@@ -0,0 +1,583 @@
+"""
+Approximate profiles computed on a random sample of the rows, with confidence intervals.
+
+A sample of a fixed size is drawn uniformly, or stratified by the target so that rare classes are
+represented, from a DataFrame (`sample_rows`) or from chunks streamed out of a file (`ReservoirSampler`).
+`sampled_categorical_feature` and `sampled_numerical_feature` then return the tables of `categorical_feature`
+and `numerical_feature` estimated from the sample, with a confidence interval for every percentage and
+quantile, so their cost depends on the sample size rather than on the number of rows.
+"""
+
+import os
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from .analyze import _distribution_from_counts, _factorize
+from .instrument import span
+
+
+def _allocate(population_counts, sample_size):
+    """
+    Number of rows drawn from each stratum: proportional to its size, with at least sample_size / (2 x strata)
+    rows (and at least one) so that rare classes are estimated too, and never more than the stratum holds.
+    """
+    population_counts = np.asarray(population_counts, dtype=np.int64)
+    proportional = np.floor(sample_size * population_counts / max(population_counts.sum(), 1))
+    floor = max(sample_size // (2 * max(len(population_counts), 1)), 1)
+    return np.minimum(population_counts, np.maximum(proportional, floor)).astype(np.int64)
+
+
+def _with_design(sample, method, stratify, strata, population_counts):
+    sample.attrs["sampling"] = {
+        "method": method,
+        "stratify": stratify,
+        "population_size": int(np.sum(population_counts)),
+        "strata": list(strata),
+        "population_counts": [int(count) for count in population_counts],
+    }
+    return sample
+
+
+def sample_rows(df, sample_size=100_000, stratify=None, random_state=42):
+    """
+    Draw a simple random sample of the rows of a DataFrame, optionally stratified by a column.
+
+    The sampling design (method, strata and their sizes in the full DataFrame) is stored in
+    `sample.attrs["sampling"]`; `sampled_categorical_feature` and `sampled_numerical_feature` accept the sample
+    in place of the DataFrame and weight each stratum by its size, so one sample can be profiled many times.
+
+    Parameters:
+        df (DataFrame): The input DataFrame.
+        sample_size (int): Number of rows to draw. Default is 100,000. A stratified sample gives every class at
+                           least sample_size / (2 x classes) rows, so it can be slightly larger.
+        stratify (str): Optional column, usually the target, the sample is stratified by. Its missing values
+                        form their own stratum. Default is None (uniform sampling).
+        random_state (int): Seed of the random generator. Default is 42.
+    Returns:
+        DataFrame: The sampled rows, in their original order.
+    Raises:
+        ValueError: If the stratification column is not in the DataFrame.
+    """
+    if stratify is not None and stratify not in df.columns:
+        raise ValueError(f"Column '{stratify}' not found in the dataframe.")
+
+    rng = np.random.default_rng(random_state)
+    n_rows = len(df)
+
+    if stratify is None:
+        rows = np.arange(n_rows)
+        if n_rows > sample_size:
+            # Floyd-style selection, without materializing a permutation of every row
+            rows = np.sort(rng.choice(n_rows, sample_size, replace=False))
+        return _with_design(df.iloc[rows], "uniform", None, [None], [n_rows])
+
+    codes, strata = _factorize(df[stratify], dropna=False)
+    population_counts = np.bincount(codes, minlength=len(strata))
+    allocation = _allocate(population_counts, sample_size)
+
+    order = np.argsort(codes, kind="stable")
+    starts = np.concatenate([[0], np.cumsum(population_counts)])
+    rows = np.sort(
+        np.concatenate(
+            [
+                rng.choice(order[starts[j] : starts[j + 1]], allocation[j], replace=False)
+                for j in range(len(strata))
+            ]
+        )
+    )
+    return _with_design(df.iloc[rows], "stratified", stratify, strata, population_counts)
+
+
+class ReservoirSampler:
+    """
+    Draw a fixed-size random sample from DataFrame chunks of unknown total length in one pass.
+
+    Every row gets a uniform random key and the rows with the smallest keys are kept, which is a simple
+    random sample of all the rows seen so far. Only rows whose key beats the current reservoir are copied,
+    so after the first chunks almost every row is skipped. When stratified, a reservoir is kept per class
+    along with the exact class sizes, and `sample` draws each class with the allocation of `sample_rows`.
+    Samplers fed from separate chunks or processes can be merged, provided their seeds differ.
+
+    Usage:
+        sampler = ReservoirSampler(sample_size=100_000, stratify="Survived")
+        for chunk in read_chunks("train.parquet"):
+            sampler.update(chunk)
+        sample = sampler.sample()
+
+    Parameters:
+    ----------
+    sample_size : int, optional (default=100_000)
+        Number of rows of the sample.
+    stratify : str, optional (default=None)
+        Column, usually the target, the sample is stratified by.
+    random_state : int, optional (default=None)
+        Seed of the random keys.
+
+    Attributes:
+    ----------
+    strata_ : list
+        The classes of the stratification column, in order of appearance (a single None if not stratified).
+    population_counts_ : ndarray
+        Number of rows seen in each stratum.
+    """
+
+    def __init__(self, sample_size=100_000, stratify=None, random_state=None):
+        self.sample_size = sample_size
+        self.stratify = stratify
+        self.random_state = random_state
+        self.strata_ = [None] if stratify is None else []
+        self.population_counts_ = np.zeros(len(self.strata_), dtype=np.int64)
+        self._rows = None
+        self._keys = np.empty(0)
+        self._codes = np.empty(0, dtype=np.int64)
+        self._thresholds = np.ones(len(self.strata_))
+        self._rng = np.random.default_rng(random_state)
+
+    def _stratum_codes(self, values):
+        codes, uniques = _factorize(values, dropna=False)
+        positions = pd.Index(self.strata_, dtype=object).get_indexer(uniques)
+        new = positions < 0
+        positions[new] = len(self.strata_) + np.arange(new.sum())
+        self.strata_.extend(uniques[new])
+        n_new = int(new.sum())
+        self.population_counts_ = np.concatenate([self.population_counts_, np.zeros(n_new, dtype=np.int64)])
+        self._thresholds = np.concatenate([self._thresholds, np.ones(n_new)])
+        return positions[codes]
+
+    def _add(self, rows, keys, codes):
+        if self._rows is None:
+            self._rows = rows.iloc[:0]
+        rows = pd.concat([self._rows, rows])
+        keys = np.concatenate([self._keys, keys])
+        codes = np.concatenate([self._codes, codes])
+
+        # Keep the smallest keys of each stratum, sorted by stratum then key
+        order = np.lexsort((keys, codes))
+        codes = codes[order]
+        starts = np.searchsorted(codes, np.arange(len(self.strata_)))
+        keep = np.arange(len(codes)) - starts[codes] < self.sample_size
+
+        self._rows = rows.iloc[order[keep]]
+        self._keys = keys[order[keep]]
+        self._codes = codes[keep]
+
+        # A full reservoir only accepts keys below its largest one
+        sizes = np.bincount(self._codes, minlength=len(self.strata_))
+        ends = np.cumsum(sizes) - 1
+        self._thresholds = np.where(sizes >= self.sample_size, self._keys[np.maximum(ends, 0)], 1.0)
+
+    def update(self, chunk):
+        """
+        Add a DataFrame chunk to the sample.
+        """
+        if self.stratify is None:
+            codes = np.zeros(len(chunk), dtype=np.int64)
+        else:
+            codes = self._stratum_codes(chunk[self.stratify])
+        self.population_counts_ += np.bincount(codes, minlength=len(self.strata_))
+
+        keys = self._rng.random(len(chunk))
+        candidates = np.flatnonzero(keys < self._thresholds[codes])
+        if len(candidates):
+            self._add(chunk.iloc[candidates], keys[candidates], codes[candidates])
+        return self
+
+    def merge(self, other):
+        """
+        Merge the sample of another sampler with the same sample size and stratification column.
+        """
+        if other.sample_size != self.sample_size or other.stratify != self.stratify:
+            raise ValueError("Only samplers with the same sample size and stratification can be merged.")
+        if other._rows is None:
+            return self
+
+        # Position of each stratum of `other` among the strata of this sampler
+        positions = np.arange(len(other.strata_))
+        if self.stratify is not None:
+            positions = self._stratum_codes(pd.Series(other.strata_, dtype=object))
+        self.population_counts_[positions] += other.population_counts_
+        self._add(other._rows, other._keys, positions[other._codes])
+        return self
+
+    def sample(self):
+        """
+        Return the sample as a DataFrame with the index of its chunks, and its design in `attrs["sampling"]`
+        (see `sample_rows`).
+        """
+        if self._rows is None:
+            raise ValueError("The sampler has not seen any rows.")
+        if self.stratify is None:
+            allocation = np.minimum(self.population_counts_, self.sample_size)
+        else:
+            allocation = _allocate(self.population_counts_, self.sample_size)
+
+        # Rows are sorted by stratum and key, so each stratum keeps its first rows
+        sizes = np.bincount(self._codes, minlength=len(self.strata_))
+        starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        rank = np.arange(len(self._codes)) - starts[self._codes]
+        sample = self._rows[rank < allocation[self._codes]].sort_index()
+
+        method = "uniform" if self.stratify is None else "stratified"
+        return _with_design(sample, method, self.stratify, self.strata_, self.population_counts_)
+
+
+def _draw(data, columns, sample_size, stratify, chunksize, random_state):
+    """
+    Sample the columns of a DataFrame, a file or an iterable of chunks, reusing a DataFrame already sampled.
+    """
+    if isinstance(data, pd.DataFrame):
+        if "sampling" in data.attrs:
+            return data
+        missing = [column for column in columns if column not in data.columns]
+        if missing:
+            raise ValueError(f"Columns {missing} not found in the dataframe.")
+        return sample_rows(data[columns], sample_size, stratify, random_state)
+
+    if isinstance(data, (str, os.PathLike)):
+        from .streaming import read_chunks
+
+        data = read_chunks(data, columns=columns, chunksize=chunksize)
+    sampler = ReservoirSampler(sample_size, stratify, random_state)
+    for chunk in data:
+        sampler.update(chunk[columns])
+    return sampler.sample()
+
+
+def _design(sample):
+    """
+    Stratum code of every sampled row, and the sample and population size of every stratum.
+    """
+    design = sample.attrs["sampling"]
+    population_sizes = np.asarray(design["population_counts"], dtype=np.float64)
+    if design["stratify"] is None:
+        codes = np.zeros(len(sample), dtype=np.int64)
+    else:
+        codes = pd.Index(design["strata"], dtype=object).get_indexer(sample[design["stratify"]])
+    sample_sizes = np.bincount(codes, minlength=len(population_sizes)).astype(np.float64)
+    return codes, sample_sizes, population_sizes
+
+
+def _ratio_estimate(y, yy, x, xx, xy, sample_sizes, population_sizes):
+    """
+    Stratified ratio estimate R = sum(y) / sum(x) over the population, and its linearized variance.
+
+    Parameters:
+        y, yy, x, xx, xy (ndarray): Per-stratum sample sums of y, y^2, x, x^2 and x*y; the last axis is the
+                                    stratum and the leading axes broadcast, one estimate per cell.
+        sample_sizes (ndarray): Number of sampled rows of each stratum.
+        population_sizes (ndarray): Number of rows of each stratum in the population.
+    Returns:
+        tuple: The estimates, their variances and the estimated population totals of x.
+    """
+    n = np.maximum(sample_sizes, 1)
+    weights = population_sizes / n
+    total_x = (x * weights).sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = (y * weights).sum(axis=-1) / total_x
+        r = ratio[..., None]
+        # Sample variance of the residuals z = y - R x within each stratum
+        sum_z = y - r * x
+        sum_z2 = yy - 2 * r * xy + r**2 * xx
+        residual_variance = np.where(
+            sample_sizes > 1, (sum_z2 - sum_z**2 / n) / np.maximum(sample_sizes - 1, 1), 0.0
+        )
+        # The finite population correction shrinks the variance to 0 when a stratum is fully sampled
+        correction = np.clip(1 - sample_sizes / population_sizes, 0, 1)
+        variance = (population_sizes**2 * correction * np.maximum(residual_variance, 0) / n).sum(axis=-1)
+        variance = variance / total_x**2
+    return ratio, variance, total_x
+
+
+def _z_score(confidence):
+    return NormalDist().inv_cdf((1 + confidence) / 2)
+
+
+def _proportion_interval(numerator, denominator, sample_sizes, population_sizes, z):
+    """
+    Estimate a proportion from per-stratum counts (numerator rows are a subset of denominator rows).
+
+    The Wilson score interval is computed with the effective sample size p (1 - p) / var(p), which is the
+    number of sampled rows for a uniform sample and accounts for the stratum weights otherwise. A proportion
+    estimated at 0 or 1 uses the number of sampled denominator rows, so its interval does not collapse.
+
+    Returns:
+        tuple: The estimates and the lower and upper bounds, as fractions.
+    """
+    p, variance, _ = _ratio_estimate(
+        numerator, numerator, denominator, denominator, numerator, sample_sizes, population_sizes
+    )
+    fully_sampled = np.all(sample_sizes >= population_sizes)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        n = np.where(
+            variance > 0,
+            p * (1 - p) / variance,
+            np.inf if fully_sampled else np.sum(denominator, axis=-1),
+        )
+        n = np.broadcast_to(n, np.shape(p))
+        finite = np.isfinite(n)
+        n_safe = np.where(finite, n, 1.0)
+        scale = np.where(finite, z**2 / n_safe, 0.0)
+        center = (p + scale / 2) / (1 + scale)
+        half_width = np.where(
+            finite, z / (1 + scale) * np.sqrt(p * (1 - p) / n_safe + z**2 / (4 * n_safe**2)), 0.0
+        )
+    return p, np.clip(center - half_width, 0, 1), np.clip(center + half_width, 0, 1)
+
+
+def _cell_counts(codes, n_codes, stratum_codes, n_strata):
+    """
+    Number of sampled rows of each (code, stratum) pair; rows with a negative code are skipped.
+    """
+    valid = codes >= 0
+    combined = codes[valid] * n_strata + stratum_codes[valid]
+    counts = np.bincount(combined, minlength=n_codes * n_strata)
+    return counts.reshape(n_codes, n_strata).astype(np.float64)
+
+
+def _sample_summary(table, sample, confidence):
+    design = sample.attrs["sampling"]
+    table.attrs["sampling"] = {
+        "method": design["method"],
+        "stratify": design["stratify"],
+        "sample_size": len(sample),
+        "population_size": design["population_size"],
+        "confidence": confidence,
+    }
+    return table
+
+
+def sampled_categorical_feature(
+    data,
+    feature,
+    target,
+    sample_size=100_000,
+    stratify=False,
+    confidence=0.95,
+    chunksize=1_000_000,
+    random_state=42,
+):
+    """
+    Approximate `categorical_feature` from a random sample of the rows, with confidence intervals.
+
+    Counts are weighted by the size of each sampling stratum, so the percentages estimate those of the full
+    data; "Total Count" is the estimated number of rows of each category. Every percentage column is followed
+    by "<column> CI Low" and "<column> CI High", the bounds of a Wilson score interval using the effective
+    sample size of its stratified ratio estimate. Categories absent from the sample are not listed.
+
+    Parameters:
+        data (DataFrame, str or iterable): The input DataFrame, a sample drawn with `sample_rows` (used as is),
+                                           the path to a CSV, Parquet or Feather file, or an iterable of
+                                           DataFrame chunks. Files and chunks are sampled with `ReservoirSampler`.
+        feature (str): The name of the categorical feature.
+        target (str): The name of the target variable.
+        sample_size (int): Number of rows of the sample. Default is 100,000.
+        stratify (bool): If True, stratify the sample by the target so that rare classes get enough rows.
+                         Default is False (uniform sampling).
+        confidence (float): Confidence level of the intervals. Default is 0.95.
+        chunksize (int): Number of rows read per chunk from files. Default is 1,000,000.
+        random_state (int): Seed of the sampling. Default is 42.
+    Returns:
+        DataFrame: The distribution table of `categorical_feature` with interval columns, sorted by estimated
+                   count. `attrs["sampling"]` holds the method, the sample size, the population size and the
+                   confidence level.
+    """
+    with span("sampled_categorical_feature", feature=feature, sample_size=sample_size):
+        with span("sample"):
+            sample = _draw(
+                data, [feature, target], sample_size, target if stratify else None, chunksize, random_state
+            )
+
+        with span("statistics"):
+            stratum_codes, sample_sizes, population_sizes = _design(sample)
+            n_strata = len(population_sizes)
+            feature_codes, categories = _factorize(sample[feature], keep_categories=True)
+            target_codes, classes = _factorize(sample[target], dropna=False)
+            n_categories, n_classes = len(categories), len(classes)
+
+            combined = np.where(feature_codes >= 0, feature_codes * n_classes + target_codes, -1)
+            cells = _cell_counts(combined, n_categories * n_classes, stratum_codes, n_strata)
+            cells = cells.reshape(n_categories, n_classes, n_strata)
+
+            weighted = (cells * (population_sizes / np.maximum(sample_sizes, 1))).sum(axis=-1)
+            table = _distribution_from_counts(weighted, categories, classes, feature)
+            order = np.argsort(-weighted.sum(axis=1), kind="stable")
+
+            z = _z_score(confidence)
+            by_category = cells.sum(axis=1)
+            intervals = {
+                "Total Percentage": _proportion_interval(
+                    by_category, by_category.sum(axis=0), sample_sizes, population_sizes, z
+                ),
+                "of Total (%)": _proportion_interval(
+                    cells, cells.sum(axis=0, keepdims=True), sample_sizes, population_sizes, z
+                ),
+                "within (%)": _proportion_interval(
+                    cells, cells.sum(axis=1, keepdims=True), sample_sizes, population_sizes, z
+                ),
+            }
+
+            bounds = {"Total Percentage": intervals["Total Percentage"][1:]}
+            for j, class_value in enumerate(classes):
+                bounds[f"{class_value} of Total (%)"] = [b[:, j] for b in intervals["of Total (%)"][1:]]
+                bounds[f"{class_value} within {feature} (%)"] = [b[:, j] for b in intervals["within (%)"][1:]]
+
+            columns = {}
+            for column in table.columns:
+                estimate = table[column].to_numpy()
+                columns[column] = estimate
+                if column in bounds:
+                    low, high = bounds[column]
+                    # Cells without an estimate (empty or missing classes) get no interval either
+                    columns[f"{column} CI Low"] = np.where(np.isnan(estimate), np.nan, low[order] * 100)
+                    columns[f"{column} CI High"] = np.where(np.isnan(estimate), np.nan, high[order] * 100)
+
+            table = pd.DataFrame(columns, index=table.index)
+
+    return _sample_summary(table, sample, confidence)
+
+
+def _weighted_quantile(sorted_values, cumulative_weights, q):
+    # Inverse of the weighted empirical distribution function
+    positions = np.searchsorted(cumulative_weights, np.asarray(q) * cumulative_weights[-1], side="left")
+    return sorted_values[np.clip(positions, 0, len(sorted_values) - 1)]
+
+
+def sampled_numerical_feature(
+    data,
+    feature,
+    target=None,
+    sample_size=100_000,
+    stratify=False,
+    confidence=0.95,
+    chunksize=1_000_000,
+    random_state=42,
+):
+    """
+    Approximate `numerical_feature` from a random sample of the rows, with confidence intervals.
+
+    Every sampled row is weighted by the size of its stratum. Quartiles are read from the weighted empirical
+    distribution, with Woodruff intervals (the interval of the proportion of rows below the quartile, mapped
+    back through the distribution); the mean has a normal interval, the count and the outlier rates Wilson
+    score intervals. The IQR bounds come from the estimated quartiles and are taken as fixed. Min and max are
+    the extremes of the sample, which only bound those of the full data, and have no interval.
+
+    Parameters:
+        data (DataFrame, str or iterable): The input DataFrame, a sample drawn with `sample_rows` (used as is),
+                                           the path to a CSV, Parquet or Feather file, or an iterable of
+                                           DataFrame chunks. Files and chunks are sampled with `ReservoirSampler`.
+        feature (str): The name of the numerical feature.
+        target (str): Optional target column, only used to stratify the sample. Default is None.
+        sample_size (int): Number of rows of the sample. Default is 100,000.
+        stratify (bool): If True, stratify the sample by the target. Default is False (uniform sampling).
+        confidence (float): Confidence level of the intervals. Default is 0.95.
+        chunksize (int): Number of rows read per chunk from files. Default is 1,000,000.
+        random_state (int): Seed of the sampling. Default is 42.
+    Returns:
+        tuple: `outliers_df`, the outlier percentages of `numerical_feature` each followed by its "CI Low" and
+               "CI High" columns, and `summary_df`, the overall statistics of `numerical_feature` as rows with
+               the columns "Estimate", "CI Low" and "CI High". Both have the sampling details in
+               `attrs["sampling"]`.
+    Raises:
+        ValueError: If stratify is True without a target.
+    """
+    if stratify and target is None:
+        raise ValueError("A target is required to stratify the sample.")
+
+    with span("sampled_numerical_feature", feature=feature, sample_size=sample_size):
+        with span("sample"):
+            columns = [feature] if target is None else [feature, target]
+            sample = _draw(data, columns, sample_size, target if stratify else None, chunksize, random_state)
+
+        with span("statistics"):
+            stratum_codes, sample_sizes, population_sizes = _design(sample)
+            n_strata = len(population_sizes)
+            z = _z_score(confidence)
+            values = sample[feature].to_numpy(dtype=np.float64, na_value=np.nan)
+            valid = ~np.isnan(values)
+            weights = (population_sizes / np.maximum(sample_sizes, 1))[stratum_codes]
+
+            def per_stratum(selected, column_values=None):
+                return np.bincount(
+                    stratum_codes[selected],
+                    weights=None if column_values is None else column_values[selected],
+                    minlength=n_strata,
+                ).astype(np.float64)
+
+            def proportion(selected, denominator):
+                p, low, high = _proportion_interval(
+                    per_stratum(selected), per_stratum(denominator), sample_sizes, population_sizes, z
+                )
+                return [float(p), float(low), float(high)]
+
+            all_rows = np.ones(len(values), dtype=bool)
+            population_size = population_sizes.sum()
+            count = [bound * population_size for bound in proportion(valid, all_rows)]
+
+            n_valid = per_stratum(valid)
+            valid_values = np.where(valid, values, 0.0)
+            mean, mean_variance, _ = _ratio_estimate(
+                per_stratum(valid, valid_values),
+                per_stratum(valid, valid_values**2),
+                n_valid,
+                n_valid,
+                per_stratum(valid, valid_values),
+                sample_sizes,
+                population_sizes,
+            )
+            half_width = z * np.sqrt(mean_variance)
+
+            order = np.argsort(values[valid], kind="stable")
+            sorted_values = values[valid][order]
+            sorted_weights = weights[valid][order]
+            rows = [count, [float(mean), float(mean - half_width), float(mean + half_width)]]
+
+            if len(sorted_values):
+                cumulative_weights = np.cumsum(sorted_weights)
+                deviations = sorted_values - mean
+                std = np.sqrt(
+                    np.sum(sorted_weights * deviations**2) / cumulative_weights[-1]
+                    * len(sorted_values) / max(len(sorted_values) - 1, 1)
+                )
+                rows += [[float(std), np.nan, np.nan], [sorted_values[0], np.nan, np.nan]]
+                for q in (0.25, 0.5, 0.75):
+                    estimate = _weighted_quantile(sorted_values, cumulative_weights, q)
+                    # Woodruff interval: invert the interval of the share of rows below the estimate
+                    below = per_stratum(valid & (values <= estimate))
+                    _, variance, _ = _ratio_estimate(
+                        below, below, n_valid, n_valid, below, sample_sizes, population_sizes
+                    )
+                    spread = z * np.sqrt(variance)
+                    low, high = _weighted_quantile(
+                        sorted_values, cumulative_weights, np.clip([q - spread, q + spread], 0, 1)
+                    )
+                    rows.append([estimate, low, high])
+                rows.append([sorted_values[-1], np.nan, np.nan])
+                q1, q3 = rows[4][0], rows[6][0]
+            else:
+                rows += [[np.nan] * 3] * 6
+                q1 = q3 = np.nan
+
+            summary_df = pd.DataFrame(
+                rows,
+                index=["count", "mean", "std", "min", "25%", "50%", "75%", "max"],
+                columns=["Estimate", "CI Low", "CI High"],
+            )
+
+            iqr = q3 - q1
+            lower = valid & (values < q1 - 1.5 * iqr)
+            upper = valid & (values > q3 + 1.5 * iqr)
+            outliers = {}
+            for name, selected in [
+                ("Outlier Percentage", lower | upper),
+                ("Lower Outliers Percentage", lower),
+                ("Upper Outliers Percentage", upper),
+            ]:
+                estimate, low, high = proportion(selected, all_rows)
+                outliers[name] = [estimate * 100]
+                outliers[f"{name} CI Low"] = [low * 100]
+                outliers[f"{name} CI High"] = [high * 100]
+            outliers_df = pd.DataFrame(outliers)
+
+    return _sample_summary(outliers_df, sample, confidence), _sample_summary(summary_df, sample, confidence)
@@ -0,0 +1,302 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from .analyze import _distribution_from_counts, _null_counts, _numerical_frames
+from .sketches import CategorySketch, NumericSketch
+
+_PARQUET_SUFFIXES = (".parquet", ".pq")
+_FEATHER_SUFFIXES = (".feather", ".arrow", ".ipc")
+
+
+def _import_pyarrow():
+    """
+    Import pyarrow, which is only needed for Parquet and Feather files.
+    """
+    try:
+        import pyarrow
+    except ImportError as error:
+        raise ImportError(
+            "Reading Parquet and Feather files requires pyarrow. Install it with `pip install pyarrow`."
+        ) from error
+    return pyarrow
+
+
+def read_chunks(file_path, columns=None, chunksize=1_000_000):
+    """
+    Read a CSV, Parquet or Feather file as a sequence of DataFrame chunks.
+
+    The format is chosen from the file extension: `.parquet`/`.pq` and `.feather`/`.arrow`/`.ipc` are read
+    with pyarrow, anything else with `pd.read_csv`. Only one chunk is held in memory at a time.
+
+    Parameters:
+    file_path (str): Path to the input file.
+    columns (list): Optional list of columns to read. Default is None (all columns).
+    chunksize (int): Maximum number of rows per chunk. Default is 1,000,000.
+
+    Yields:
+    pd.DataFrame: The next chunk of rows.
+    """
+    suffix = os.path.splitext(str(file_path))[1].lower()
+
+    if suffix in _PARQUET_SUFFIXES:
+        _import_pyarrow()
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(file_path)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    elif suffix in _FEATHER_SUFFIXES:
+        pa = _import_pyarrow()
+        import pyarrow.ipc
+
+        with pa.memory_map(str(file_path)) as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                if columns is not None:
+                    batch = batch.select(columns)
+                for start in range(0, batch.num_rows, chunksize):
+                    yield batch.slice(start, chunksize).to_pandas()
+    else:
+        yield from pd.read_csv(file_path, usecols=columns, chunksize=chunksize)
+
+
+def _parquet_missing_counts(file_path):
+    """
+    Null counts of a Parquet file from its row group statistics, without decoding any column data.
+    """
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(file_path)
+    metadata = parquet_file.metadata
+    dtypes = parquet_file.schema_arrow.empty_table().to_pandas().dtypes
+    null_counts = pd.Series(0, index=dtypes.index, dtype=np.int64)
+
+    # Flat columns map to one leaf; nested columns or missing statistics are read and counted instead
+    unresolved = set()
+    for j in range(metadata.num_columns):
+        name = metadata.schema.column(j).path
+        if name not in null_counts.index:
+            unresolved.add(name.split(".")[0])
+            continue
+        for i in range(metadata.num_row_groups):
+            statistics = metadata.row_group(i).column(j).statistics
+            if statistics is None or not statistics.has_null_count:
+                unresolved.add(name)
+                break
+            null_counts[name] += statistics.null_count
+
+    unresolved = [column for column in dtypes.index if column in unresolved]
+    if unresolved:
+        null_counts[unresolved] = 0
+        for batch in parquet_file.iter_batches(columns=unresolved):
+            for column in unresolved:
+                null_counts[column] += batch.column(column).null_count
+
+    return null_counts, metadata.num_rows, dtypes
+
+
+def _feather_missing_counts(file_path):
+    """
+    Null counts of a Feather (Arrow IPC) file from the record batch metadata of a memory-mapped read.
+    """
+    pa = _import_pyarrow()
+    import pyarrow.ipc
+
+    with pa.memory_map(str(file_path)) as source:
+        reader = pa.ipc.open_file(source)
+        dtypes = reader.schema.empty_table().to_pandas().dtypes
+        null_counts = pd.Series(0, index=dtypes.index, dtype=np.int64)
+        n_rows = 0
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            n_rows += batch.num_rows
+            for column in dtypes.index:
+                null_counts[column] += batch.column(column).null_count
+
+    return null_counts, n_rows, dtypes
+
+
+def _missing_counts_from_file(file_path, chunksize=1_000_000):
+    """
+    Per-column null counts, row count and pandas dtypes of a file, for `missing_values`.
+
+    Parameters:
+    file_path (str): Path to a Parquet file, a directory of Parquet files, a Feather file or a CSV file.
+    chunksize (int): Number of rows read per chunk for CSV files. Default is 1,000,000.
+
+    Returns:
+    tuple: The null counts (pd.Series), the number of rows and the column dtypes (pd.Series).
+    """
+    if os.path.isdir(file_path):
+        parts = [
+            _missing_counts_from_file(os.path.join(file_path, name), chunksize)
+            for name in sorted(os.listdir(file_path))
+            if os.path.splitext(name)[1].lower() in _PARQUET_SUFFIXES
+        ]
+        if not parts:
+            raise ValueError(f"No Parquet files found in '{file_path}'.")
+        null_counts = sum(part[0] for part in parts)
+        return null_counts, sum(part[1] for part in parts), parts[0][2]
+
+    suffix = os.path.splitext(str(file_path))[1].lower()
+    if suffix in _PARQUET_SUFFIXES:
+        _import_pyarrow()
+        return _parquet_missing_counts(file_path)
+    if suffix in _FEATHER_SUFFIXES:
+        return _feather_missing_counts(file_path)
+
+    # CSV: stream the file and keep running totals per column
+    null_counts, n_rows, schema = None, 0, None
+    for chunk in read_chunks(file_path, chunksize=chunksize):
+        chunk_counts = _null_counts(chunk)
+        null_counts = chunk_counts if null_counts is None else null_counts + chunk_counts
+        n_rows += len(chunk)
+        # Combine the dtypes inferred for each chunk, as a full read would
+        schema = chunk.iloc[:0] if schema is None else pd.concat([schema, chunk.iloc[:0]])
+
+    return null_counts, n_rows, schema.dtypes
+
+
+def _column_chunks(file_path, feature, chunksize):
+    for chunk in read_chunks(file_path, columns=[feature], chunksize=chunksize):
+        yield chunk[feature].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _sketch_chunk(values, k, seed):
+    return NumericSketch(k=k, seed=seed).update(values)
+
+
+def _sketch_tails(values, lower_bound, upper_bound, k, seed):
+    lower = NumericSketch(k=k, seed=seed).update(values[values < lower_bound])
+    upper = NumericSketch(k=k, seed=seed).update(values[values > upper_bound])
+    return lower, upper
+
+
+def numerical_feature_from_file(
+    file_path, feature, chunksize=1_000_000, k=200, n_jobs=1, random_state=42
+):
+    """
+    Out-of-core version of `numerical_feature` for files larger than memory.
+
+    The column is streamed twice. The first pass builds a mergeable `NumericSketch` per chunk (row count,
+    exact count/mean/variance/min/max and a KLL quantile sketch) and merges them to get the quartiles and the
+    IQR bounds. The second pass summarizes the values outside those bounds. Chunks are summarized on a
+    joblib worker pool and the partial summaries are merged, so one large file can use several processes.
+
+    Error bounds: count, mean, std, min, max and the outlier counts (relative to the reported bounds) are
+    exact. The 25%, 50% and 75% values, and therefore the IQR bounds, have the rank error of `KLLSketch`:
+    about +-1.1% of the values for the default k=200, +-0.3% for k=1000.
+
+    Parameters:
+    - file_path (str): Path to a CSV, Parquet or Feather file.
+    - feature (str): The name of the numerical feature to analyze.
+    - chunksize (int, optional): Number of rows read per chunk. Default is 1,000,000.
+    - k (int, optional): Accuracy parameter of the quantile sketches. Default is 200.
+    - n_jobs (int, optional): Number of worker processes; -1 uses all cores. Default is 1.
+    - random_state (int, optional): Seed for the quantile sketches. Default is 42.
+    Returns:
+    - outliers_df (pandas.DataFrame): The percentage of outliers, as in `numerical_feature`.
+    - summary_df (pandas.DataFrame): The overall, lower outliers and upper outliers statistics, as in `numerical_feature`.
+    """
+    from joblib import Parallel, delayed
+
+    parallel = Parallel(n_jobs=n_jobs, return_as="generator")
+
+    # First pass: overall statistics and quartiles
+    overall = NumericSketch(k=k, seed=random_state)
+    for sketch in parallel(
+        delayed(_sketch_chunk)(values, k, random_state + i)
+        for i, values in enumerate(_column_chunks(file_path, feature, chunksize))
+    ):
+        overall.merge(sketch)
+
+    overall_summary = overall.describe()
+    q1, q3 = overall_summary[4], overall_summary[6]
+    lower_bound = q1 - 1.5 * (q3 - q1)
+    upper_bound = q3 + 1.5 * (q3 - q1)
+
+    # Second pass: statistics of the values outside the IQR bounds
+    lower = NumericSketch(k=k, seed=random_state)
+    upper = NumericSketch(k=k, seed=random_state)
+    for lower_chunk, upper_chunk in parallel(
+        delayed(_sketch_tails)(values, lower_bound, upper_bound, k, random_state + i)
+        for i, values in enumerate(_column_chunks(file_path, feature, chunksize))
+    ):
+        lower.merge(lower_chunk)
+        upper.merge(upper_chunk)
+
+    summary = {
+        "n_rows": overall.n_rows,
+        "overall": overall_summary,
+        "lower": lower.describe(),
+        "upper": upper.describe(),
+        "n_lower": lower.count,
+        "n_upper": upper.count,
+        "lower_bound": lower_bound,
+        "upper_bound": upper_bound,
+    }
+
+    return _numerical_frames(summary, feature)
+
+
+def _count_chunk(chunk, feature, target, max_categories):
+    return CategorySketch(max_categories=max_categories).update(chunk[feature], chunk[target])
+
+
+def categorical_feature_from_file(
+    file_path, feature, target, chunksize=1_000_000, max_categories=10_000, n_jobs=1
+):
+    """
+    Out-of-core version of `categorical_feature` with bounded memory for high-cardinality columns.
+
+    Each chunk is counted into a `CategorySketch` on a joblib worker pool and the sketches are merged. While
+    every target class has at most `max_categories` distinct categories the counts are exact and the table
+    matches `categorical_feature(..., plot=False)` on the loaded data. Beyond that (user IDs, URLs) each class
+    keeps a Misra-Gries heavy-hitters summary, memory stays fixed and only the `max_categories` most frequent
+    categories are returned.
+
+    Error bounds: counts are never overestimated. The count of a category in class j is underestimated by
+    at most n_j / (max_categories + 1), where n_j is the number of rows of the class; the exact bound of the
+    run is stored in `category_distribution.attrs["error_bounds"]`, and `attrs["exact"]` tells whether
+    every count is exact. Percentages are taken over the exact row counts.
+
+    Parameters:
+        file_path (str): Path to a CSV, Parquet or Feather file.
+        feature (str): The name of the categorical feature.
+        target (str): The name of the target variable.
+        chunksize (int): Number of rows read per chunk. Default is 1,000,000.
+        max_categories (int): Number of counters kept per target class. Default is 10,000.
+        n_jobs (int): Number of worker processes; -1 uses all cores. Default is 1.
+    Returns:
+        DataFrame: The distribution table of `categorical_feature`, sorted by total count.
+    """
+    from joblib import Parallel, delayed
+
+    parallel = Parallel(n_jobs=n_jobs, return_as="generator")
+
+    sketch = CategorySketch(max_categories=max_categories)
+    for chunk_sketch in parallel(
+        delayed(_count_chunk)(chunk, feature, target, max_categories)
+        for chunk in read_chunks(file_path, columns=[feature, target], chunksize=chunksize)
+    ):
+        sketch.merge(chunk_sketch)
+
+    category_distribution = _distribution_from_counts(
+        sketch.counts_,
+        sketch.categories_,
+        sketch.classes_,
+        feature,
+        class_totals=sketch.class_totals_,
+    )
+    if not sketch.exact:
+        category_distribution = category_distribution.head(max_categories)
+
+    category_distribution.attrs["exact"] = sketch.exact
+    category_distribution.attrs["error_bounds"] = dict(
+        zip(sketch.classes_, sketch.error_bounds_.tolist())
+    )
+
+    return category_distribution
@@ -1,9 +1,11 @@
 import pytest
 import pandas as pd
 import numpy as np
-from suraj_datalab.analyze import categorical_feature, numerical_feature, missing_values
+from suraj_datalab.analyze import categorical_feature, numerical_feature, missing_values, profile_categorical, profile_numerical
 import matplotlib.pyplot as plt
 import os
+import subprocess
+import sys
 
 def test_categorical_feature():
     # Create a test DataFrame
@@ -122,3 +124,249 @@ def test_missing_values():
 
     # Feature3 should not appear in the summary because it has no missing values
     assert 'Feature3' not in missing_summary.index
+
+def _per_class_distribution(df, feature, target):
+    # Reference implementation: one boolean mask and value_counts per target class
+    category_distribution = pd.DataFrame(
+        {
+            "Total Count": df[feature].value_counts(),
+            "Total Percentage": df[feature].value_counts(normalize=True) * 100,
+        }
+    )
+    for class_value in df[target].unique():
+        category_distribution[f"{class_value} of Total (%)"] = (
+            df[df[target] == class_value][feature].value_counts(normalize=True) * 100
+        )
+    for class_value in df[target].unique():
+        category_distribution[f"{class_value} within {feature} (%)"] = (
+            df[df[target] == class_value][feature].value_counts()
+            / df[feature].value_counts()
+            * 100
+        )
+    return category_distribution
+
+@pytest.mark.parametrize("feature_dtype", [None, "category"])
+def test_categorical_feature_matches_per_class_scan(feature_dtype):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'Feature': rng.choice(['A', 'B', 'C', 'D', None], 500),
+        'Target': rng.choice([0.0, 1.0, 2.0, np.nan], 500)
+    })
+    if feature_dtype:
+        df['Feature'] = df['Feature'].astype(pd.CategoricalDtype(['A', 'B', 'C', 'D', 'E']))
+
+    category_distribution = categorical_feature(df, 'Feature', 'Target')
+
+    pd.testing.assert_frame_equal(category_distribution, _per_class_distribution(df, 'Feature', 'Target'))
+
+def test_profile_categorical():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({
+        'Color': rng.choice(['red', 'green', 'blue'], 200),
+        'Size': rng.choice(['S', 'M', 'L', 'XL'], 200),
+        'Target': rng.choice(['X', 'Y'], 200)
+    })
+
+    profile = profile_categorical(df, ['Color', 'Size'], 'Target', n_jobs=2, prefer='threads')
+
+    assert profile.columns.tolist() == [
+        'Feature', 'Category', 'Class', 'Count', 'Total Count', 'Total Percentage',
+        'Class of Total (%)', 'Class within Feature (%)'
+    ]
+    assert len(profile) == (3 + 4) * 2
+
+    # Each feature block matches the wide table from categorical_feature
+    expected = _per_class_distribution(df, 'Size', 'Target')
+    size = profile[profile['Feature'] == 'Size'].set_index(['Category', 'Class'])
+    for category in expected.index:
+        for class_value in ['X', 'Y']:
+            row = size.loc[(category, class_value)]
+            assert row['Total Count'] == expected.loc[category, 'Total Count']
+            assert row['Class of Total (%)'] == pytest.approx(expected.loc[category, f'{class_value} of Total (%)'])
+            assert row['Class within Feature (%)'] == pytest.approx(expected.loc[category, f'{class_value} within Size (%)'])
+    assert size['Count'].sum() == 200
+
+def test_compute_only_does_not_import_plotting_libraries():
+    # Run in a fresh interpreter: this test session has already imported matplotlib
+    code = (
+        "import sys\n"
+        "import pandas as pd\n"
+        "from suraj_datalab.analyze import categorical_feature, numerical_feature\n"
+        "df = pd.DataFrame({'Feature': [1, 2, 3, 4, 100], 'Target': ['A', 'B', 'A', 'B', 'A']})\n"
+        "categorical_feature(df, 'Target', 'Feature', plot=False)\n"
+        "outliers_df, summary_df = numerical_feature(df, 'Feature', 'Target', plot=False)\n"
+        "assert outliers_df['Upper Outliers Percentage'][0] == 20.0\n"
+        "loaded = [m for m in ('matplotlib', 'seaborn') if m in sys.modules]\n"
+        "assert not loaded, loaded\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+def test_numerical_feature_outlier_summaries():
+    rng = np.random.default_rng(2)
+    values = np.concatenate([rng.normal(size=995), [-50, -40, 60, 70, 80]])
+    values[rng.choice(1000, 20, replace=False)] = np.nan
+    df = pd.DataFrame({'Feature': values})
+
+    outliers_df, summary_df = numerical_feature(df, feature='Feature', plot=False)
+
+    # Reference: describe the boolean-masked subsets of the column
+    column = df['Feature']
+    q1, q3 = column.quantile(0.25), column.quantile(0.75)
+    lower = column[column < q1 - 1.5 * (q3 - q1)]
+    upper = column[column > q3 + 1.5 * (q3 - q1)]
+    pd.testing.assert_series_equal(summary_df.loc['Feature_Overall'], column.describe(), check_names=False)
+    pd.testing.assert_series_equal(summary_df.loc['Feature_Lower_Outliers'], lower.describe(), check_names=False)
+    pd.testing.assert_series_equal(summary_df.loc['Feature_Upper_Outliers'], upper.describe(), check_names=False)
+    assert outliers_df['Lower Outliers Percentage'][0] == len(lower) / 1000 * 100
+    assert outliers_df['Upper Outliers Percentage'][0] == len(upper) / 1000 * 100
+
+@pytest.mark.parametrize("file_name", ["data.csv", "data.parquet", "data.feather"])
+def test_missing_values_from_file(tmpdir, file_name):
+    if not file_name.endswith(".csv"):
+        pytest.importorskip("pyarrow")
+    df = pd.DataFrame({
+        'Feature1': [1, 2, np.nan, 4, 5] * 200,
+        'Feature2': [np.nan, 2, np.nan, 4, 5] * 200,
+        'Feature3': [1, 2, 3, 4, 5] * 200
+    })
+    file_path = str(tmpdir.join(file_name))
+    if file_name.endswith(".csv"):
+        df.to_csv(file_path, index=False)
+    elif file_name.endswith(".parquet"):
+        df.to_parquet(file_path, row_group_size=128)
+    else:
+        df.to_feather(file_path)
+
+    missing_summary = missing_values(file_path, chunksize=300)
+
+    pd.testing.assert_frame_equal(missing_summary, missing_values(df))
+
+def test_numerical_plot_data_matches_raw_computation():
+    from matplotlib.cbook import boxplot_stats
+    from scipy.stats import gaussian_kde
+    from suraj_datalab.analyze import _numeric_summary
+
+    rng = np.random.default_rng(0)
+    values = pd.Series(rng.lognormal(size=2000))
+    values[::50] = np.nan
+    target = pd.Series(rng.choice(['A', 'B'], size=2000))
+    plot_data = _numeric_summary(values, plot_data=True, target_values=target)['plot_data']
+
+    counts, edges = plot_data['histogram']
+    np.testing.assert_array_equal(counts, np.histogram(values.dropna(), bins=len(counts))[0])
+
+    grid, density = plot_data['kde']
+    reference = gaussian_kde(values.dropna())(grid)
+    assert np.abs(density - reference).max() < 0.01 * reference.max()
+
+    for box in plot_data['boxes']:
+        expected = boxplot_stats(values[(target == box['label']) & values.notna()].to_numpy())[0]
+        for key in ['med', 'q1', 'q3', 'whislo', 'whishi']:
+            assert box[key] == pytest.approx(expected[key])
+        np.testing.assert_array_equal(np.sort(box['fliers']), np.sort(expected['fliers']))
+
+def test_numerical_feature_renders_later_from_plot_data(tmpdir):
+    from suraj_datalab.plotting import plot_numerical_feature
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'Value': rng.normal(size=1000), 'Target': rng.choice(['A', 'B'], size=1000)})
+    outliers_df, summary_df, plot_data = numerical_feature(
+        df, 'Value', 'Target', bins='sturges', plot=False, return_plot_data=True
+    )
+    pd.testing.assert_frame_equal(summary_df, numerical_feature(df, 'Value', 'Target', plot=False)[1])
+
+    # The resolved bins travel with the summaries
+    assert plot_data['bins'] == len(plot_data['histogram'][0]) == int(np.ceil(np.log2(1000))) + 1
+    assert sorted(box['label'] for box in plot_data['boxes']) == ['A', 'B']
+
+    # The figure is rendered without the data
+    plot_numerical_feature(None, 'Value', 'Target', plot_data=plot_data, output_dir=str(tmpdir))
+    assert tmpdir.join('Value-Target-boxplot.png').check()
+    with pytest.raises(ValueError):
+        plot_numerical_feature(None, 'Value', 'Target')
+
+def test_categorical_feature_plot_uses_top_categories(tmpdir, monkeypatch):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'Feature': rng.zipf(1.5, size=5000) % 100,
+        'Target': rng.choice(['X', 'Y'], size=5000),
+    })
+    monkeypatch.chdir(tmpdir)
+
+    category_distribution = categorical_feature(df, 'Feature', 'Target')
+
+    ax = plt.gca()
+    assert ax.get_title() == f"Distribution of Feature by Target (top 30 of {len(category_distribution)} categories)"
+    heights = [patch.get_height() for patch in ax.patches]
+    expected = pd.crosstab(df['Feature'], df['Target']).loc[category_distribution.index[:30], ['X', 'Y']]
+    assert sorted(heights) == sorted(expected.to_numpy().ravel().tolist())
+    plt.close('all')
+
+    categorical_feature(df, 'Feature', 'Target', max_categories=5)
+    assert plt.gca().get_title() == f"Distribution of Feature by Target (top 5 of {len(category_distribution)} categories)"
+    assert len(plt.gca().get_xticks()) == 5
+    plt.close('all')
+
+def test_categorical_feature_plot_uses_exact_classes(tmpdir, monkeypatch):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'Feature': rng.choice(['a', 'b', 'c'], size=1000),
+        'Target': rng.choice([0.0, 1.0, np.nan], size=1000),
+    })
+    monkeypatch.chdir(tmpdir)
+
+    category_distribution = categorical_feature(df, 'Feature', 'Target')
+
+    # The missing target class is dropped, as seaborn drops missing hues
+    ax = plt.gca()
+    labels = [text.get_text() for text in ax.get_legend().get_texts()]
+    assert sorted(labels) == ['0.0', '1.0']
+    heights = [patch.get_height() for patch in ax.patches]
+    expected = pd.crosstab(df['Feature'], df['Target']).loc[category_distribution.index, [float(label) for label in labels]]
+    assert heights == expected.to_numpy().T.ravel().tolist()
+    plt.close('all')
+
+def test_profile_numerical_matches_numerical_feature():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'Income': rng.lognormal(size=1000),
+        'Age': rng.integers(18, 90, size=1000),
+        'Score': rng.normal(size=1000),
+        'Flag': rng.random(1000) < 0.5,
+        'Target': rng.choice(['A', 'B'], size=1000),
+    })
+    df.loc[::9, 'Income'] = np.nan
+    df.loc[:30, 'Target'] = None
+
+    profile = profile_numerical(df, target='Target')
+
+    assert profile['Feature'].tolist() == ['Income'] * 3 + ['Age'] * 3 + ['Score'] * 3
+    assert profile['Class'].isna().tolist() == [True, False, False] * 3
+    for feature in ['Income', 'Age', 'Score']:
+        for class_value in [None, 'A', 'B']:
+            subset = df if class_value is None else df[df['Target'] == class_value]
+            outliers_df, summary_df = numerical_feature(subset, feature, plot=False)
+            row = profile[(profile['Feature'] == feature) & (
+                profile['Class'].isna() if class_value is None else profile['Class'] == class_value
+            )].iloc[0]
+            np.testing.assert_allclose(row[summary_df.columns].to_numpy(dtype=float), summary_df.iloc[0], rtol=1e-12)
+            lower, upper = summary_df.iloc[1], summary_df.iloc[2]
+            assert row['Lower Outliers Count'] == lower['count']
+            assert row['Upper Outliers Count'] == upper['count']
+            np.testing.assert_allclose(
+                row[['Upper Outliers Mean', 'Upper Outliers Std', 'Upper Outliers Min', 'Upper Outliers Max']].to_numpy(dtype=float),
+                upper[['mean', 'std', 'min', 'max']].to_numpy(dtype=float), rtol=1e-12,
+            )
+            assert row['Outlier Percentage'] == pytest.approx(outliers_df['Outlier Percentage'][0])
+
+def test_profile_numerical_handles_empty_columns_and_blocks():
+    df = pd.DataFrame({'Empty': [np.nan] * 5, 'Value': [1.0, 2.0, 3.0, 4.0, 100.0]})
+
+    profile = profile_numerical(df, block_columns=1)
+
+    assert profile['Feature'].tolist() == ['Empty', 'Value'] and 'Class' not in profile.columns
+    assert profile.loc[0, 'count'] == 0 and np.isnan(profile.loc[0, '50%'])
+    assert profile.loc[1, 'Upper Outliers Count'] == 1 and profile.loc[1, 'Upper Outliers Max'] == 100.0
+    with pytest.raises(ValueError):
+        profile_numerical(df, ['Missing'])
@@ -0,0 +1,60 @@
+import pytest
+import pandas as pd
+import numpy as np
+
+from suraj_datalab.analyze import categorical_feature, profile_categorical
+from suraj_datalab.clean import RareCategoryReplacer
+
+pa = pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    n_rows = 1000
+    return pd.DataFrame({
+        "Feature": rng.choice(["a", "b", "c", "d", None], p=[0.5, 0.3, 0.15, 0.03, 0.02], size=n_rows),
+        "Other": rng.choice(["x", "y"], size=n_rows),
+        "Target": rng.choice(["yes", "no", None], p=[0.6, 0.35, 0.05], size=n_rows),
+    })
+
+
+@pytest.mark.parametrize("dictionary", [False, True])
+def test_categorical_feature_from_arrow(frame, dictionary):
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    if dictionary:
+        table = table.set_column(0, "Feature", table["Feature"].dictionary_encode())
+        table = table.set_column(2, "Target", table["Target"].dictionary_encode())
+
+    expected = categorical_feature(table.to_pandas(), "Feature", "Target", plot=False)
+    pd.testing.assert_frame_equal(categorical_feature(table, "Feature", "Target", plot=False), expected)
+
+    result = categorical_feature(table, "Feature", "Target", plot=False, output="arrow")
+    assert isinstance(result, pa.Table)
+    assert result.num_rows == len(expected)
+
+    pd.testing.assert_frame_equal(
+        profile_categorical(table, ["Feature", "Other"], "Target", n_jobs=1),
+        profile_categorical(table.to_pandas(), ["Feature", "Other"], "Target", n_jobs=1),
+    )
+
+
+def test_rare_category_replacer_arrow(frame):
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    # Two chunks with different dictionaries
+    table = pa.concat_tables([
+        table.slice(0, 500).set_column(0, "Feature", table.slice(0, 500)["Feature"].dictionary_encode()),
+        table.slice(500).set_column(0, "Feature", table.slice(500)["Feature"].dictionary_encode()),
+    ])
+
+    replacer = RareCategoryReplacer(columns=["Feature"], proportion_threshold=0.1).fit(table)
+    expected = RareCategoryReplacer(columns=["Feature"], proportion_threshold=0.1).fit(frame)
+    assert sorted(replacer.important_categories_["Feature"]) == sorted(expected.important_categories_["Feature"])
+
+    transformed = replacer.transform(table)
+    column = transformed["Feature"]
+    assert pa.types.is_dictionary(column.type)
+    assert column.chunk(0).dictionary.to_pylist() == list(replacer.category_maps_["Feature"])
+    assert column.to_pylist() == expected.transform(frame)["Feature"].tolist()
+    # Untouched columns are shared with the input
+    assert transformed["Other"].equals(table["Other"])
@@ -0,0 +1,90 @@
+import pytest
+import pandas as pd
+import numpy as np
+
+from suraj_datalab.analyze import categorical_feature, numerical_feature, missing_values
+from suraj_datalab.cache import ResultCache, column_fingerprint
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({
+        "Feature": rng.choice(["A", "B", "C"], size=300),
+        "Target": rng.choice(["yes", "no"], size=300),
+        "Value": rng.normal(size=300),
+    })
+    frame.loc[::7, "Value"] = np.nan
+    return frame
+
+
+def test_column_fingerprint_changes_with_data(df):
+    assert column_fingerprint(df["Value"]) == column_fingerprint(df["Value"].copy())
+    changed = df["Value"].copy()
+    changed.iloc[10] += 1e-9
+    assert column_fingerprint(changed) != column_fingerprint(df["Value"])
+    assert column_fingerprint(df["Feature"]) != column_fingerprint(df["Feature"].astype("category"))
+
+
+def test_result_cache_arrow_slices(df):
+    pa = pytest.importorskip("pyarrow")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    cache = ResultCache()
+
+    # Slices of the same length share their buffers but hold different rows
+    for start in (0, 100, 200):
+        part = table.slice(start, 100)
+        result = categorical_feature(part, "Feature", "Target", plot=False, cache=cache)
+        expected = categorical_feature(df.iloc[start:start + 100], "Feature", "Target", plot=False)
+        pd.testing.assert_frame_equal(result, expected)
+    assert cache.misses == 3
+
+    # Dictionary columns with the same indices but different dictionaries differ too
+    first = pa.array(["a", "b"]).dictionary_encode()
+    second = pa.DictionaryArray.from_arrays(first.indices, pa.array(["c", "d"]))
+    assert column_fingerprint(first) != column_fingerprint(second)
+
+
+def test_result_cache_hits_and_invalidation(df):
+    cache = ResultCache(max_entries=2)
+
+    first = categorical_feature(df, "Feature", "Target", plot=False, cache=cache)
+    second = categorical_feature(df, "Feature", "Target", plot=False, cache=cache)
+    pd.testing.assert_frame_equal(first, second)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Returned tables are copies: modifying one does not corrupt the cache
+    second.iloc[0, 0] = -1
+    pd.testing.assert_frame_equal(categorical_feature(df, "Feature", "Target", plot=False, cache=cache), first)
+
+    changed = df.copy()
+    changed.loc[0, "Feature"] = "C" if df.loc[0, "Feature"] != "C" else "A"
+    categorical_feature(changed, "Feature", "Target", plot=False, cache=cache)
+    assert cache.misses == 2
+
+    expected = numerical_feature(df, "Value", plot=False)
+    for result, reference in zip(numerical_feature(df, "Value", plot=False, cache=cache), expected):
+        pd.testing.assert_frame_equal(result, reference)
+    assert len(cache) == 2
+
+
+def test_result_cache_on_disk_with_plots(tmp_path, monkeypatch, df):
+    monkeypatch.chdir(tmp_path)
+    store = tmp_path / "cache"
+
+    categorical_feature(df, "Feature", "Target", cache=ResultCache(directory=str(store)))
+    plot_file = tmp_path / "plots" / "Feature-Target-distribution.png"
+    png = plot_file.read_bytes()
+    assert (store.glob("*-Feature-Target-distribution.png"))
+    plot_file.unlink()
+
+    # A new process-level cache reads the entry and the PNG back from disk
+    cache = ResultCache(directory=str(store))
+    result = categorical_feature(df, "Feature", "Target", cache=cache)
+    assert cache.hits == 1
+    assert plot_file.read_bytes() == png
+    pd.testing.assert_frame_equal(result, categorical_feature(df, "Feature", "Target", plot=False))
+
+    missing_values(df, cache=cache)
+    pd.testing.assert_frame_equal(missing_values(df, cache=cache), missing_values(df))
+    assert cache.hits == 2
@@ -1,7 +1,8 @@
+import pickle
 import pytest
 import pandas as pd
 import numpy as np  # Import numpy
-from suraj_datalab.clean import RareCategoryReplacer
+from suraj_datalab.clean import DtypeOptimizer, RareCategoryReplacer, load_optimized
 
 def test_rare_category_replacer_fit():
     # Create a test DataFrame with some rare categories
@@ -50,4 +51,165 @@ def test_rare_category_replacer_transform():
     # Check that the non-rare categories are not replaced
     assert (transformed_df['Column1'] == 'A').sum() == 5
     assert (transformed_df['Column2'] == 'A').sum() == 5
-    assert (transformed_df['Column3'] == 'A').sum() == 5
\ No newline at end of file
+    assert (transformed_df['Column3'] == 'A').sum() == 5
+def test_rare_category_replacer_unseen_and_missing_values():
+    train = pd.DataFrame({'Column1': ['A'] * 5 + ['B'] * 4 + ['C'], 'Column2': [1] * 5 + [2] * 4 + [3]})
+    test = pd.DataFrame({'Column1': ['A', 'B', 'C', 'Z', None], 'Column2': [1, 2, 3, 4, np.nan]})
+
+    replacer = RareCategoryReplacer(columns=['Column1', 'Column2'], proportion_threshold=0.2).fit(train)
+    transformed_df = replacer.transform(test)
+
+    assert transformed_df['Column1'].tolist() == ['A', 'B', 'Others', 'Others', 'Others']
+    # Non-string categories keep their values
+    assert transformed_df['Column2'].tolist() == [1, 2, 'Others', 'Others', 'Others']
+    # The input is not modified
+    assert test['Column1'].tolist()[:4] == ['A', 'B', 'C', 'Z']
+
+def test_rare_category_replacer_categorical_and_in_place():
+    df = pd.DataFrame({'Column1': pd.Categorical(['A'] * 5 + ['B', 'C', 'D', 'E', None], ordered=True)})
+
+    replacer = RareCategoryReplacer(columns=['Column1'], proportion_threshold=0.2, copy=False)
+    transformed_df = replacer.fit_transform(df)
+
+    assert transformed_df is df
+    column = transformed_df['Column1']
+    assert isinstance(column.dtype, pd.CategoricalDtype) and column.cat.ordered
+    assert column.cat.categories.tolist() == ['A', 'Others']
+    assert column.tolist() == ['A'] * 5 + ['Others'] * 5
+
+def test_rare_category_replacer_partial_fit_and_merge():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'Column1': rng.choice(list('ABCDEFG'), p=[0.4, 0.3, 0.15, 0.1, 0.03, 0.015, 0.005], size=1000),
+        'Column2': rng.choice(list('XYZ'), p=[0.9, 0.09, 0.01], size=1000),
+    })
+    columns = ['Column1', 'Column2']
+    full = RareCategoryReplacer(columns=columns, proportion_threshold=0.05).fit(df)
+
+    chunks = [df.iloc[i:i + 300] for i in range(0, len(df), 300)]
+    incremental = RareCategoryReplacer(columns=columns, proportion_threshold=0.05)
+    for chunk in chunks:
+        incremental.partial_fit(chunk)
+
+    # Replacers fitted on separate chunks merge into the same counts
+    merged = RareCategoryReplacer(columns=columns, proportion_threshold=0.05)
+    for chunk in chunks:
+        merged.merge(RareCategoryReplacer(columns=columns, proportion_threshold=0.05).fit(chunk))
+
+    for replacer in (incremental, merged):
+        assert replacer.n_samples_seen_ == len(df)
+        assert replacer.rare_categories_ == full.rare_categories_
+        assert replacer.important_categories_ == full.important_categories_
+        transformed = pd.concat(replacer.transform_chunks(chunks))
+        pd.testing.assert_frame_equal(transformed, full.transform(df))
+
+def test_rare_category_replacer_legacy_pickle():
+    # Replacers pickled by earlier releases only stored the category lists
+    state = {
+        'columns': ['Column1'],
+        'proportion_threshold': 0.2,
+        'replacement_value': 'Others',
+        'rare_categories_': {'Column1': ['B', 'C']},
+        'important_categories_': {'Column1': ['A']},
+    }
+
+    class LegacyReplacer:
+        def __reduce__(self):
+            return object.__new__, (RareCategoryReplacer,), state
+
+    replacer = pickle.loads(pickle.dumps(LegacyReplacer()))
+    assert isinstance(replacer, RareCategoryReplacer)
+    assert replacer.rare_categories_ == {'Column1': ['B', 'C']}
+    assert replacer.important_categories_ == {'Column1': ['A']}
+
+    transformed = replacer.transform(pd.DataFrame({'Column1': ['A', 'B', 'C', 'A']}))
+    assert transformed['Column1'].tolist() == ['A', 'Others', 'Others', 'A']
+
+def test_dtype_optimizer():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'Small': rng.integers(-100, 100, size=1000),
+        'Large': rng.integers(0, 100_000, size=1000),
+        'City': rng.choice(['Paris', 'Oslo', 'Rome'], size=1000),
+        'Name': [f'user_{i}' for i in range(1000)],
+        'Price': rng.normal(size=1000),
+    })
+    optimizer = DtypeOptimizer(sample_rows=200).fit(df)
+    assert optimizer.dtypes_ == {'Small': np.int8, 'Large': np.int32, 'City': 'category'}
+
+    transformed = optimizer.transform(df)
+    assert df['Small'].dtype == np.int64  # the input is not modified
+    assert transformed['City'].dtype == 'category' and transformed['Name'].dtype == df['Name'].dtype
+    assert (transformed.astype({'Small': np.int64, 'Large': np.int64, 'City': object}) == df.astype({'City': object})).all().all()
+
+    # Values outside the fitted range widen the dtype instead of overflowing
+    wider = optimizer.transform(pd.DataFrame({'Small': [1, 1000]}))
+    assert wider['Small'].dtype == np.int16 and wider['Small'].tolist() == [1, 1000]
+    assert DtypeOptimizer(downcast_floats=True).fit(df).dtypes_['Price'] == np.float32
+
+def test_dtype_optimizer_unsigned():
+    df = pd.DataFrame({
+        'Byte': np.array([0, 7, 255], dtype=np.uint8),
+        'Word': np.array([0, 7, 200], dtype=np.uint16),
+        'Huge': np.array([0, 1, 2**63 + 5], dtype=np.uint64),
+    })
+    optimizer = DtypeOptimizer().fit(df)
+    # Unsigned columns stay unsigned and never get a wider dtype
+    assert optimizer.dtypes_ == {'Word': np.uint8}
+    transformed = optimizer.transform(df)
+    assert transformed['Byte'].dtype == np.uint8 and transformed['Huge'].dtype == np.uint64
+    assert transformed['Huge'].tolist() == [0, 1, 2**63 + 5]
+
+    # Values above the int64 maximum are never wrapped by the transform either
+    small = DtypeOptimizer().fit(pd.DataFrame({'Huge': np.array([0, 1], dtype=np.uint64)}))
+    assert small.dtypes_ == {'Huge': np.uint8}
+    huge = small.transform(df[['Huge']])
+    assert huge['Huge'].dtype == np.uint64 and huge['Huge'].tolist() == [0, 1, 2**63 + 5]
+    negative = small.transform(pd.DataFrame({'Huge': [-1, 300]}))
+    assert negative['Huge'].dtype == np.int16 and negative['Huge'].tolist() == [-1, 300]
+
+def test_load_optimized(tmpdir):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'Id': np.arange(1000),
+        'City': rng.choice(['Paris', 'Oslo', 'Rome'], size=1000),
+        'Target': rng.choice(['yes', 'no'], size=1000),
+    })
+    df.loc[999, 'Id'] = 1_000_000
+    df.loc[999, 'City'] = 'Tokyo'
+    file_path = str(tmpdir.join('data.csv'))
+    df.to_csv(file_path, index=False)
+
+    loaded = load_optimized(file_path, chunksize=300)
+    assert loaded['Id'].dtype == np.int32
+    assert loaded['City'].dtype == 'category' and set(loaded['City'].cat.categories) == {'Paris', 'Oslo', 'Rome', 'Tokyo'}
+    pd.testing.assert_frame_equal(loaded.astype({'Id': np.int64, 'City': object, 'Target': object}),
+                                  pd.read_csv(file_path).astype({'City': object, 'Target': object}))
+
+    projected = load_optimized(file_path, columns=['Target', 'Id'])
+    assert projected.columns.tolist() == ['Target', 'Id']
+
+def test_load_optimized_all_missing_chunk(tmpdir):
+    # The second chunk of 'City' is empty and is read as float64
+    df = pd.DataFrame({'Id': np.arange(20), 'City': ['Paris', 'Oslo'] * 5 + [None] * 10})
+    file_path = str(tmpdir.join('data.csv'))
+    df.to_csv(file_path, index=False)
+
+    loaded = load_optimized(file_path, chunksize=10)
+    assert loaded['City'].dtype == 'category' and set(loaded['City'].cat.categories) == {'Paris', 'Oslo'}
+    assert loaded['City'].isna().sum() == 10
+
+def test_dtype_optimizer_fixed_categories():
+    df = pd.DataFrame({'City': ['Paris', 'Oslo', 'Rome'] * 10})
+    optimizer = DtypeOptimizer().fit(df)
+    assert optimizer.dtypes_['City'].categories.tolist() == ['Oslo', 'Paris', 'Rome']
+
+    # A chunk missing some categories keeps the fitted codes
+    chunk = optimizer.transform(pd.DataFrame({'City': ['Rome', 'Rome']}))
+    assert chunk['City'].cat.categories.tolist() == ['Oslo', 'Paris', 'Rome']
+    assert chunk['City'].cat.codes.tolist() == [2, 2]
+
+    # Unseen values are appended after the fitted categories instead of becoming missing
+    unseen = optimizer.transform(pd.DataFrame({'City': ['Berlin', 'Oslo', None]}))
+    assert unseen['City'].cat.categories.tolist() == ['Oslo', 'Paris', 'Rome', 'Berlin']
+    assert unseen['City'].cat.codes.tolist() == [3, 0, -1]
@@ -0,0 +1,283 @@
+import os
+import pytest
+import pandas as pd
+import numpy as np
+from suraj_datalab.fold_creator import create_kfolds, create_classification_kfolds, create_regression_kfolds, create_streaming_kfolds, create_repeated_kfolds, create_multilabel_kfolds, create_stratified_group_kfolds, _ckmeans_bins
+from suraj_datalab.fold_index import FoldIndex, fingerprint, save_fold_index
+
+@pytest.fixture
+def train_df():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'Feature': rng.normal(size=500),
+        'Class': rng.choice(['A', 'B', 'C'], 500, p=[0.6, 0.3, 0.1]),
+        'Target': rng.lognormal(size=500)
+    })
+
+def test_fold_creators_accept_path_and_dataframe(tmpdir, train_df):
+    file_path = str(tmpdir.join("train.csv"))
+    train_df.to_csv(file_path, index=False)
+
+    from_path = create_classification_kfolds(file_path, 'Class', n_splits=5)
+    from_frame = create_classification_kfolds(train_df, 'Class', n_splits=5)
+
+    pd.testing.assert_frame_equal(from_path, from_frame)
+    assert from_frame['kfold'].value_counts().tolist() == [100] * 5
+    # The input DataFrame is not modified
+    assert 'kfold' not in train_df.columns
+
+def test_fold_creators_return_folds(train_df):
+    folds = create_regression_kfolds(train_df, 'Target', n_splits=5, return_folds=True)
+
+    assert isinstance(folds, np.ndarray)
+    assert folds.dtype == np.int8
+    assert folds.shape == (500,)
+    assert np.array_equal(folds, create_regression_kfolds(train_df, 'Target', n_splits=5)['kfold'].to_numpy())
+
+    # Stratification keeps the class proportions in every fold
+    folds = create_classification_kfolds(train_df, 'Class', n_splits=5, return_folds=True)
+    class_counts = pd.crosstab(folds, train_df['Class'])
+    assert (class_counts.max() - class_counts.min()).max() <= 1
+
+def test_fold_creators_accept_numpy_array(train_df):
+    array = train_df[['Feature', 'Target']].to_numpy()
+
+    folds = create_kfolds(array, n_splits=4, return_folds=True)
+    assert np.bincount(folds).tolist() == [125] * 4
+
+    folds = create_regression_kfolds(array, 1, n_splits=5, return_folds=True)
+    assert np.array_equal(folds, create_regression_kfolds(train_df, 'Target', n_splits=5, return_folds=True))
+
+def test_fold_index_sidecar(tmpdir, train_df):
+    file_path = str(tmpdir.join("train.csv"))
+    index_path = str(tmpdir.join("train.folds"))
+    train_df.to_csv(file_path, index=False)
+
+    folds = create_classification_kfolds(file_path, 'Class', n_splits=5, return_folds=True, index_path=index_path)
+
+    fold_index = FoldIndex(index_path, source=file_path)
+    assert fold_index.n_rows == 500 and fold_index.n_splits == 5
+    assert fold_index.metadata['splitter'] == 'StratifiedKFold'
+    assert fold_index.metadata['random_state'] == 42
+    assert np.array_equal(fold_index.folds, folds)
+
+    for fold, (train_idx, val_idx) in enumerate(fold_index):
+        # Index arrays are views of the memory-mapped file
+        assert isinstance(train_idx, np.memmap) and isinstance(val_idx, np.memmap)
+        assert np.array_equal(val_idx, np.flatnonzero(folds == fold))
+        assert np.array_equal(np.sort(train_idx), np.flatnonzero(folds != fold))
+
+    # A changed dataset makes the index stale
+    train_df.iloc[:-1].to_csv(file_path, index=False)
+    with pytest.raises(ValueError, match="stale"):
+        FoldIndex(index_path, source=file_path)
+
+def test_fold_index_detects_edits(tmpdir):
+    # A same-size edit in the middle of a file is caught by the modification time, or by the full hash
+    file_path = str(tmpdir.join("train.csv"))
+    with open(file_path, "wb") as file:
+        file.write(b"0," * 2_000_000)
+    status = os.stat(file_path)
+    folds = np.zeros(10, dtype=np.int8)
+    save_fold_index(str(tmpdir.join("sampled.folds")), folds, source=file_path)
+    save_fold_index(str(tmpdir.join("full.folds")), folds, source=file_path, full_fingerprint=True)
+
+    with open(file_path, "r+b") as file:
+        file.seek(1_234_567)
+        file.write(b"1")
+    os.utime(file_path, ns=(status.st_atime_ns, status.st_mtime_ns + 1))
+    with pytest.raises(ValueError, match="stale"):
+        FoldIndex(str(tmpdir.join("sampled.folds")), source=file_path)
+
+    # Even with the original modification time restored, the full hash sees the edit
+    os.utime(file_path, ns=(status.st_atime_ns, status.st_mtime_ns))
+    with pytest.raises(ValueError, match="stale"):
+        FoldIndex(str(tmpdir.join("full.folds")), source=file_path)
+
+    # Every row of an in-memory dataset is hashed
+    df = pd.DataFrame({'Feature': np.arange(20_000, dtype=float)})
+    edited = df.copy()
+    edited.loc[12345, 'Feature'] = -1.0
+    assert fingerprint(df) == fingerprint(df.copy())
+    assert fingerprint(edited) != fingerprint(df)
+
+def test_create_streaming_kfolds(tmpdir, train_df):
+    file_path = str(tmpdir.join("train.csv"))
+    save_path = str(tmpdir.join("train_folds.csv"))
+    index_path = str(tmpdir.join("train.folds"))
+    train_df.to_csv(file_path, index=False)
+
+    fold_sizes = create_streaming_kfolds(
+        file_path, n_splits=5, target_column='Class', chunksize=64, save_path=save_path, index_path=index_path
+    )
+
+    # Stratified online: every class is balanced to within one row across folds
+    assert (fold_sizes.max() - fold_sizes.min()).max() <= 1
+    assert fold_sizes.to_numpy().sum() == 500
+
+    # The annotated file and the sidecar hold the same assignment
+    folds = FoldIndex(index_path, source=file_path).folds
+    annotated = pd.read_csv(save_path)
+    assert annotated.columns.tolist() == ['Feature', 'Class', 'Target', 'kfold']
+    assert np.array_equal(annotated['kfold'].to_numpy(), folds)
+
+    # Reruns with the same seed give the same assignment
+    rerun_path = str(tmpdir.join("rerun.folds"))
+    create_streaming_kfolds(file_path, n_splits=5, target_column='Class', chunksize=64, index_path=rerun_path)
+    assert np.array_equal(FoldIndex(rerun_path).folds, folds)
+
+    # Missing targets of a numeric column form a single class, balanced across chunks
+    missing_path = str(tmpdir.join("missing.csv"))
+    numeric_class = train_df['Class'].map({'A': 0, 'B': 1, 'C': 2}).where(np.arange(500) % 3 != 0)
+    train_df.assign(Class=numeric_class).to_csv(missing_path, index=False)
+    fold_sizes = create_streaming_kfolds(
+        missing_path, n_splits=5, target_column='Class', chunksize=64, index_path=str(tmpdir.join("missing.folds"))
+    )
+    assert fold_sizes.shape[1] == train_df['Class'].nunique() + 1
+    assert fold_sizes.columns.isna().sum() == 1
+    assert (fold_sizes.max() - fold_sizes.min()).max() <= 1
+
+def test_create_streaming_kfolds_hash_is_chunk_independent(tmpdir, train_df):
+    file_path = str(tmpdir.join("train.csv"))
+    train_df.assign(Id=np.arange(500)[::-1]).to_csv(file_path, index=False)
+
+    folds = []
+    for chunksize in [50, 1_000]:
+        index_path = str(tmpdir.join(f"train-{chunksize}.folds"))
+        create_streaming_kfolds(file_path, n_splits=4, key_column='Id', chunksize=chunksize, index_path=index_path)
+        folds.append(np.asarray(FoldIndex(index_path).folds))
+
+    assert np.array_equal(folds[0], folds[1])
+    assert set(np.unique(folds[0])) == {0, 1, 2, 3}
+
+@pytest.mark.parametrize("target_column", [None, 'Class'])
+def test_create_streaming_kfolds_seed(tmpdir, train_df, target_column):
+    file_path = str(tmpdir.join("train.csv"))
+    train_df.to_csv(file_path, index=False)
+
+    def folds(random_state, name):
+        index_path = str(tmpdir.join(name))
+        create_streaming_kfolds(
+            file_path, target_column=target_column, random_state=random_state, chunksize=64, index_path=index_path
+        )
+        return np.asarray(FoldIndex(index_path).folds)
+
+    # Numeric row-number keys are hashed with the seed
+    assert np.array_equal(folds(1, "a.folds"), folds(1, "b.folds"))
+    assert not np.array_equal(folds(1, "a.folds"), folds(2, "c.folds"))
+
+
+def _within_bin_sse(y, bins):
+    return sum(((y[bins == b] - y[bins == b].mean()) ** 2).sum() for b in np.unique(bins))
+
+
+def test_ckmeans_bins_is_optimal():
+    from itertools import combinations
+
+    rng = np.random.default_rng(0)
+    y = np.round(rng.lognormal(size=40), 1)
+    values = np.unique(y)
+
+    # Brute force over every set of breaks between unique values
+    best = min(
+        _within_bin_sse(y, np.searchsorted(values[list(breaks)], y, side="left"))
+        for breaks in combinations(range(len(values) - 1), 3)
+    )
+    bins = _ckmeans_bins(y, 4)
+    assert np.isclose(_within_bin_sse(y, bins), best)
+    np.testing.assert_array_equal(bins, _ckmeans_bins(y, 4))
+
+    # Bins are ordered by value and missing values get -1
+    y_missing = np.append(y, np.nan)
+    bins_missing = _ckmeans_bins(y_missing, 4)
+    assert bins_missing[-1] == -1
+    np.testing.assert_array_equal(bins_missing[:-1], bins)
+    assert (np.diff(bins[np.argsort(y, kind="stable")]) >= 0).all()
+
+
+def test_ckmeans_bins_beats_kmeans(train_df):
+    from sklearn.cluster import KMeans
+
+    y = train_df["Target"].to_numpy()
+    n_bins = int(np.floor(1 + np.log2(len(y))))
+    kmeans = KMeans(n_clusters=n_bins, random_state=42).fit_predict(y.reshape(-1, 1))
+    assert _within_bin_sse(y, _ckmeans_bins(y, n_bins)) <= _within_bin_sse(y, kmeans) + 1e-9
+
+
+def test_create_repeated_kfolds(train_df):
+    folds = create_repeated_kfolds(train_df, "Class", seeds=[1, 7, 9], n_jobs=2)
+    assert folds.shape == (len(train_df), 3) and folds.dtype == np.int8
+    for r, seed in enumerate([1, 7, 9]):
+        expected = create_classification_kfolds(train_df, "Class", random_state=seed, return_folds=True)
+        np.testing.assert_array_equal(folds[:, r], expected)
+
+    folds = create_repeated_kfolds(train_df, "Target", n_repeats=2, binning_method="quantile")
+    for r in range(2):
+        expected = create_regression_kfolds(
+            train_df, "Target", binning_method="quantile", random_state=42 + r, return_folds=True
+        )
+        np.testing.assert_array_equal(folds[:, r], expected)
+
+    folds = create_repeated_kfolds(train_df, n_repeats=2)
+    np.testing.assert_array_equal(folds[:, 1], create_kfolds(train_df, random_state=43, return_folds=True))
+
+
+def test_create_multilabel_kfolds(train_df):
+    from scipy import sparse
+
+    rng = np.random.default_rng(0)
+    labels = (rng.random((len(train_df), 20)) < np.linspace(0.02, 0.5, 20)).astype(np.int8)
+    label_df = train_df.join(pd.DataFrame(labels, columns=[f"L{j}" for j in range(20)]))
+
+    folds = create_multilabel_kfolds(label_df, [f"L{j}" for j in range(20)], return_folds=True)
+    assert folds.dtype == np.int8
+    assert np.bincount(folds).max() - np.bincount(folds).min() <= 0.1 * len(train_df) / 5
+    per_fold = np.stack([labels[folds == k].sum(axis=0) for k in range(5)])
+    assert (np.abs(per_fold - labels.sum(axis=0) / 5) <= 0.05 * labels.sum(axis=0) + 1).all()
+
+    # Dense, sparse and bit-packed label matrices give the same folds
+    np.testing.assert_array_equal(folds, create_multilabel_kfolds(train_df, labels, return_folds=True))
+    np.testing.assert_array_equal(
+        folds, create_multilabel_kfolds(train_df, sparse.csr_matrix(labels), return_folds=True)
+    )
+    packed = np.packbits(labels, axis=1)
+    np.testing.assert_array_equal(
+        folds, create_multilabel_kfolds(train_df, packed, n_labels=20, return_folds=True)
+    )
+    assert "kfold" in create_multilabel_kfolds(train_df, labels).columns
+
+
+def test_create_stratified_group_kfolds(train_df):
+    groups = np.random.default_rng(0).integers(0, 100, len(train_df))
+    group_df = train_df.assign(Group=groups)
+
+    folds = create_stratified_group_kfolds(group_df, "Class", "Group", return_folds=True)
+    assert (pd.Series(folds).groupby(groups).nunique() == 1).all()
+    class_share = pd.crosstab(folds, group_df["Class"], normalize="index")
+    overall = group_df["Class"].value_counts(normalize=True)
+    assert (class_share - overall).abs().max().max() < 0.05
+
+def test_return_folds_reads_only_needed_columns(tmpdir):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'feature': rng.normal(size=500),
+        'target': rng.choice(['a', 'b', 'c'], size=500),
+        'value': rng.integers(0, 1000, size=500),
+        'group': rng.integers(0, 50, size=500).astype(str),
+    })
+    file_path = str(tmpdir.join('data.csv'))
+    df.to_csv(file_path, index=False)
+
+    # The projected, dtype-optimized read gives the same folds as the full dataset
+    np.testing.assert_array_equal(
+        create_classification_kfolds(file_path, 'target', return_folds=True),
+        create_classification_kfolds(df, 'target', return_folds=True),
+    )
+    np.testing.assert_array_equal(
+        create_regression_kfolds(file_path, 'value', binning_method='kmeans', return_folds=True),
+        create_regression_kfolds(df, 'value', binning_method='kmeans', return_folds=True),
+    )
+    np.testing.assert_array_equal(
+        create_stratified_group_kfolds(file_path, 'target', 'group', return_folds=True),
+        create_stratified_group_kfolds(df, 'target', 'group', return_folds=True),
+    )
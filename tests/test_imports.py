@@ -0,0 +1,40 @@
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ["matplotlib", "seaborn", "IPython", "sklearn.cluster"]
+
+
+def _loaded_modules(statement):
+    # Import in a fresh interpreter, since this test session has already loaded everything
+    code = f"import sys\n{statement}\nprint(' '.join(sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return set(result.stdout.split())
+
+
+def test_bare_import_is_lazy():
+    loaded = _loaded_modules("import suraj_datalab")
+    assert not loaded & {"pandas", "numpy", "sklearn", *HEAVY_MODULES}
+
+
+@pytest.mark.parametrize("statement", [
+    "from suraj_datalab import categorical_feature",
+    "from suraj_datalab.clean import RareCategoryReplacer",
+    "from suraj_datalab.fold_creator import create_kfolds, create_regression_kfolds",
+])
+def test_import_does_not_load_heavy_modules(statement):
+    loaded = _loaded_modules(statement)
+    assert not loaded & set(HEAVY_MODULES)
+
+
+def test_submodules_are_resolved_on_access():
+    # `import suraj_datalab` followed by attribute access to a submodule, as before the imports were lazy
+    loaded = _loaded_modules(
+        "import suraj_datalab\n"
+        "import pandas as pd\n"
+        "assert len(suraj_datalab.analyze.missing_values(pd.DataFrame({'a': [1, None]}))) == 1\n"
+        "assert suraj_datalab.clean.RareCategoryReplacer and 'fold_creator' in dir(suraj_datalab)"
+    )
+    assert "suraj_datalab.analyze" in loaded and "suraj_datalab.fold_creator" not in loaded
@@ -0,0 +1,56 @@
+import json
+import logging
+
+import numpy as np
+import pandas as pd
+
+from suraj_datalab import instrument
+from suraj_datalab.analyze import numerical_feature
+from suraj_datalab.fold_creator import create_regression_kfolds
+from suraj_datalab.instrument import SpanRecorder, log_span, span
+
+
+def test_span_is_a_no_op_without_recorder():
+    assert not instrument._recorders
+    assert span("anything") is span("other")
+
+
+def test_recorder_captures_stages(tmp_path):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"Value": rng.normal(size=1000)})
+    df.to_csv(tmp_path / "data.csv", index=False)
+
+    with SpanRecorder(memory=True) as recorder:
+        numerical_feature(df, "Value", plot=False)
+        create_regression_kfolds(
+            str(tmp_path / "data.csv"), "Value", index_path=str(tmp_path / "folds.idx")
+        )
+
+    spans = recorder.to_frame().set_index("name")
+    assert list(spans.index) == [
+        "statistics", "numerical_feature", "read_csv", "bin_target", "split", "write_index",
+        "create_regression_kfolds",
+    ]
+    assert spans.loc["split", "parent"] == "create_regression_kfolds"
+    assert spans.loc["split", "depth"] == 1
+    assert (spans["wall_time"] >= 0).all() and (spans["cpu_time"] >= 0).all()
+    # A parent's peak covers the peaks of its children
+    assert spans.loc["create_regression_kfolds", "peak_memory"] >= spans.loc["bin_target", "peak_memory"] > 0
+
+    trace = json.loads(open(recorder.save_trace(tmp_path / "trace.json")).read())
+    assert [event["name"] for event in trace["traceEvents"]] == list(spans.index)
+
+
+def test_callbacks_and_errors(caplog):
+    with caplog.at_level(logging.INFO, logger="suraj_datalab.instrument"):
+        with SpanRecorder(callbacks=[log_span]) as recorder:
+            try:
+                with span("failing", step=1):
+                    raise KeyError("missing")
+            except KeyError:
+                pass
+
+    assert recorder.spans[0]["error"] == "KeyError"
+    assert recorder.spans[0]["peak_memory"] is None
+    assert json.loads(caplog.records[0].getMessage())["attributes"] == {"step": 1}
+    assert not instrument._recorders
@@ -0,0 +1,127 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from suraj_datalab.report import column_kind, generate_report, main
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({
+        "Age": rng.normal(40, 10, size=200),
+        "Count": rng.integers(0, 5, size=200),
+        "City": rng.choice(["Paris", "Oslo", "Rome"], size=200),
+        "Flag": rng.random(200) < 0.5,
+        "Date": pd.date_range("2024-01-01", periods=200, freq="D"),
+        "Target": rng.choice(["yes", "no"], size=200),
+    })
+    frame.loc[::10, "Age"] = np.nan
+    return frame
+
+
+def test_column_kind(df):
+    kinds = {column: column_kind(df[column]) for column in df.columns}
+    assert kinds == {
+        "Age": "numerical", "Count": "numerical", "City": "categorical", "Flag": "categorical",
+        "Date": "other", "Target": "categorical",
+    }
+
+
+def test_generate_report(df, tmp_path):
+    output_dir = tmp_path / "report"
+    cwd = os.getcwd()
+    path = generate_report(df, output_dir=str(output_dir), target="Target", n_jobs=1)
+
+    assert path == str(output_dir / "index.html")
+    with open(output_dir / "index.json") as file:
+        index = json.load(file)
+
+    assert index["n_rows"] == 200 and index["target"] == "Target"
+    assert [column["name"] for column in index["columns"]] == ["Age", "Count", "City", "Flag", "Date"]
+    assert index["columns"][4] == {"name": "Date", "kind": "other", "figure": None, "tables": {}}
+    assert index["missing_values"][0]["Missing Count"] == 20
+    for column in index["columns"][:4]:
+        assert os.path.exists(output_dir / column["figure"])
+        with open(path) as file:
+            assert column["figure"] in file.read()
+    assert index["columns"][2]["tables"]["distribution"][0]["Total Count"] == (df["City"] == df["City"].mode()[0]).sum()
+    # Profiling in-process writes the plots by path, without changing the working directory
+    assert os.getcwd() == cwd
+    assert not os.path.exists(os.path.join(cwd, "plots", "Age-Target-boxplot.png"))
+
+
+def test_generate_report_process_pool(df, tmp_path):
+    output_dir = tmp_path / "report"
+    generate_report(df, output_dir=str(output_dir), target="Target", n_jobs=2, index_format="json")
+
+    with open(output_dir / "index.json") as file:
+        index = json.load(file)
+    for column in index["columns"][:4]:
+        assert os.path.exists(output_dir / column["figure"])
+
+
+def test_generate_report_in_notebook(df, tmp_path, monkeypatch):
+    import matplotlib
+    import matplotlib.pyplot as plt
+    from suraj_datalab import plotting
+
+    def show():
+        raise AssertionError("The report must not show its figures")
+
+    monkeypatch.setattr(plotting, "is_jupyter_notebook", lambda: True)
+    monkeypatch.setattr(plt, "show", show)
+    backend = matplotlib.get_backend()
+    open_figure = plt.figure()
+
+    # A column named like the single class of a report without target is not replaced by it
+    frame = df[["City"]].rename(columns={"City": "All"})
+    generate_report(frame, output_dir=str(tmp_path / "report"), n_jobs=1, index_format="json")
+
+    with open(tmp_path / "report" / "index.json") as file:
+        column = json.load(file)["columns"][0]
+    assert os.path.exists(tmp_path / "report" / column["figure"])
+    assert [row["All"] for row in column["tables"]["distribution"]] == frame["All"].value_counts().index.tolist()
+    # The caller's backend and figures are left alone
+    assert matplotlib.get_backend() == backend and plt.fignum_exists(open_figure.number)
+    plt.close(open_figure)
+
+
+def test_report_cli_without_target(df, tmp_path, capsys):
+    df.drop(columns="Date").to_csv(tmp_path / "data.csv", index=False)
+
+    main([str(tmp_path / "data.csv"), "--output-dir", str(tmp_path / "out"), "--n-jobs", "1",
+          "--format", "json", "--columns", "Age", "City"])
+
+    with open(tmp_path / "out" / "index.json") as file:
+        index = json.load(file)
+    assert [column["figure"] for column in index["columns"]] == [
+        os.path.join("plots", "Age-None-boxplot.png"), os.path.join("plots", "City-All-distribution.png"),
+    ]
+    assert not os.path.exists(tmp_path / "out" / "index.html")
+    assert "Report written to" in capsys.readouterr().out
+
+
+def test_report_max_categories(df, tmp_path, monkeypatch):
+    import matplotlib.pyplot as plt
+    from suraj_datalab import plotting
+
+    titles, ticks = [], []
+    original = plotting._show_or_save
+
+    def recording_save(*args, **kwargs):
+        titles.append(plt.gca().get_title())
+        ticks.append(len(plt.gca().get_xticks()))
+        original(*args, **kwargs)
+
+    monkeypatch.setattr(plotting, "_show_or_save", recording_save)
+    generate_report(df, output_dir=str(tmp_path / "report"), target="Target", columns=["City"], n_jobs=1,
+                    max_categories=2, index_format="json")
+
+    # The figure is truncated like the table
+    assert titles == ["Distribution of City by Target (top 2 of 3 categories)"] and ticks == [2]
+    with open(tmp_path / "report" / "index.json") as file:
+        assert len(json.load(file)["columns"][0]["tables"]["distribution"]) == 2
@@ -0,0 +1,95 @@
+import pytest
+import pandas as pd
+import numpy as np
+from suraj_datalab.analyze import categorical_feature, numerical_feature
+from suraj_datalab.sampling import (
+    ReservoirSampler,
+    sample_rows,
+    sampled_categorical_feature,
+    sampled_numerical_feature,
+)
+
+def _dataset(n_rows=100_000):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'Category': rng.choice(['A', 'B', 'C'], n_rows, p=[0.6, 0.3, 0.1]),
+        'Target': (rng.random(n_rows) < 0.02).astype(int),
+        'Value': rng.lognormal(size=n_rows),
+    })
+    df.loc[::100, 'Value'] = np.nan
+    return df
+
+def test_sample_rows():
+    df = _dataset()
+
+    sample = sample_rows(df, sample_size=1_000)
+    assert len(sample) == 1_000 and sample.index.is_monotonic_increasing
+    assert sample.attrs['sampling']['population_size'] == len(df)
+
+    # The rare class gets at least sample_size / (2 x classes) rows
+    stratified = sample_rows(df, sample_size=1_000, stratify='Target')
+    assert stratified['Target'].value_counts()[1] == 250
+    assert stratified.attrs['sampling']['population_counts'] == df['Target'].value_counts(sort=False).tolist()
+
+    with pytest.raises(ValueError):
+        sample_rows(df, stratify='Missing')
+
+def test_reservoir_sampler():
+    df = _dataset()
+    sampler = ReservoirSampler(sample_size=1_000, stratify='Target', random_state=0)
+    for start in range(0, len(df), 7_000):
+        sampler.update(df.iloc[start:start + 7_000])
+    sample = sampler.sample()
+    assert sampler.population_counts_.tolist() == df['Target'].value_counts(sort=False).tolist()
+    assert sample['Target'].value_counts()[1] == 250
+    assert sample.index.is_unique and sample.index.is_monotonic_increasing
+
+    # Samplers of separate halves merge into a sample of the whole
+    first = ReservoirSampler(sample_size=500, random_state=1).update(df.iloc[:50_000])
+    second = ReservoirSampler(sample_size=500, random_state=2).update(df.iloc[50_000:])
+    merged = first.merge(second).sample()
+    assert len(merged) == 500
+    assert merged.attrs['sampling']['population_size'] == len(df)
+
+@pytest.mark.parametrize("stratify", [False, True])
+def test_sampled_categorical_feature(stratify):
+    df = _dataset()
+    expected = categorical_feature(df, 'Category', 'Target', plot=False)
+    chunks = (df.iloc[start:start + 10_000] for start in range(0, len(df), 10_000))
+
+    for data in [df, chunks]:
+        estimated = sampled_categorical_feature(
+            data, 'Category', 'Target', sample_size=5_000, stratify=stratify, confidence=0.99, random_state=7
+        )
+        assert estimated.attrs['sampling']['population_size'] == len(df)
+        for column in ['Total Percentage', '1 of Total (%)', '1 within Category (%)']:
+            truth = expected[column].reindex(estimated.index)
+            assert (estimated[f'{column} CI Low'] <= truth).all()
+            assert (truth <= estimated[f'{column} CI High']).all()
+
+    # A sample holding every row gives the exact table with empty intervals
+    full = sampled_categorical_feature(df.head(1_000), 'Category', 'Target', sample_size=5_000)
+    exact = categorical_feature(df.head(1_000), 'Category', 'Target', plot=False)
+    pd.testing.assert_frame_equal(full[exact.columns], exact, check_dtype=False)
+    assert (full['Total Percentage CI Low'] == full['Total Percentage']).all()
+
+def test_sampled_numerical_feature(tmpdir):
+    df = _dataset()
+    expected_outliers, expected_summary = numerical_feature(df, 'Value', plot=False)
+    overall = expected_summary.loc['Value_Overall']
+
+    file_path = str(tmpdir.join("train.csv"))
+    df.to_csv(file_path, index=False)
+    for data in [df, file_path]:
+        outliers_df, summary_df = sampled_numerical_feature(
+            data, 'Value', 'Target', sample_size=5_000, stratify=True, confidence=0.99, chunksize=20_000, random_state=7
+        )
+        assert summary_df.attrs['sampling']['method'] == 'stratified'
+        for statistic in ['count', 'mean', '25%', '50%', '75%']:
+            low, high = summary_df.loc[statistic, ['CI Low', 'CI High']]
+            assert low <= overall[statistic] <= high
+        truth = expected_outliers['Outlier Percentage'][0]
+        assert outliers_df['Outlier Percentage CI Low'][0] <= truth <= outliers_df['Outlier Percentage CI High'][0]
+
+    with pytest.raises(ValueError):
+        sampled_numerical_feature(df, 'Value', stratify=True)
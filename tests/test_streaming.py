@@ -0,0 +1,108 @@
+import pytest
+import pandas as pd
+import numpy as np
+from suraj_datalab.analyze import categorical_feature, numerical_feature
+from suraj_datalab.sketches import CategorySketch, KLLSketch, NumericSketch
+from suraj_datalab.streaming import categorical_feature_from_file, numerical_feature_from_file
+
+def test_sketches_merge():
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=50_000)
+    values[::100] = np.nan
+
+    # Summaries of separate chunks merge into one summary of the whole column
+    merged = NumericSketch(seed=0)
+    for i, chunk in enumerate(np.array_split(values, 7)):
+        merged.merge(NumericSketch(seed=i).update(chunk))
+
+    column = pd.Series(values)
+    assert merged.n_rows == 50_000
+    assert merged.count == column.count()
+    assert merged.mean == pytest.approx(column.mean())
+    assert merged.describe()[2] == pytest.approx(column.std())
+    assert merged.min == column.min() and merged.max == column.max()
+
+    # Quartile ranks are within the documented error of KLLSketch (k=200)
+    quartiles = merged.quantiles.quantile([0.25, 0.5, 0.75])
+    sorted_values = column.dropna().sort_values().to_numpy()
+    for q, estimate in zip([0.25, 0.5, 0.75], quartiles):
+        assert abs(np.searchsorted(sorted_values, estimate) / len(sorted_values) - q) < 0.011
+
+    with pytest.raises(ValueError):
+        KLLSketch(k=200).merge(KLLSketch(k=100))
+
+def test_numerical_feature_from_file(tmpdir):
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({'Feature': np.concatenate([rng.normal(size=9_990), np.full(10, 25.0)])})
+    file_path = str(tmpdir.join("train.csv"))
+    df.to_csv(file_path, index=False)
+
+    outliers_df, summary_df = numerical_feature_from_file(file_path, 'Feature', chunksize=1_000)
+    expected_outliers, expected_summary = numerical_feature(df, 'Feature', plot=False)
+
+    assert outliers_df.columns.tolist() == expected_outliers.columns.tolist()
+    assert summary_df.index.tolist() == expected_summary.index.tolist()
+    assert summary_df.columns.tolist() == expected_summary.columns.tolist()
+
+    # Moments are exact, quartiles approximate
+    exact = ['count', 'mean', 'std', 'min', 'max']
+    pd.testing.assert_series_equal(summary_df.loc['Feature_Overall', exact], expected_summary.loc['Feature_Overall', exact])
+    assert summary_df.loc['Feature_Overall', '50%'] == pytest.approx(expected_summary.loc['Feature_Overall', '50%'], abs=0.05)
+    assert summary_df.loc['Feature_Upper_Outliers', 'max'] == 25.0
+    assert outliers_df['Upper Outliers Percentage'][0] == pytest.approx(expected_outliers['Upper Outliers Percentage'][0], abs=0.1)
+
+def test_numerical_feature_from_parquet(tmpdir):
+    pytest.importorskip("pyarrow")
+    df = pd.DataFrame({'Feature': np.arange(1_000, dtype=float), 'Other': 'x'})
+    file_path = str(tmpdir.join("train.parquet"))
+    df.to_parquet(file_path)
+
+    _, summary_df = numerical_feature_from_file(file_path, 'Feature', chunksize=100, n_jobs=2)
+
+    assert summary_df.loc['Feature_Overall', 'count'] == 1_000
+    assert summary_df.loc['Feature_Overall', 'mean'] == pytest.approx(499.5)
+
+def test_categorical_feature_from_file_exact(tmpdir):
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame({
+        'Feature': rng.choice(['A', 'B', 'C', None], 5_000),
+        'Target': rng.choice(['X', 'Y'], 5_000)
+    })
+    file_path = str(tmpdir.join("train.csv"))
+    df.to_csv(file_path, index=False)
+
+    category_distribution = categorical_feature_from_file(file_path, 'Feature', 'Target', chunksize=700)
+
+    assert category_distribution.attrs['exact']
+    pd.testing.assert_frame_equal(
+        category_distribution, categorical_feature(df, 'Feature', 'Target', plot=False), check_index_type=False
+    )
+
+def test_category_sketch_heavy_hitters():
+    rng = np.random.default_rng(3)
+    # Two frequent categories hidden in 20,000 unique IDs
+    values = np.concatenate([np.full(3_000, 'hot'), np.full(2_000, 'warm'), np.arange(20_000).astype(str)])
+    target = rng.choice(['X', 'Y'], len(values))
+    order = rng.permutation(len(values))
+    values, target = values[order], target[order]
+
+    sketches = [
+        CategorySketch(max_categories=100).update(values[i:i + 5_000], target[i:i + 5_000])
+        for i in range(0, len(values), 5_000)
+    ]
+    merged = sketches[0]
+    for sketch in sketches[1:]:
+        merged.merge(sketch)
+
+    assert not merged.exact
+    assert len(merged.categories_) <= 100 * 2
+    assert merged.class_totals_.sum() == len(values)
+
+    # Counts are underestimated by at most the reported bound, which is at most n_j / (max_categories + 1)
+    true_counts = pd.crosstab(values, target)
+    for j, class_value in enumerate(merged.classes_):
+        assert merged.error_bounds_[j] <= merged.class_totals_[j] / 101
+        for category in ['hot', 'warm']:
+            estimate = merged.counts_[merged.categories_.get_loc(category), j]
+            assert true_counts.loc[category, class_value] - merged.error_bounds_[j] <= estimate
+            assert estimate <= true_counts.loc[category, class_value]